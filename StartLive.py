@@ -15,26 +15,17 @@ def _on_velopack_first_run(_version) -> None:
     _velopack_first_run = True
 
 
-def main() -> int:
-    # 将较重的应用模块放在 Velopack 启动处理之后导入，
-    # 可以避免安装/更新钩子执行时初始化完整 UI。
-    from PySide6.QtGui import QFont, QIcon
-    from PySide6.QtWidgets import QApplication
-    from qdarktheme import enable_hi_dpi
+def main_headless(args) -> int:
+    # 无界面模式不导入 PySide6
+    from src.headless import HeadlessDaemon
 
-    from src.PySide.window import MainWindow
-    from src.core import app_state
+    HeadlessDaemon.init_logger()
+    daemon = HeadlessDaemon(args.web_host, args.web_port,
+                            no_const_update=args.no_update)
+    return daemon.run()
 
-    if MainWindow.is_another_instance_running():
-        return 0
-
-    if system() == "Windows":
-        font_size = 9
-        icon_file = "icon_left.ico"
-    else:
-        font_size = 12
-        icon_file = "icon_left_macOS.ico"
 
+def main() -> int:
     parser = ArgumentParser()
 
     parser.add_argument(
@@ -65,8 +56,41 @@ def main() -> int:
         action="store_true",
     )
 
+    parser.add_argument(
+        "--headless",
+        dest="headless",
+        action="store_true",
+        help="不启动图形界面，通过Web服务控制开播",
+    )
+
     args, qt_args = parser.parse_known_args()
 
+    if args.headless:
+        if args.web_host is None:
+            args.web_host = "localhost"
+        if args.web_port is None:
+            args.web_port = 8080
+        return main_headless(args)
+
+    # 将较重的应用模块放在 Velopack 启动处理之后导入，
+    # 可以避免安装/更新钩子执行时初始化完整 UI。
+    from PySide6.QtGui import QFont, QIcon
+    from PySide6.QtWidgets import QApplication
+    from qdarktheme import enable_hi_dpi
+
+    from src.PySide.window import MainWindow
+    from src.core import app_state
+
+    if MainWindow.is_another_instance_running():
+        return 0
+
+    if system() == "Windows":
+        font_size = 9
+        icon_file = "icon_left.ico"
+    else:
+        font_size = 12
+        icon_file = "icon_left_macOS.ico"
+
     first_run = _velopack_first_run or args.squirrel_first_run
 
     enable_hi_dpi()
@@ -1 +1 @@
-from .gui_dispatcher import GUIDispatcher
+from .gui_dispatcher import GUIDispatcher, DispatchLane
@@ -9,10 +9,10 @@ class AreaUpdatePresenter(Presenter):
 
     def prepare_success_view(self, area: str):
         app_state.room_info[
-            "parent_area"] = app_state.area_reverse[area]
+            "parent_area"] = app_state.area_catalog.parent_of(area)
         app_state.room_info[
             "area"] = area
-        app_state.room_info["area_code"] = app_state.area_codes[area]
+        app_state.room_info["area_code"] = app_state.area_catalog.code(area)
         self._view.parent_combo.setCurrentText(
             app_state.room_info["parent_area"])
         self._view.child_combo.setCurrentText(app_state.room_info["area"])
@@ -1,16 +1,20 @@
+from typing import Optional
+
+from src.core.app_state import AreaDiff
 from src.core.workers.base import Presenter
-from ...states import LoginState
 
 
 class FetchAreaPresenter(Presenter):
-    def __init__(self, state: LoginState):
+    # 分区加载进度由 MainWindow 订阅 scan_status 得知
+    def __init__(self, view: "StreamConfigPanel"):
         super().__init__()
-        self.state = state
+        self._view = view
 
-    def prepare_success_view(self):
-        self.state.areaUpdated.emit()
+    def prepare_success_view(self, diff: Optional[AreaDiff]):
+        # 面板已按缓存的分区显示，列表有变化时再刷新
+        if diff is not None:
+            self._view.reload_areas()
 
-    def prepare_fail_view(self, exception: Exception):
-        self.state.areaUpdated.emit()
+    def prepare_fail_view(self, exception: Exception): ...
 
     def prepare_progress_view(self, *args, **kwargs): ...
@@ -1 +1,2 @@
 from .credential_manager_presenter import CredentialManagerPresenter
+from .account_revalidate_presenter import AccountRevalidatePresenter
@@ -0,0 +1,28 @@
+from src.PySide.interface_adapters.pre_live import RefreshPreLivePresenter
+from src.core import app_state
+from src.core.constant import WorkerPriority
+from src.core.log import get_logger
+from src.core.workers.base import Presenter
+from src.core.workers.pre_live import FetchPreLiveWorker
+
+
+class AccountRevalidatePresenter(Presenter):
+    def __init__(self, view: "MainWindow") -> None:
+        super().__init__()
+        self._view = view
+        self.logger = get_logger(self.__class__.__name__)
+
+    def prepare_success_view(self, cookie_index: int):
+        # 缓存的房间信息先行展示，过期的部分在后台刷新
+        self._view.add_thread(
+            FetchPreLiveWorker(RefreshPreLivePresenter(self._view.panel)),
+            priority=WorkerPriority.BACKGROUND)
+
+    def prepare_fail_view(self, exception: Exception):
+        if app_state.scan_status["expired"]:
+            self.logger.info("cached credential expired, reloading account")
+            self._view.reload_account()
+            return
+        self.logger.warning(f"account revalidation failed: {exception!r}")
+
+    def prepare_progress_view(self, *args, **kwargs): ...
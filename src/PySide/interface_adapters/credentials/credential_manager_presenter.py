@@ -1,5 +1,9 @@
+from PySide6.QtWidgets import QMessageBox
+
 from src.PySide.interface_adapters.login import FetchLoginPresenter
 from src.core import app_state
+from src.core.exceptions import CredentialVaultError
+from src.core.exceptions.WorkerException import WorkerException
 from src.core.workers.base import Presenter
 from src.core.workers.usernames import FetchUsernamesWorker
 
@@ -11,7 +15,7 @@ class CredentialManagerPresenter(Presenter):
         self._state = state
 
     def prepare_success_view(self, cookie_index: int):
-        FetchLoginPresenter.post_login(self._view, self._state)
+        FetchLoginPresenter.post_login(self._view)
         if not app_state.scan_status["is_new"]:
             fetch_usernames = FetchUsernamesWorker(
                 app_state.cookie_indices[cookie_index]
@@ -30,7 +34,15 @@ class CredentialManagerPresenter(Presenter):
         panel.obs_auto_connect_checkbox.setChecked(
             app_state.obs_settings.get("auto_connect", False))
 
-    def prepare_fail_view(self, exception: Exception):
+    def prepare_fail_view(self, exception: WorkerException):
+        if isinstance(exception.real_exc, CredentialVaultError):
+            QMessageBox.critical(
+                self._view, "凭据存储",
+                "凭据保险库无法打开，已保存的账号和设置暂不可用，"
+                "新的更改也不会保存。\n"
+                "请确认系统钥匙串中的主密钥仍然存在，"
+                "或在设置菜单中“清空所有凭据”后重新登录。\n\n"
+                f"{exception.real_exc.path}\n{exception.real_exc.reason!r}")
         self._state.credentialLoaded.emit()
         panel = self._view.panel
         panel.host_input.setText(
@@ -1,29 +1,107 @@
+import sys
+from collections import deque
+from enum import IntEnum, unique
 from functools import partial
+from time import perf_counter
 
-from PySide6.QtCore import QObject, Signal, Slot, Qt
+from PySide6.QtCore import QObject, Signal, Slot, Qt, QTimer
+
+from src.core.metrics import LatencyRing, tracer
+
+
+@unique
+class DispatchLane(IntEnum):
+    # 数值越小越先执行
+    STATE = 0
+    LOG = 1
 
 
 class GUIDispatcher(QObject):
+    """
+    Runs callables posted from any thread on the GUI thread, in batches.
+
+    Posting only appends to a per-lane ``deque`` (atomic under the GIL) and
+    emits one queued wake-up signal when no drain is scheduled yet. The GUI
+    thread drains on a short timer: lanes are served in ``DispatchLane``
+    order and a drain stops once ``budget_ms`` is used up, leaving the rest
+    for the next round so painting and input are never starved.
+    """
     _alive: bool
-    _invoke = Signal(object)  # Signal(callable)
+    _wakeup = Signal()
 
-    def __init__(self) -> None:
+    def __init__(self, *, interval_ms: int = 4, budget_ms: int = 8) -> None:
         super().__init__()
         self._alive = True
-        self._invoke.connect(
-            self._run_in_gui,
+        self._interval = interval_ms
+        self._budget = budget_ms / 1000
+        self._queues = {lane: deque() for lane in DispatchLane}
+        self.latency = {lane: LatencyRing() for lane in DispatchLane}
+        self._scheduled = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._drain)
+        self._wakeup.connect(
+            self._on_wakeup,
             Qt.ConnectionType.QueuedConnection,
         )
 
     def close(self) -> None:
         self._alive = False
-        self._invoke.disconnect(self._run_in_gui)
+        self._wakeup.disconnect(self._on_wakeup)
+        self._timer.stop()
+        for queue in self._queues.values():
+            queue.clear()
 
     def post(self, fn, *args, **kwargs) -> None:
-        if self._alive:
-            self._invoke.emit(partial(fn, *args, **kwargs))
+        self.post_to(DispatchLane.STATE, fn, *args, **kwargs)
+
+    def post_to(self, lane: DispatchLane, fn, /, *args, **kwargs) -> None:
+        if not self._alive:
+            return
+        self._queues[lane].append(
+            (partial(fn, *args, **kwargs), tracer.link(), perf_counter()))
+        if not self._scheduled:
+            self._scheduled = True
+            self._wakeup.emit()
 
-    @Slot(object)
-    def _run_in_gui(self, fn) -> None:
-        if self._alive:
+    def queue_depth(self) -> dict[DispatchLane, int]:
+        return {lane: len(queue) for lane, queue in self._queues.items()}
+
+    def reset_latency(self) -> None:
+        self.latency = {lane: LatencyRing() for lane in DispatchLane}
+
+    @Slot()
+    def _on_wakeup(self) -> None:
+        if self._alive and not self._timer.isActive():
+            # 超出预算时定时器以 0 间隔重启，这里每次都恢复批处理间隔
+            self._timer.start(self._interval)
+
+    @Slot()
+    def _drain(self) -> None:
+        # 先清除标记，之后投递的任务会重新唤醒
+        self._scheduled = False
+        deadline = perf_counter() + self._budget
+        for lane, queue in self._queues.items():
+            latency = self.latency[lane]
+            while queue:
+                if not self._alive:
+                    return
+                if perf_counter() >= deadline:
+                    self._scheduled = True
+                    self._timer.start(0)
+                    return
+                fn, link, posted = queue.popleft()
+                latency.add(perf_counter() - posted)
+                try:
+                    self._run_in_gui(fn, link)
+                except Exception:
+                    # 与槽函数抛出异常时的行为一致，不影响同批次的其他任务
+                    sys.excepthook(*sys.exc_info())
+
+    def _run_in_gui(self, fn, link) -> None:
+        if link is None:
+            fn()
+            return
+        with tracer.span(getattr(fn.func, "__qualname__", repr(fn.func)),
+                         "gui", link=link):
             fn()
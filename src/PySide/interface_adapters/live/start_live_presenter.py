@@ -6,6 +6,7 @@ from src.PySide.interface_adapters.face_auth import FaceCaptchaPresenter
 from src.PySide.states import StreamState
 from src.core import app_state
 from src.core.constant import FaceAuthType
+from src.core.network import HedgeProgress
 from src.core.workers.base import Presenter
 from src.core.workers.face_auth import FaceCaptchaWorker
 from src.core.workers.live import ReportLiveDataWorker
@@ -20,6 +21,7 @@ class StartLivePresenter(Presenter):
         self._cond = cond
 
     def prepare_success_view(self, live_result):
+        self._view.addr_input.setPlaceholderText("")
         self._view.parent_window.add_thread(ReportLiveDataWorker())
         match live_result:
             case 0:
@@ -53,11 +55,14 @@ class StartLivePresenter(Presenter):
                 )
 
     def prepare_fail_view(self, exception: Exception):
+        self._view.addr_input.setPlaceholderText("")
         self._view.start_btn.setEnabled(True)
         self._view.parent_window.tray_start_live_action.setEnabled(True)
         self._view.stop_btn.setEnabled(False)
         self._view.parent_window.tray_stop_live_action.setEnabled(False)
         self._view.modify_area_btn.setEnabled(True)
 
-    def prepare_progress_view(self, *args, **kwargs):
-        ...
+    def prepare_progress_view(self, progress: HedgeProgress):
+        self._view.addr_input.setPlaceholderText(
+            f"正在开播（第 {progress.attempt}/{progress.attempts} 次请求，"
+            f"剩余 {progress.remaining:.0f} 秒）")
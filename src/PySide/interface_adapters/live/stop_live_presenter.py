@@ -1,3 +1,4 @@
+from src.core.network import HedgeProgress
 from src.core.workers.base import Presenter
 
 
@@ -6,9 +7,11 @@ class StopLivePresenter(Presenter):
         super().__init__()
         self._view = view
 
-    def prepare_success_view(self, *args, **kwargs): ...
+    def prepare_success_view(self, *args, **kwargs):
+        self._view.addr_input.setPlaceholderText("")
 
     def prepare_fail_view(self, exception: Exception):
+        self._view.addr_input.setPlaceholderText("")
         self._view.start_btn.setEnabled(False)
         self._view.parent_window.tray_start_live_action.setEnabled(
             False)
@@ -16,4 +19,7 @@ class StopLivePresenter(Presenter):
         self._view.parent_window.tray_stop_live_action.setEnabled(True)
         self._view.modify_area_btn.setEnabled(True)
 
-    def prepare_progress_view(self, *args, **kwargs): ...
+    def prepare_progress_view(self, progress: HedgeProgress):
+        self._view.addr_input.setPlaceholderText(
+            f"正在停播（第 {progress.attempt}/{progress.attempts} 次请求，"
+            f"剩余 {progress.remaining:.0f} 秒）")
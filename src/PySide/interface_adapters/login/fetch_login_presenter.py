@@ -4,9 +4,10 @@ from src.PySide.interface_adapters.login import TicketFetchPresenter
 from src.PySide.interface_adapters.pre_live import FetchPreLivePresenter
 from src.PySide.states import LoginState
 from src.core import app_state
-from src.core.constant import LoginResult
+from src.core.constant import LoginResult, WorkerPriority
+from src.core.workers import WorkerGraph
 from src.core.workers.announce import FetchAnnounceWorker
-from src.core.workers.area import FetchAreaWorker
+from src.core.workers.area import FetchAreaWorker, FetchRecentAreaWorker
 from src.core.workers.base import Presenter
 from src.core.workers.login import TicketFetchWorker
 from src.core.workers.pre_live import FetchRoomStatusWorker, FetchPreLiveWorker
@@ -20,24 +21,40 @@ class FetchLoginPresenter(Presenter):
         self._state = state
 
     @staticmethod
-    def post_login(parent: "MainWindow", state: LoginState):
-        if app_state.scan_status["scanned"]:
-            parent.add_thread(TicketFetchWorker(TicketFetchPresenter()))
-            parent.add_thread(FetchRoomStatusWorker())
-            parent.add_thread(
-                FetchPreLiveWorker(FetchPreLivePresenter(parent.panel, state)))
-            parent.add_thread(
-                FetchAnnounceWorker(FetchAnnouncePresenter(parent.panel)))
-            parent.add_thread(
-                FetchAreaWorker(FetchAreaPresenter(state)))
+    def post_login(parent: "MainWindow"):
+        if not app_state.scan_status["scanned"]:
+            return
+        panel = parent.panel
+        bootstrap = WorkerGraph(
+            parent.add_thread, "post-login",
+            on_complete=parent.on_bootstrap_finished)
+        bootstrap.add(
+            "ticket", lambda: TicketFetchWorker(TicketFetchPresenter()))
+        bootstrap.add("room_status", FetchRoomStatusWorker)
+        bootstrap.add(
+            "pre_live",
+            lambda: FetchPreLiveWorker(FetchPreLivePresenter(panel)))
+        bootstrap.add(
+            "announce",
+            lambda: FetchAnnounceWorker(FetchAnnouncePresenter(panel)))
+        if app_state.area_catalog.load_cached():
+            # 先用缓存的分区进入面板，新的列表在后台获取
+            app_state.scan_status["area_updated"] = True
+            parent.add_thread(FetchAreaWorker(FetchAreaPresenter(panel)),
+                              priority=WorkerPriority.BACKGROUND)
+        else:
+            bootstrap.add("area",
+                          lambda: FetchAreaWorker(FetchAreaPresenter(panel)))
+        # 历史分区依赖 PreLive 返回的 room_id
+        bootstrap.add("recent_area", FetchRecentAreaWorker, after=("pre_live",))
+        parent.start_bootstrap(bootstrap)
 
     def prepare_success_view(self, login_result: LoginResult):
         if login_result == LoginResult.CANCELLED:
             return
-        self.post_login(self._view, self._state)
+        self.post_login(self._view)
         match login_result:
             case LoginResult.SUCCESS:
-                self._state.qrScanned.emit()
                 self._view.add_thread(FetchUsernamesWorker(""))
             case LoginResult.QR_EXPIRED:
                 self._state.qrExpired.emit()
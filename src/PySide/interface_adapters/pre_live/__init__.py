@@ -1 +1,2 @@
 from .fetch_pre_live_presenter import FetchPreLivePresenter
+from .refresh_pre_live_presenter import RefreshPreLivePresenter
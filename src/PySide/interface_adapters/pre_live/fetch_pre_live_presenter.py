@@ -1,6 +1,5 @@
 from src.PySide.interface_adapters.cover import CoverStateUpdatePresenter
 from src.PySide.interface_adapters.title import RecentTitlePresenter
-from src.PySide.states import LoginState
 from src.core import app_state
 from src.core.constant import CoverStatus
 from src.core.workers.base import Presenter
@@ -9,10 +8,9 @@ from src.core.workers.title import LoadRecentTitleWorker
 
 
 class FetchPreLivePresenter(Presenter):
-    def __init__(self, view: "StreamConfigPanel", state: LoginState):
+    def __init__(self, view: "StreamConfigPanel"):
         super().__init__()
         self._view = view
-        self._state = state
 
     def prepare_success_view(self):
         title_text = app_state.room_info["title"]
@@ -35,7 +33,6 @@ class FetchPreLivePresenter(Presenter):
             # add updating logic
             self._view.parent_window.add_thread(
                 CoverStateUpdateWorker(CoverStateUpdatePresenter(self._view)))
-        self._state.roomUpdated.emit()
 
     def prepare_fail_view(self, exception: Exception):
         ...
@@ -0,0 +1,20 @@
+from src.core import app_state
+from src.core.workers.base import Presenter
+
+
+class RefreshPreLivePresenter(Presenter):
+    def __init__(self, view: "StreamConfigPanel"):
+        super().__init__()
+        self._view = view
+
+    def prepare_success_view(self):
+        title_text = app_state.room_info["title"]
+        if title_text not in app_state.room_info["recent_title"]:
+            app_state.room_info["recent_title"].insert(0, title_text)
+        self._view.load_account_state()
+
+    def prepare_fail_view(self, exception: Exception):
+        ...
+
+    def prepare_progress_view(self, *args, **kwargs):
+        ...
@@ -1,5 +1,8 @@
 from logging import Handler
+from typing import Optional
 
+from src.PySide.interface_adapters.gui_dispatcher import GUIDispatcher, \
+    DispatchLane
 from src.PySide.states import LogState
 
 
@@ -10,7 +13,19 @@ class QSignalLogHandler(Handler):
         super().__init__()
         self._state = LogState()
         self.recordUpdated = self._state.recordUpdated
+        self._dispatcher = None
+
+    def set_dispatcher(self, dispatcher: Optional[GUIDispatcher]) -> None:
+        """
+        日志经由 GUIDispatcher 的低优先级通道批量送达界面，
+        避免日志高峰时每条记录各占一个排队事件。
+        """
+        self._dispatcher = dispatcher
 
     def emit(self, record):
         msg = self.format(record)
+        if (dispatcher := self._dispatcher) is not None:
+            dispatcher.post_to(DispatchLane.LOG, self._state.recordUpdated.emit,
+                               msg)
+            return
         self._state.recordUpdated.emit(msg)
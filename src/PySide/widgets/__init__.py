@@ -1,5 +1,6 @@
 from .crop_label import CropLabel
 from .log_viewer import LogViewer
+from .perf_panel import PerformancePanel
 from .recent_area import RecentAreaBar
 from .settings import SettingsWidget
 from .side_bar_frame import SideBar
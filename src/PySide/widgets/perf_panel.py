@@ -0,0 +1,149 @@
+from typing import Optional
+
+from PySide6.QtCore import QTimer, Slot, Qt
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, \
+    QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
+
+from src.PySide.interface_adapters import GUIDispatcher, DispatchLane
+from src.core.keystore import credential_store
+from src.core.metrics import LatencyStats, worker_metrics
+from src.core.network import response_cache
+
+
+def _ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value * 1000:.0f}"
+
+
+class PerformancePanel(QWidget):
+    WORKER_HEADERS = ("任务", "次数", "失败", "取消", "P50", "P95", "P99",
+                      "排队P95", "HTTP P95")
+    ENDPOINT_HEADERS = ("接口", "次数", "合并", "P50", "P95", "P99")
+    DISPATCH_HEADERS = ("界面队列", "积压", "次数", "P50", "P95", "P99")
+    KEYRING_HEADERS = ("凭据存储", "次数", "失败", "P50", "P95", "P99")
+    CACHE_HEADERS = ("响应缓存", "命中", "过期命中", "未命中", "刷新失败")
+    LANE_NAMES = {DispatchLane.STATE: "界面状态", DispatchLane.LOG: "日志"}
+
+    def __init__(self, parent=None, *,
+                 dispatcher: Optional[GUIDispatcher] = None,
+                 interval_ms: int = 1000):
+        super().__init__(parent)
+        self._dispatcher = dispatcher
+        layout = QVBoxLayout(self)
+
+        header = QHBoxLayout()
+        header.addWidget(QLabel("任务耗时（毫秒，最近 256 次）"))
+        header.addStretch(1)
+        self.reset_btn = QPushButton("清空")
+        self.reset_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.reset_btn.clicked.connect(self._reset)
+        header.addWidget(self.reset_btn)
+        layout.addLayout(header)
+
+        self.worker_table = self._make_table(self.WORKER_HEADERS)
+        layout.addWidget(self.worker_table, 1)
+        layout.addWidget(QLabel("接口耗时（毫秒）"))
+        self.endpoint_table = self._make_table(self.ENDPOINT_HEADERS)
+        layout.addWidget(self.endpoint_table, 1)
+        self.dispatch_table = self._make_table(self.DISPATCH_HEADERS)
+        self._fit_rows(self.dispatch_table, len(DispatchLane))
+        self.dispatch_table.setVisible(dispatcher is not None)
+        layout.addWidget(self.dispatch_table)
+        self.keyring_table = self._make_table(self.KEYRING_HEADERS)
+        self._fit_rows(self.keyring_table,
+                       len(credential_store.OPERATIONS) + 1)
+        layout.addWidget(self.keyring_table)
+        self.cache_table = self._make_table(self.CACHE_HEADERS)
+        self._fit_rows(self.cache_table, len(response_cache.POLICIES))
+        layout.addWidget(self.cache_table)
+
+        # 仅在页面可见时刷新
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.refresh)
+
+    def _make_table(self, headers: tuple[str, ...]) -> QTableWidget:
+        table = QTableWidget(0, len(headers), self)
+        table.setHorizontalHeaderLabels(headers)
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        h = table.horizontalHeader()
+        h.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for col in range(1, len(headers)):
+            h.setSectionResizeMode(col,
+                                   QHeaderView.ResizeMode.ResizeToContents)
+        return table
+
+    @staticmethod
+    def _fit_rows(table: QTableWidget, rows: int) -> None:
+        table.setFixedHeight(
+            table.horizontalHeader().sizeHint().height()
+            + table.verticalHeader().defaultSectionSize() * rows + 4)
+
+    @staticmethod
+    def _fill(table: QTableWidget, rows: list[tuple[str, ...]]) -> None:
+        table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, text in enumerate(row):
+                item = QTableWidgetItem(text)
+                if c:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight
+                                          | Qt.AlignmentFlag.AlignVCenter)
+                table.setItem(r, c, item)
+
+    @staticmethod
+    def _by_p95(stats: list[LatencyStats]) -> list[LatencyStats]:
+        return sorted(stats, key=lambda s: -1 if s.p95 is None else s.p95,
+                      reverse=True)
+
+    @Slot()
+    def refresh(self) -> None:
+        self._fill(self.worker_table, [
+            (s.name, str(s.count), str(s.failed), str(s.cancelled),
+             _ms(s.p50), _ms(s.p95), _ms(s.p99), _ms(s.queue_p95),
+             _ms(s.http_p95))
+            for s in self._by_p95(worker_metrics.worker_stats())
+        ])
+        self._fill(self.endpoint_table, [
+            (s.name, str(s.count), str(s.shared), _ms(s.p50), _ms(s.p95),
+             _ms(s.p99))
+            for s in self._by_p95(worker_metrics.endpoint_stats())
+        ])
+        self._fill(self.keyring_table, [
+            (s.name, str(s.count), str(s.failed), _ms(s.p50), _ms(s.p95),
+             _ms(s.p99))
+            for s in credential_store.stats()
+        ])
+        self._fill(self.cache_table, [
+            (s.name, str(s.fresh), str(s.stale), str(s.miss),
+             str(s.refresh_failed))
+            for s in response_cache.stats()
+        ])
+        if (dispatcher := self._dispatcher) is None:
+            return
+        depth = dispatcher.queue_depth()
+        rows = []
+        for lane in DispatchLane:
+            ring = dispatcher.latency[lane]
+            p50, p95, p99 = ring.percentiles(50, 95, 99)
+            rows.append((self.LANE_NAMES[lane], str(depth[lane]),
+                         str(ring.total), _ms(p50), _ms(p95), _ms(p99)))
+        self._fill(self.dispatch_table, rows)
+
+    @Slot()
+    def _reset(self) -> None:
+        worker_metrics.reset()
+        credential_store.reset_stats()
+        response_cache.reset_stats()
+        if self._dispatcher is not None:
+            self._dispatcher.reset_latency()
+        self.refresh()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self._timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._timer.stop()
@@ -25,6 +25,7 @@ class SideBar(QFrame):
             QIcon(str(icon_path / "light-home.svg")),
             QIcon(str(icon_path / "light-log.svg")),
             QIcon(str(icon_path / "light-settings.svg")),
+            QIcon(str(icon_path / "light-perf.svg")),
         ]
         self._dark_icons = [
             QIcon(str(icon_path / "dark-menu.svg")),
@@ -32,6 +33,7 @@ class SideBar(QFrame):
             QIcon(str(icon_path / "dark-home.svg")),
             QIcon(str(icon_path / "dark-log.svg")),
             QIcon(str(icon_path / "dark-settings.svg")),
+            QIcon(str(icon_path / "dark-perf.svg")),
         ]
 
         def mk_btn(text: str, icon_index, *, checkable: bool = True):
@@ -59,6 +61,7 @@ class SideBar(QFrame):
         self.btn_theme = mk_btn("", 1, checkable=False)
         self.btn_home = mk_btn(" 主界面", 2)
         self.btn_log = mk_btn(" 日志", 3)
+        self.btn_perf = mk_btn(" 性能", 5)
         self.btn_settings = mk_btn(" 设置", 4)
 
         v = QVBoxLayout(self)
@@ -69,6 +72,7 @@ class SideBar(QFrame):
         v.addWidget(self.btn_home)
         v.addStretch(1)
         v.addWidget(self.btn_log)
+        v.addWidget(self.btn_perf)
         v.addWidget(self.btn_settings)
 
         self._anim = QVariantAnimation(self, duration=200)
@@ -77,7 +81,7 @@ class SideBar(QFrame):
         self._anim.setEasingCurve(QEasingCurve.Type.OutCubic)
         self._menu_buttons = [
             self.toggle_btn, self.btn_theme, self.btn_home, self.btn_log,
-            self.btn_settings
+            self.btn_settings, self.btn_perf
         ]
 
     @Slot()
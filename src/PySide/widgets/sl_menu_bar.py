@@ -1,18 +1,20 @@
-from contextlib import suppress
+from datetime import datetime
 from shutil import rmtree
 
 from PySide6.QtCore import Slot, QUrl, Signal
 from PySide6.QtGui import QAction, QActionGroup, QDesktopServices
 from PySide6.QtWidgets import QMenuBar, QMenu
-from keyring import delete_password, set_password
-from keyring.errors import PasswordDeleteError
 
 from src.PySide.log import get_logger, get_log_path
 from src.core import app_state
 from src.core.app_state import dumps
-from src.core.cache import cache_base_dir
+from src.core.cache import cache_base_dir, get_cache_path
 from src.core.constant import *
+from src.core.keystore import credential_store, refresh_token_key
+from src.core.metrics import tracer
+from src.core.network import response_cache
 from src.core.workers.credentials import CredentialManagerWorker
+from src.core.workers.usernames import username_cache
 
 
 class StartLiveMenuBar(QMenuBar):
@@ -31,6 +33,9 @@ class StartLiveMenuBar(QMenuBar):
         _open_log_folder_action = QAction("显示日志文件", self)
         _open_log_folder_action.triggered.connect(self._open_log_folder)
         self._tools_menu.addAction(_open_log_folder_action)
+        self._trace_action = QAction("记录性能追踪", self, checkable=True)
+        self._trace_action.toggled.connect(self._toggle_trace)
+        self._tools_menu.addAction(self._trace_action)
         self.addMenu(self._tools_menu)
 
         self._setting_menu = QMenu("缓存设置", self)
@@ -92,6 +97,27 @@ class StartLiveMenuBar(QMenuBar):
         log_dir, _ = get_log_path(is_makedir=False)
         QDesktopServices.openUrl(QUrl.fromLocalFile(log_dir))
 
+    @Slot(bool)
+    def _toggle_trace(self, checked: bool):
+        if checked:
+            tracer.start()
+            self.logger.info("Tracing started.")
+            return
+        self.finish_trace()
+
+    def finish_trace(self):
+        """
+        停止追踪并将结果写入日志目录，可在 chrome://tracing 或 Perfetto 中打开。
+        """
+        _, trace_path = get_cache_path(
+            CacheType.LOGS, f"trace-{datetime.now():%Y%m%d-%H%M%S}.json")
+        if tracer.stop(trace_path) is not None:
+            self.logger.info(f"Trace written to {trace_path}")
+        if self._trace_action.isChecked():
+            self._trace_action.blockSignals(True)
+            self._trace_action.setChecked(False)
+            self._trace_action.blockSignals(False)
+
     @Slot()
     def delete_cookies(self):
         # Goes here when manually delete cookies or when cookies are expired.
@@ -109,48 +135,47 @@ class StartLiveMenuBar(QMenuBar):
         expired = app_state.scan_status["expired"]
         cookie_index = CredentialManagerWorker.get_cookie_indices()
         self.logger.info(f"origin cookie index: {cookie_index}")
-        with suppress(PasswordDeleteError):
-            delete_password(KEYRING_SERVICE_NAME,
-                            cookie_index[
-                                app_state.cookie_state.current_cookie_idx])
+        deleted_key = cookie_index[app_state.cookie_state.current_cookie_idx]
+        credential_store.delete(deleted_key)
+        credential_store.delete(refresh_token_key(deleted_key))
         cookie_index.remove(
             cookie_index[app_state.cookie_state.current_cookie_idx])
         self.logger.info(f"new cookie index: {cookie_index}")
-        set_password(KEYRING_SERVICE_NAME, KEYRING_COOKIES_INDEX,
-                     dumps(cookie_index))
+        credential_store.set(KEYRING_COOKIES_INDEX, dumps(cookie_index))
         if not expired:
             # delete cookies manually
             app_state.cookie_state.current_cookie_idx = max(0,
                                                             app_state.cookie_state.current_cookie_idx - 1)
         self._populate_account_menu()
+        # 删除的账号不再缓存
+        app_state.account_contexts.pop(deleted_key, None)
+        username_cache.discard(deleted_key)
+        response_cache.discard_scope(deleted_key.partition("|")[2])
         CredentialManagerWorker.reset_default()
         self.cookieDeleted.emit(app_state.cookie_state.cookie_index_len == 0,
                                 expired)
 
     @Slot()
     def _delete_settings(self):
-        with suppress(PasswordDeleteError):
-            delete_password(KEYRING_SERVICE_NAME, KEYRING_SETTINGS)
+        credential_store.delete(KEYRING_SETTINGS)
         self.obsSettingsDeleted.emit()
 
     @Slot()
     def _delete_app_settings(self):
-        with suppress(PasswordDeleteError):
-            delete_password(KEYRING_SERVICE_NAME, KEYRING_APP_SETTINGS)
+        credential_store.delete(KEYRING_APP_SETTINGS)
         app_state.app_settings_default()
         self.appSettingsDeleted.emit()
 
     @Slot()
     def _delete_cred(self):
-        with suppress(PasswordDeleteError):
-            delete_password(KEYRING_SERVICE_NAME, KEYRING_SETTINGS)
+        credential_store.delete(KEYRING_SETTINGS)
         for cookie in CredentialManagerWorker.get_cookie_indices():
-            with suppress(PasswordDeleteError):
-                delete_password(KEYRING_SERVICE_NAME, cookie)
-        with suppress(PasswordDeleteError):
-            delete_password(KEYRING_SERVICE_NAME, KEYRING_COOKIES_INDEX)
-        with suppress(PasswordDeleteError):
-            delete_password(KEYRING_SERVICE_NAME, KEYRING_APP_SETTINGS)
+            credential_store.delete(cookie)
+            credential_store.delete(refresh_token_key(cookie))
+        credential_store.delete(KEYRING_COOKIES_INDEX)
+        credential_store.delete(KEYRING_APP_SETTINGS)
+        # 程序随后退出，立即写出删除操作并移除加密凭据文件
+        credential_store.discard_vault()
         if cache_base_dir(CacheType.CONFIG).is_dir():
             rmtree(cache_base_dir(CacheType.CONFIG))
         self.credDeleted.emit(True)
@@ -167,7 +192,7 @@ class StartLiveMenuBar(QMenuBar):
             return
         elif idx != app_state.cookie_state.current_cookie_idx:
             app_state.cookie_state.current_cookie_idx = idx
-            CredentialManagerWorker.reset_default()
+            # 状态的重置交给主窗口，已缓存的账号直接换入
             self.accountSwitch.emit()
 
     def _ready_switch_account(self):
@@ -198,5 +223,7 @@ class StartLiveMenuBar(QMenuBar):
                 app_state.cookie_state.idx_equals_len():
             return
         app_state.cookie_state.incr_to_upper()
+        # 新账号使用新的上下文，当前账号的缓存保持不变
+        app_state.activate_context("")
         CredentialManagerWorker.reset_default()
         self.accountAdded.emit()
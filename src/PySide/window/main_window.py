@@ -2,7 +2,7 @@
 from concurrent.futures import Future
 from pathlib import Path
 from threading import Thread
-from typing import Optional
+from typing import Optional, Callable
 
 # package import
 from PIL import ImageQt
@@ -21,7 +21,6 @@ from PySide6.QtWidgets import (QApplication,
                                QGraphicsPixmapItem
                                )
 from darkdetect import isLight
-from keyring import set_password
 from qdarktheme import setup_theme
 from qrcode.main import QRCode
 
@@ -29,7 +28,8 @@ from src.PySide.classes import SingleInstanceWindow, ClickableLabel
 from src.PySide.interface_adapters import GUIDispatcher
 from src.PySide.interface_adapters.const import ConstantUpdatePresenter, \
     VersionCheckerPresenter
-from src.PySide.interface_adapters.credentials import CredentialManagerPresenter
+from src.PySide.interface_adapters.credentials import \
+    CredentialManagerPresenter, AccountRevalidatePresenter
 from src.PySide.interface_adapters.face_auth import FaceAuthPresenter
 from src.PySide.interface_adapters.gui_presenter import GUIPresenter
 from src.PySide.interface_adapters.live_delay import FetchTimeShiftPresenter
@@ -38,20 +38,26 @@ from src.PySide.interface_adapters.login import FetchQRPresenter, \
 from src.PySide.log import get_logger, init_logger
 from src.PySide.states import LoginState
 from src.PySide.web_server import HttpServerWorker
-from src.PySide.widgets import StartLiveMenuBar, LogViewer, SideBar
+from src.PySide.widgets import StartLiveMenuBar, LogViewer, SideBar, \
+    PerformancePanel
 from src.core import app_state
 from src.core.app_state import dumps
 from src.core.cache import del_cache_user
 from src.core.constant import *
-from src.core.workers import WorkerManager
+from src.core.keystore import credential_store
+from src.core.network import adaptive_timeouts
+from src.core.workers import WorkerManager, WorkerGraph, StageTiming, \
+    AccountPrefetcher
 from src.core.workers.base import LongLiveWorker, BaseWorker
 from src.core.workers.const import ConstantUpdateWorker, VersionCheckerWorker
 from src.core.workers.credentials import CredentialManagerWorker
 from src.core.workers.face_auth import FaceAuthWorker, \
     ReportFaceRecognitionWorker
 from src.core.workers.live_delay import FetchStreamTimeShiftWorker
-from src.core.workers.login import FetchLoginWorker, FetchQRWorker
+from src.core.workers.login import FetchLoginWorker, FetchQRWorker, \
+    CredentialRefreshWorker
 from src.core.workers.obs_ws import ObsDaemonWorker
+from src.core.workers.prewarm import ConnectionPrewarmWorker
 from .face_qr import FaceQRWidget
 from .settings_page import SettingsPage
 from .stream_config import StreamConfigPanel
@@ -67,6 +73,8 @@ class MainWindow(SingleInstanceWindow):
     _port: int
     _first_run: bool
     _logged_in: bool
+    _bootstrap: Optional[WorkerGraph]
+    _bootstrap_done: bool
     _cred_deleted: bool
     _no_const_update: bool
     _new_version_str: Optional[str]
@@ -88,6 +96,13 @@ class MainWindow(SingleInstanceWindow):
     face_window: Optional[FaceQRWidget]
     tray_start_live_action: QAction
     tray_stop_live_action: QAction
+    # 登录提示行：(依赖的 scan_status 字段, 完成文案, 进行中文案)
+    LOGIN_HINTS = {
+        "area": (("area_updated",), "分区已更新！", "正在更新分区..."),
+        "room": (("room_updated", "announce_updated"), "房间信息已更新！",
+                 "正在更新房间信息..."),
+        "const": (("const_updated",), "请求参数已更新！", "正在更新请求参数..."),
+    }
 
     def __init__(self, host, port, first_run, no_const_update, /,
                  base_path: Path):
@@ -115,9 +130,17 @@ class MainWindow(SingleInstanceWindow):
         self._new_version_str = None
         self._download_per = 0
         self._gui_dispatcher = GUIDispatcher()
+        gui_handler.set_dispatcher(self._gui_dispatcher)
+        self._perf_panel = PerformancePanel(self,
+                                            dispatcher=self._gui_dispatcher)
         self._gui_presenter = GUIPresenter(self)
         self._thread_manager = WorkerManager(self._gui_dispatcher)
         self.logger.info("Thread Pool initialized.")
+        self._login_hints: dict[str, str] = {}
+        self._scan_subscription = app_state.scan_status.subscribe(
+            ("scanned",
+             *(key for keys, _, _ in self.LOGIN_HINTS.values() for key in keys)),
+            self._on_scan_status_changed, dispatcher=self._gui_dispatcher)
 
         self.setWindowTitle(self._base_title)
         self._color_scheme = None
@@ -133,6 +156,7 @@ class MainWindow(SingleInstanceWindow):
             (self._side_bar.btn_home, 1),
             (self._side_bar.btn_log, 2),
             (self._side_bar.btn_settings, 3),
+            (self._side_bar.btn_perf, 4),
         ]
         for btn, idx in mapping:
             btn_group.addButton(btn)
@@ -192,6 +216,9 @@ class MainWindow(SingleInstanceWindow):
         self._first_run = first_run
         # Widgets for login phase
         self.panel = None
+        self._bootstrap = None
+        self._prefetcher: Optional[AccountPrefetcher] = None
+        self._credential_refresh: Optional[Future] = None
         self.setup_ui()
         self._init_http_server()
         self.update_controller = VelopackUpdateController(
@@ -213,6 +240,12 @@ class MainWindow(SingleInstanceWindow):
 
     def setup_ui(self, *, is_new: bool = False):
         self._logged_in = False
+        self._login_hints = {}
+        if self._bootstrap is not None:
+            self._bootstrap.cancel()
+            self._bootstrap = None
+        self._bootstrap_done = False
+        self._cancel_prefetch()
         if app_state.obs_client is not None:
             ObsDaemonWorker.disconnect_obs()
             self.panel.obs_btn_state.obsDisconnected.emit()
@@ -233,11 +266,7 @@ class MainWindow(SingleInstanceWindow):
         self.login_label = QLabel("正在获取保存的登录凭证...")
         self.status_label = ClickableLabel("等待登录中...")
         self.qr_label = QLabel()
-        self._login_state.areaUpdated.connect(self._post_scan_setup)
-        self._login_state.constUpdated.connect(self._post_scan_setup)
         self._login_state.credentialLoaded.connect(self.load_credentials)
-        self._login_state.roomUpdated.connect(self._post_scan_setup)
-        self._login_state.qrScanned.connect(self._post_scan_setup)
         self._login_state.qrExpired.connect(self._qr_expired)
         self._login_state.qrNotConfirmed.connect(self._qr_not_confirmed)
         self._login_state.versionChecked.connect(self._new_version_hint)
@@ -248,7 +277,7 @@ class MainWindow(SingleInstanceWindow):
             app_state.scan_status["const_updated"] = True
         elif not app_state.scan_status["const_updated"]:
             self.add_thread(ConstantUpdateWorker(
-                ConstantUpdatePresenter(self._login_state)))
+                ConstantUpdatePresenter()))
             self.add_thread(VersionCheckerWorker(
                 VersionCheckerPresenter(self._login_state)))
         # Styling and alignment
@@ -280,6 +309,9 @@ class MainWindow(SingleInstanceWindow):
         if self._stack.indexOf(self._settings_page) == -1:
             self._stack.insertWidget(WidgetIndex.WIDGET_SETTINGS,
                                      self._settings_page)
+        if self._stack.indexOf(self._perf_panel) == -1:
+            self._stack.insertWidget(WidgetIndex.WIDGET_PERFORMANCE,
+                                     self._perf_panel)
         self._stack.setCurrentIndex(WidgetIndex.WIDGET_LOGIN)
         self._side_bar.btn_home.setChecked(True)
 
@@ -300,6 +332,8 @@ class MainWindow(SingleInstanceWindow):
             CredentialManagerPresenter(self, self._login_state),
             app_state.cookie_state.current_cookie_idx, is_new)
         self.login_worker = None
+        # 读取凭据的同时建立到接口服务器的连接，失败时静默
+        self._thread_manager.submit(ConnectionPrewarmWorker())
         self.add_thread(self.credential_worker)
 
         self.face_window: Optional[FaceQRWidget] = None
@@ -335,9 +369,27 @@ class MainWindow(SingleInstanceWindow):
             self._rebuild_title()
 
     def add_thread(self, worker: BaseWorker | LongLiveWorker, /,
-                   on_progress: bool = False):
+                   on_progress: bool = False,
+                   on_done: Callable[[Optional[BaseException]], None]
+                   | None = None,
+                   priority: WorkerPriority | None = None) -> Future:
         worker.add_presenter(self._gui_presenter)
-        self._thread_manager.submit(worker, on_progress=on_progress)
+        return self._thread_manager.submit(worker, on_progress=on_progress,
+                                           on_done=on_done, priority=priority)
+
+    def start_bootstrap(self, bootstrap: WorkerGraph) -> None:
+        if self._bootstrap is not None:
+            self._bootstrap.cancel()
+        self._bootstrap = bootstrap
+        self._bootstrap_done = False
+        bootstrap.start()
+
+    def on_bootstrap_finished(self, timings: dict[str, StageTiming]) -> None:
+        if self._bootstrap is None:
+            return
+        self._bootstrap = None
+        self._bootstrap_done = True
+        self._post_scan_setup()
 
     def _restart_thread_manager(self) -> None:
         """
@@ -447,13 +499,19 @@ class MainWindow(SingleInstanceWindow):
             return
         if app_state.obs_settings:
             self.logger.info("Saving OBS connection settings.")
-            set_password(KEYRING_SERVICE_NAME, KEYRING_SETTINGS,
-                         dumps(app_state.obs_settings.internal))
+            credential_store.set(KEYRING_SETTINGS,
+                                 dumps(app_state.obs_settings.internal))
         if app_state.app_settings:
             self.logger.info("Saving app settings.")
-            set_password(KEYRING_SERVICE_NAME, KEYRING_APP_SETTINGS,
-                         dumps(app_state.app_settings.internal))
+            credential_store.set(KEYRING_APP_SETTINGS,
+                                 dumps(app_state.app_settings.internal))
+        self._scan_subscription.cancel()
+        self._cancel_prefetch()
         self._thread_manager.shutdown(wait=True)
+        # 工作线程结束后再写出，不会遗漏它们保存的凭据
+        credential_store.flush()
+        adaptive_timeouts.save()
+        self.menu_bar.finish_trace()
         self._stop_http_server()
         self.tray_icon.hide()
         self.tray_icon.deleteLater()
@@ -513,6 +571,33 @@ class MainWindow(SingleInstanceWindow):
 
     @Slot()
     def _on_switch_account(self):
+        previous = app_state.default_context
+        if busy := self._thread_manager.surviving_workers(previous):
+            # 开播/停播请求可能已送达，结果要记到原账号并显示在当前界面上
+            app_state.cookie_state.current_cookie_idx = \
+                app_state.cookie_indices.index(previous.name)
+            QMessageBox.information(
+                self, "切换账号",
+                f"{'、'.join(w.name for w in busy)}尚未完成，请稍后再切换账号")
+            return
+        key = app_state.cookie_indices[
+            app_state.cookie_state.current_cookie_idx]
+        context = app_state.activate_context(key)
+        if not self._logged_in or not context.room_info["room_id"]:
+            # 该账号尚未加载过，走完整的登录流程
+            self.reload_account()
+            return
+        # 界面和线程池保持不变，只取消旧账号的任务并换入缓存的状态
+        self._thread_manager.cancel_context(previous)
+        self.panel.load_account_state()
+        self.logger.info(f"switched to cached account {key}")
+        self.add_thread(CredentialManagerWorker(
+            AccountRevalidatePresenter(self),
+            app_state.cookie_state.current_cookie_idx, revalidate=True))
+
+    def reload_account(self):
+        app_state.account_contexts.pop(app_state.default_context.name, None)
+        CredentialManagerWorker.reset_default()
         self.setup_ui()
 
     @staticmethod
@@ -633,7 +718,7 @@ class MainWindow(SingleInstanceWindow):
 
     def _after_login_success(self):
         self.panel.parent_combo.clear()
-        self.panel.parent_combo.addItems(app_state.parent_area)
+        self.panel.parent_combo.addItems(app_state.area_catalog.choices())
         self._stack.setCurrentIndex(1)
         self._side_bar.btn_home.setChecked(True)
         if app_state.obs_settings.get("auto_connect", False):
@@ -645,33 +730,74 @@ class MainWindow(SingleInstanceWindow):
         self.panel.enable_child_combo_autosave(True)
         self._logged_in = True
         self._start_http_server()
+        self.start_prefetch()
+        self._start_credential_refresh()
 
-    @Slot()
-    def _post_scan_setup(self):
-        if not app_state.scan_status["scanned"]:
+    def _start_credential_refresh(self):
+        # 线程池重启后旧的刷新任务已被取消
+        if self._credential_refresh is not None and \
+                not self._credential_refresh.done():
+            return
+        # 不经过 add_thread，刷新失败只记录日志，不弹窗
+        self._credential_refresh = self._thread_manager.submit(
+            CredentialRefreshWorker(), on_progress=True)
+
+    def start_prefetch(self):
+        """
+        Prefetches the other saved accounts in the background when enabled,
+        so that switching to them takes the cached path.
+        """
+        if not app_state.app_settings["prefetch_accounts"] or \
+                not self._logged_in or self._prefetcher is not None:
+            return
+        current = app_state.default_context.name
+        keys = [key for key in app_state.cookie_indices if key != current]
+        if not keys:
+            return
+        # 不经过 add_thread，其他账号的失败只记录日志，不弹窗
+        self._prefetcher = prefetcher = AccountPrefetcher(
+            self._thread_manager.submit, keys,
+            on_finished=lambda: self._prefetch_finished(prefetcher))
+        prefetcher.start()
+
+    def _prefetch_finished(self, prefetcher: AccountPrefetcher):
+        # 队列清空后允许下次登录或重新开启时再次预取
+        if self._prefetcher is prefetcher:
+            self._prefetcher = None
+
+    def _cancel_prefetch(self):
+        if self._prefetcher is not None:
+            self._prefetcher.cancel()
+            self._prefetcher = None
+
+    def update_login_hint(self, changed: frozenset[str] | None = None):
+        if not (status := app_state.scan_status.snapshot())["scanned"]:
             return
         if self.status_label.text() != "登录成功！":
             self.status_label.setText("登录成功！")
             self.status_label.setStyleSheet("color: green;font-size: 16pt;")
-        if app_state.scan_status["area_updated"]:
-            login_hint1 = "分区已更新！"
-        else:
-            login_hint1 = "正在更新分区..."
-        if app_state.scan_status["room_updated"] and app_state.scan_status[
-            "announce_updated"]:
-            login_hint2 = "房间信息已更新！"
-        else:
-            login_hint2 = "正在更新房间信息..."
-        if app_state.scan_status["const_updated"]:
-            login_hint3 = "请求参数已更新！"
-        else:
-            login_hint3 = "正在更新请求参数..."
-        login_hint = f"{login_hint1}\n{login_hint2}\n{login_hint3}"
-        self.login_label.setText(login_hint)
-        if not app_state.scan_status["area_updated"] or \
-                not app_state.scan_status["room_updated"] or \
-                not app_state.scan_status["const_updated"] or \
-                not app_state.scan_status["announce_updated"]:
+        # 只重新计算发生变化的提示行
+        full = changed is None or "scanned" in changed or not self._login_hints
+        for line, (keys, done, pending) in self.LOGIN_HINTS.items():
+            if full or not changed.isdisjoint(keys):
+                self._login_hints[line] = done if all(
+                    status[key] for key in keys) else pending
+        self.login_label.setText("\n".join(self._login_hints.values()))
+
+    def _on_scan_status_changed(self, changed: frozenset[str]) -> None:
+        self.update_login_hint(changed)
+        self._post_scan_setup(update_hint=False)
+
+    def _post_scan_setup(self, *, update_hint: bool = True):
+        if not (status := app_state.scan_status.snapshot())["scanned"]:
+            return
+        if update_hint:
+            self.update_login_hint()
+        # 登录后的拉取流程由 WorkerGraph 统一完成后再进入面板
+        if self._logged_in or not self._bootstrap_done:
+            return
+        if not all(status[key] for keys, _, _ in self.LOGIN_HINTS.values()
+                   for key in keys):
             return
         self._after_login_success()
 
@@ -1,7 +1,7 @@
 from PySide6.QtCore import Slot
 from PySide6.QtGui import QIntValidator
 from PySide6.QtWidgets import (
-    QLineEdit, QButtonGroup, QPushButton, QFontDialog, QSlider
+    QLineEdit, QButtonGroup, QPushButton, QFontDialog, QSlider, QMessageBox
 )
 
 from src.PySide.interface_adapters.live_delay import TimeShiftUpdatePresenter
@@ -9,6 +9,7 @@ from src.PySide.widgets import SettingsWidget
 from src.core import app_state
 from src.core.app_state import bg_settings_default
 from src.core.constant import ProxyMode, PreferProto
+from src.core.keystore import credential_store
 from src.core.workers.live_delay import StreamTimeShiftUpdateWorker
 
 
@@ -17,6 +18,8 @@ class SettingsPage(SettingsWidget):
     delay_edit: QLineEdit
     delay_save_btn: QPushButton
     prefer_proto_group: QButtonGroup
+    prefetch_group: QButtonGroup
+    vault_group: QButtonGroup
     cover_edit: QLineEdit
     cover_btn: QPushButton
     bg_mode_group: QButtonGroup
@@ -76,6 +79,20 @@ class SettingsPage(SettingsWidget):
         )
         self.prefer_proto_group.idClicked.connect(self._on_prefer_proto_changed)
 
+        self.prefetch_group = self.add_multi_choice_item(
+            "多账号预加载",
+            ["不预加载", "登录后在后台预加载其他账号的直播间信息"],
+            default=int(app_state.app_settings["prefetch_accounts"])
+        )
+        self.prefetch_group.idClicked.connect(self._on_prefetch_changed)
+
+        self.vault_group = self.add_multi_choice_item(
+            "凭据存储",
+            ["系统凭据管理器", "加密文件（系统凭据管理器仅保存密钥）"],
+            default=int(credential_store.vault_enabled)
+        )
+        self.vault_group.idClicked.connect(self._on_vault_changed)
+
         self.cover_edit, self.cover_btn = self.add_file_picker_item(
             "自定义背景图片", dialog_title="选择背景图片",
             name_filter="图片文件 (*.jfif;*.pjpeg;*.jpeg;*.pjp;*.jpg;*.png);;所有文件 (*)",
@@ -155,6 +172,26 @@ class SettingsPage(SettingsWidget):
             case _:
                 raise ValueError("Unexpected protocol choice")
 
+    @Slot(int)
+    def _on_prefetch_changed(self, _id: int):
+        app_state.app_settings["prefetch_accounts"] = _id == 1
+        if _id == 1:
+            self._parent_window.start_prefetch()
+        else:
+            self._parent_window._cancel_prefetch()
+
+    @Slot(int)
+    def _on_vault_changed(self, _id: int):
+        try:
+            if _id == 1:
+                credential_store.enable_vault()
+            else:
+                credential_store.disable_vault()
+        except Exception as e:
+            QMessageBox.warning(self, "凭据存储", f"凭据迁移失败: {e}")
+        self.vault_group.button(
+            int(credential_store.vault_enabled)).setChecked(True)
+
     @Slot(int)
     def _on_proxy_mode_changed(self, _id: int):
         is_custom = (_id == 2)
@@ -241,4 +278,6 @@ class SettingsPage(SettingsWidget):
         self.proxy_addr_edit.update_placeholder("socks5://127.0.0.1:7898")
         self.prefer_proto_group.button(
             app_state.app_settings["prefer_proto"]).setChecked(True)
+        self.prefetch_group.button(
+            int(app_state.app_settings["prefetch_accounts"])).setChecked(True)
         self.reset_bg()
@@ -181,7 +181,7 @@ class StreamConfigPanel(QWidget):
         area_group_layout.addWidget(self.save_announce_btn, 1, 8)
 
         area_group_layout.addWidget(QLabel("分区选择:"), 2, 0, 1, 1)
-        self.parent_combo = CompletionComboBox(app_state.parent_area)
+        self.parent_combo = CompletionComboBox(app_state.area_catalog.choices())
         # self.parent_combo.addItems(config.parent_area)
         area_group_layout.addWidget(self.parent_combo, 2, 1, 1, 3)
         self._child_combo_autosave = False
@@ -239,16 +239,56 @@ class StreamConfigPanel(QWidget):
         self.obs_auto_connect_checkbox.setChecked(False)
         self.obs_auto_live_checkbox.setChecked(False)
 
+    def load_account_state(self):
+        """
+        Refills the panel from the active account's ``room_info`` and
+        ``stream_status`` without requesting anything, used when switching to
+        an account whose state is cached.
+        """
+        room_info = app_state.room_info.snapshot()
+        stream_status = app_state.stream_status.snapshot()
+        self.title_input.clear()
+        self.title_input.addItems(room_info["recent_title"])
+        self.title_input.setCurrentText(room_info["title"])
+        self.save_title_btn.setEnabled(False)
+        self.announce_input.setText(room_info["announcement"])
+        self.save_announce_btn.setEnabled(False)
+        # 只恢复界面上的分区，不触发自动保存
+        _enabled = self.enable_child_combo_autosave(False)
+        self.parent_combo.setCurrentText(room_info["parent_area"] or "请选择")
+        self.child_combo.setCurrentText(room_info["area"])
+        self.enable_child_combo_autosave(_enabled)
+        live = stream_status["live_status"]
+        self.addr_input.setText(stream_status["stream_addr"] or "")
+        self.key_input.setText(stream_status["stream_key"] or "")
+        self.start_btn.setEnabled(not live)
+        self.parent_window.tray_start_live_action.setEnabled(not live)
+        self.stop_btn.setEnabled(live)
+        self.parent_window.tray_stop_live_action.setEnabled(live)
+        self.cover_audit_state()
+
+    def reload_areas(self):
+        """Refills the area combos from the catalog, keeping the selection."""
+        parent = self.parent_combo.currentText()
+        child = self.child_combo.currentText()
+        _enabled = self.enable_child_combo_autosave(False)
+        self.parent_combo.clear()
+        self.parent_combo.addItems(app_state.area_catalog.choices())
+        # 父分区文本变化时 update_child_combo 会重建子分区
+        self.parent_combo.setCurrentText(parent)
+        self.child_combo.setCurrentText(child)
+        self.enable_child_combo_autosave(_enabled)
+
     def enable_child_combo_autosave(self, enabled: bool) -> bool:
         old = self._child_combo_autosave
         self._child_combo_autosave = enabled
         return old
 
     def update_child_combo(self, text):
-        if text in app_state.area_options:
+        if children := app_state.area_catalog.children(text):
             _enabled = self.enable_child_combo_autosave(False)
             self.child_combo.clear()
-            self.child_combo.addItems(app_state.area_options[text])
+            self.child_combo.addItems(children)
             self.child_combo.setEnabled(True)
             self.enable_child_combo_autosave(_enabled)
             self._save_area(self.child_combo.currentText())
@@ -312,13 +352,13 @@ class StreamConfigPanel(QWidget):
         if app_state.obs_settings.get("auto_connect",
                                       False) and app_state.obs_client is None:
             self.connect_btn.click()
-        area_code = app_state.area_codes[self.child_combo.currentText()]
+        area_code = app_state.area_catalog.code(self.child_combo.currentText())
         app_state.room_info["parent_area"] = self.parent_combo.currentText()
         app_state.room_info["area"] = self.child_combo.currentText()
         app_state.room_info["area_code"] = area_code
         self.parent_window.add_thread(StartLiveWorker(
             StartLivePresenter(self, self.stream_state, cond=self._cond),
-            area=area_code))
+            area=area_code), on_progress=True)
 
     def _stop_live(self):
         if not self.stop_btn.isEnabled():
@@ -335,8 +375,9 @@ class StreamConfigPanel(QWidget):
         self.key_input.setText("")
         if app_state.obs_client is not None:
             if self.obs_auto_live_checkbox.isChecked():
-                app_state.obs_req_queue.put(("StopStream", {}))
-        self.parent_window.add_thread(StopLiveWorker(StopLivePresenter(self)))
+                ObsDaemonWorker.request("StopStream", {})
+        self.parent_window.add_thread(StopLiveWorker(StopLivePresenter(self)),
+                                      on_progress=True)
 
     def fill_stream_info(self, addr: str, key: str):
         if app_state.obs_connecting:
@@ -347,7 +388,7 @@ class StreamConfigPanel(QWidget):
             str(key))
 
         if app_state.obs_client is not None:
-            app_state.obs_req_queue.put(("SetStreamServiceSettings", {
+            ObsDaemonWorker.request("SetStreamServiceSettings", {
                 "streamServiceType": "rtmp_custom",
                 "streamServiceSettings": {
                     "bwtest": False,
@@ -355,9 +396,9 @@ class StreamConfigPanel(QWidget):
                     "key": str(key),
                     "use_auth": False
                 }
-            }))
+            })
             if self.obs_auto_live_checkbox.isChecked():
-                app_state.obs_req_queue.put(("StartStream", {}))
+                ObsDaemonWorker.request("StartStream", {})
 
     @Slot()
     def _connect_obs(self):
@@ -445,8 +486,8 @@ class StreamConfigPanel(QWidget):
         parent_choose = self.parent_combo.currentText()
         if parent_choose == "请选择":
             return False
-        return parent_choose in app_state.parent_area and self.child_combo.currentText() in \
-            app_state.area_options[self.parent_combo.currentText()]
+        return app_state.area_catalog.has_child(parent_choose,
+                                                self.child_combo.currentText())
 
     @Slot()
     def _save_area(self, child_area: str):
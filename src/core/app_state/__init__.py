@@ -5,14 +5,16 @@ from platform import node
 from queue import Queue
 from typing import Optional, Any, List
 
-from keyring import get_password
 from obsws_python import ReqClient
 from requests import Session
 from requests.cookies import cookiejar_from_dict
 
-from .app_state_base import StateBase
+from .app_state_base import StateBase, Subscription
+from .area_catalog import AreaCatalog, AreaDiff
 from .. import constant
 from ..constant import *
+from ..keystore import credential_store
+from ..network import SessionPool, session_pool
 from ..sign import gen_buvid
 
 dumps = partial(dumps, ensure_ascii=False,
@@ -33,6 +35,7 @@ class AppSettings(StateBase):
     custom_bg_mode: BackgroundMode = BackgroundMode.COVER
     app_buvid: str = gen_buvid()
     auto_start_live: bool = False
+    prefetch_accounts: bool = False
 
 
 @dataclass(slots=True)
@@ -114,8 +117,7 @@ stream_status = StreamStatus()
 
 app_settings = AppSettings()
 
-if (app := get_password(KEYRING_SERVICE_NAME,
-                        KEYRING_APP_SETTINGS)) is not None:
+if (app := credential_store.get(KEYRING_APP_SETTINGS)) is not None:
     app_settings.update(loads(app))
 
 # Managed by models.workers.credential_manager
@@ -126,10 +128,7 @@ usernames = {}
 cookie_indices = []
 cookie_state = CookieState()
 # Area (category) selections for live stream configuration
-parent_area = ["请选择"]
-area_options: dict[str, List[str]] = {}
-area_reverse: dict[str, str] = {}
-area_codes = {}
+area_catalog = AreaCatalog()
 
 # OBS WebSocket client
 obs_client: Optional[ReqClient] = None
@@ -140,44 +139,97 @@ obs_connecting = False
 cookies_dict = {}
 
 
+@dataclass(slots=True, eq=False)
+class AccountContext:
+    """
+    Per-account state: cookies, room info, stream status and a connection
+    pool of its own.
+
+    Workers take a context and read account data from it instead of the
+    module-level globals, so several rooms can be controlled from one
+    process. ``default_context`` wraps the globals used by the GUI.
+    """
+    cookies: dict[str, str] = field(default_factory=dict)
+    room_info: RoomInfo = field(default_factory=RoomInfo)
+    stream_status: StreamStatus = field(default_factory=StreamStatus)
+    session_pool: SessionPool = field(default_factory=SessionPool)
+    name: str = ""
+    # 只用于刷新 Cookie，不放进 cookies，以免随每个请求发送
+    refresh_token: Optional[str] = None
+
+    @property
+    def uid(self) -> str:
+        return self.cookies.get("DedeUserID", "")
+
+    @property
+    def csrf(self) -> str:
+        return self.cookies["bili_jct"]
+
+    def create_session(self, h_type: HeadersType) -> Session:
+        # 底层连接来自账号自己的连接池，Cookie 和请求头按 Worker 独立叠加
+        session = self.session_pool.acquire(
+            h_type, app_settings["proxy_mode"],
+            app_settings.get("custom_proxy_url", ""))
+        if h_type == HeadersType.WEB:
+            session.headers.update(constant.HEADERS_WEB)
+        elif h_type == HeadersType.APP:
+            session.headers.update(constant.HEADERS_APP)
+        session.cookies.set("appkey", constant.APP_KEY, domain="bilibili.com",
+                            path="/")
+        session.cookies.set("device_name",
+                            node().encode('utf-8').decode('latin-1'),
+                            domain="bilibili.com", path="/")
+        session.cookies.set("device_platform", "Windows Version: 10.0 x86_64",
+                            domain="bilibili.com", path="/")
+        session.cookies.set("buvid3", app_settings.app_buvid)
+        cookiejar_from_dict(self.cookies, cookiejar=session.cookies,
+                            overwrite=True)
+        session.headers.update({
+            "buvid": app_settings.app_buvid,
+        })
+        return session
+
+    def reset_room_info(self) -> None:
+        self.room_info.recent_areas.clear()
+        self.room_info.recent_title.clear()
+        self.room_info.reset()
+
+    def reset(self) -> None:
+        self.reset_room_info()
+        self.stream_status.reset()
+
+
+default_context = AccountContext(cookies_dict, room_info, stream_status,
+                                 session_pool, name="default")
+# 登录过的账号上下文，键为 cookie_indices 中的条目，切换账号时直接换入
+account_contexts: dict[str, AccountContext] = {}
+
+
+def activate_context(key: str) -> AccountContext:
+    """
+    Makes the context of account ``key`` the one used by the GUI.
+
+    A context cached in ``account_contexts`` is swapped in with its room info,
+    title history, area selection and stream key intact; an unknown or empty
+    key gets a fresh one sharing the default connection pool. The module-level
+    ``room_info``, ``stream_status`` and ``cookies_dict`` are rebound to the
+    chosen context, so callers must look them up through the module.
+
+    :param key: Cookie index entry of the account, e.g. ``cookies|<uid>``.
+    :return: The activated context.
+    """
+    global default_context, cookies_dict, room_info, stream_status
+    if (context := account_contexts.get(key)) is None:
+        context = AccountContext(session_pool=session_pool, name=key)
+    default_context = context
+    cookies_dict = context.cookies
+    room_info = context.room_info
+    stream_status = context.stream_status
+    return context
+
+
 def create_session(h_type: HeadersType) -> Session:
-    session = Session()
-    if h_type == HeadersType.WEB:
-        session.headers.update(constant.HEADERS_WEB)
-    elif h_type == HeadersType.APP:
-        session.headers.update(constant.HEADERS_APP)
-    session.cookies.set("appkey", constant.APP_KEY, domain="bilibili.com",
-                        path="/")
-    session.cookies.set("device_name", node().encode('utf-8').decode('latin-1'),
-                        domain="bilibili.com", path="/")
-    session.cookies.set("device_platform", "Windows Version: 10.0 x86_64",
-                        domain="bilibili.com", path="/")
-    session.cookies.set("buvid3", app_settings.app_buvid)
-    cookiejar_from_dict(cookies_dict, cookiejar=session.cookies, overwrite=True)
-    session.headers.update({
-        "buvid": app_settings.app_buvid,
-    })
-    custom_proxy = app_settings.get("custom_proxy_url", "")
-    custom_proxy = {
-        "http": custom_proxy,
-        "https": custom_proxy,
-    }
-    match app_settings["proxy_mode"]:
-        case ProxyMode.NONE:
-            session.get = partial(session.get, verify=True, timeout=5)
-            session.post = partial(session.post, verify=True, timeout=5)
-            session.trust_env = False
-        case ProxyMode.SYSTEM:
-            session.get = partial(session.get, verify=False, timeout=5)
-            session.post = partial(session.post, verify=False, timeout=5)
-            session.trust_env = True
-        case ProxyMode.CUSTOM:
-            session.get = partial(session.get, verify=False, timeout=5,
-                                  proxies=custom_proxy)
-            session.post = partial(session.post, verify=False, timeout=5,
-                                   proxies=custom_proxy)
-            session.trust_env = False
-    return session
+    return default_context.create_session(h_type)
 
 
 def app_settings_default() -> None:
@@ -1,68 +1,192 @@
 from copy import deepcopy
 from dataclasses import dataclass, field, fields, MISSING
+from functools import cache
 from threading import Lock
-from typing import Any, Mapping, Iterator, Tuple, ClassVar
+from types import MappingProxyType
+from typing import Any, Mapping, Iterator, Tuple, Callable, Iterable, \
+    TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..workers.dispatcher import Dispatcher
+
+_EMPTY = MappingProxyType({})
+
+
+@cache
+def _public_fields(cls: type) -> tuple[str, ...]:
+    # 每个类只计算一次，内部字段（比如 _lock）不对外暴露
+    return tuple(f.name for f in fields(cls) if not f.name.startswith("_"))
+
+
+class Subscription:
+    """
+    Callback registered with ``StateBase.subscribe``.
+
+    Changes are collected until the dispatcher runs the delivery, so any
+    number of writes in between cause a single call with the union of the
+    changed field names.
+    """
+    __slots__ = ("keys", "_callback", "_dispatcher", "_state", "_pending",
+                 "_scheduled", "_active", "_lock")
+
+    def __init__(self, state: "StateBase", keys: frozenset[str],
+                 callback: Callable[[frozenset[str]], None],
+                 dispatcher: "Dispatcher") -> None:
+        self.keys = keys
+        self._callback = callback
+        self._dispatcher = dispatcher
+        self._state = state
+        self._pending: set[str] = set()
+        self._scheduled = False
+        self._active = True
+        self._lock = Lock()
+
+    def cancel(self) -> None:
+        self._active = False
+        self._state.unsubscribe(self)
+
+    def _notify(self, changed: frozenset[str]) -> None:
+        if not self._active or not (hit := self.keys & changed):
+            return
+        with self._lock:
+            self._pending |= hit
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._dispatcher.post(self._deliver)
+
+    def _deliver(self) -> None:
+        with self._lock:
+            changed = frozenset(self._pending)
+            self._pending.clear()
+            self._scheduled = False
+        if self._active and changed:
+            self._callback(changed)
 
 
 @dataclass(slots=True)
 class StateBase:
+    """
+    State container with copy-on-write snapshots.
+
+    Readers go through an immutable ``MappingProxyType`` snapshot without
+    taking any lock. Writers (item assignment, ``update``, ``reset`` and plain
+    attribute assignment) build a new snapshot under ``_lock`` and publish it
+    with a single reference swap, bumping ``version``. Snapshots are shallow:
+    containers such as lists are shared and still mutated in place.
+
+    ``subscribe`` delivers field changes through a ``Dispatcher``; in-place
+    mutation of a container is not a change.
+    """
     _lock: Lock = field(default_factory=Lock, init=False, repr=False)
     _dirty: bool = field(default=False, init=False, repr=False)
-    _instance: ClassVar["StateBase | None"] = None
     _initialized: bool = field(default=False, init=False, repr=False)
-
-    def __new__(cls, *args, **kwargs):
-        if cls._instance is None:
-            cls._instance = object.__new__(cls)
-        return cls._instance
+    # MappingProxyType 不可哈希，3.11 的 dataclass 会把它当作可变默认值拒绝
+    _snapshot: Mapping[str, Any] = field(default_factory=lambda: _EMPTY,
+                                         init=False, repr=False)
+    _version: int = field(default=0, init=False, repr=False)
+    _subscriptions: tuple[Subscription, ...] = field(default=(), init=False,
+                                                     repr=False)
 
     def __post_init__(self):
-        if self._initialized:
-            return
+        self._snapshot = MappingProxyType(
+            {name: getattr(self, name) for name in _public_fields(type(self))})
         self._initialized = True
 
+    def __setattr__(self, key: str, value: Any) -> None:
+        # obj.field = value 同样发布新快照；初始化完成前直接赋值
+        if key.startswith("_") or not self._is_ready():
+            object.__setattr__(self, key, value)
+        else:
+            self._publish({key: value})
+
+    def _is_ready(self) -> bool:
+        try:
+            return self._initialized
+        except AttributeError:
+            return False
+
+    def _publish(self, changes: Mapping[str, Any]) -> None:
+        changed = []
+        with self._lock:
+            snapshot = dict(self._snapshot)
+            for k, v in changes.items():
+                object.__setattr__(self, k, v)
+                if (old := snapshot.get(k, v)) is not v and old != v:
+                    changed.append(k)
+                snapshot[k] = v
+            self._snapshot = MappingProxyType(snapshot)
+            self._version += 1
+            subscriptions = self._subscriptions
+        if changed and subscriptions:
+            changed = frozenset(changed)
+            for subscription in subscriptions:
+                subscription._notify(changed)
+
+    def subscribe(self, keys: str | Iterable[str],
+                  callback: Callable[[frozenset[str]], None], /, *,
+                  dispatcher: "Dispatcher") -> Subscription:
+        """
+        Calls ``callback`` through ``dispatcher`` when any of ``keys`` change.
+
+        Writes made before the dispatcher runs the callback are coalesced into
+        one call, which receives the changed subset of ``keys``.
+
+        :param keys: A field name or several field names.
+        :param callback: Receives the names of the changed fields.
+        :param dispatcher: Dispatcher the callback runs on, e.g. the GUI one.
+        :return: The subscription; ``cancel()`` stops further calls.
+        :raises KeyError: If a key is not a field of this state.
+        """
+        keys = frozenset((keys,) if isinstance(keys, str) else keys)
+        if unknown := keys.difference(_public_fields(type(self))):
+            raise KeyError(", ".join(sorted(unknown)))
+        subscription = Subscription(self, keys, callback, dispatcher)
+        with self._lock:
+            self._subscriptions += (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions = tuple(
+                s for s in self._subscriptions if s is not subscription)
+
+    @property
+    def version(self) -> int:
+        """Increases on every write; compare to detect changes cheaply."""
+        return self._version
+
+    def snapshot(self) -> Mapping[str, Any]:
+        """Returns the current read-only view; later writes do not affect it."""
+        return self._snapshot
+
     # obj["field"]
     def __getitem__(self, key: str) -> Any:
-        with self._lock:
-            if not hasattr(self, key):
-                raise KeyError(key)
-            return getattr(self, key)
+        return self._snapshot[key]
 
     # obj["field"] = value
     def __setitem__(self, key: str, value: Any) -> None:
         self._dirty = True
-        with self._lock:
-            if not hasattr(self, key):
-                raise KeyError(key)
-            setattr(self, key, value)
+        if key not in self._snapshot:
+            raise KeyError(key)
+        self._publish({key: value})
 
     # obj.get("field", default)
     def get(self, key: str, default: Any = None) -> Any:
-        with self._lock:
-            if not hasattr(self, key):
-                return default
-            return getattr(self, key)
+        return self._snapshot.get(key, default)
 
     # obj.update({...})
     def update(self, mapping: Mapping[str, Any] | None = None,
                **kwargs: Any) -> None:
         self._dirty = True
-        with self._lock:
-            if mapping:
-                for k, v in mapping.items():
-                    if hasattr(self, k):
-                        setattr(self, k, v)
-            for k, v in kwargs.items():
-                if hasattr(self, k):
-                    setattr(self, k, v)
+        snapshot = self._snapshot
+        changes = {k: v for k, v in (mapping or {}).items() if k in snapshot}
+        changes.update((k, v) for k, v in kwargs.items() if k in snapshot)
+        if changes:
+            self._publish(changes)
 
     def as_dict(self) -> dict[str, Any]:
-        with self._lock:
-            return {
-                f.name: getattr(self, f.name)
-                for f in fields(self)
-                if not f.name.startswith("_")
-            }
+        return dict(self._snapshot)
 
     @classmethod
     def default_dict(cls) -> dict[str, Any]:
@@ -85,34 +209,29 @@ class StateBase:
 
     def reset(self) -> None:
         self._dirty = False
-        defaults = type(self).default_dict()
-        with self._lock:
-            for name, value in defaults.items():
-                setattr(self, name, value)
+        self._publish(type(self).default_dict())
 
     @property
     def internal(self) -> dict[str, Any]:
         return self.as_dict()
 
     def items(self) -> Iterator[Tuple[str, Any]]:
-        return iter(self.as_dict().items())
+        return iter(self._snapshot.items())
 
     def values(self) -> Iterator[Any]:
-        return iter(self.as_dict().values())
+        return iter(self._snapshot.values())
 
     def keys(self) -> Iterator[str]:
-        return iter(self.as_dict().keys())
+        return iter(self._snapshot.keys())
 
     def __iter__(self) -> Iterator[str]:
         return self.keys()
 
     def __contains__(self, key: str) -> bool:
-        with self._lock:
-            return hasattr(self, key)
+        return key in self._snapshot
 
     def __len__(self) -> int:
-        with self._lock:
-            return len([f for f in fields(self) if not f.name.startswith("_")])
+        return len(self._snapshot)
 
     def __bool__(self) -> bool:
         return self._dirty
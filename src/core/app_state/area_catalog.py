@@ -0,0 +1,186 @@
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from hashlib import sha256
+from json import dumps, load, dump
+from sys import intern
+from typing import Any, Optional
+
+from ..cache import get_cache_path
+from ..constant import CacheType
+from ..log import get_logger
+
+# [[父分区 id, 父分区名, [[子分区 id, 子分区名], ...]], ...]
+RawAreas = list[list[Any]]
+
+
+@dataclass(slots=True)
+class AreaDiff:
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    added_parents: list[str] = field(default_factory=list)
+    removed_parents: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.added_parents
+                    or self.removed_parents)
+
+
+@dataclass(frozen=True, slots=True)
+class _AreaTable:
+    # 子分区按父分区连续存放，第 i 个父分区的子分区是
+    # rows[offsets[i]:offsets[i + 1]]
+    parents: tuple[str, ...] = ()
+    offsets: tuple[int, ...] = (0,)
+    names: tuple[str, ...] = ()
+    ids: array = field(default_factory=lambda: array("I"))
+    by_name: dict[str, int] = field(default_factory=dict)
+    by_parent: dict[str, int] = field(default_factory=dict)
+    by_id: dict[int, int] = field(default_factory=dict)
+    digest: str = ""
+
+    @classmethod
+    def build(cls, raw: RawAreas, digest: str) -> "_AreaTable":
+        parents, offsets, names, ids = [], [0], [], array("I")
+        for _, parent, children in raw:
+            parents.append(intern(parent))
+            for area_id, name in children:
+                names.append(intern(name))
+                ids.append(area_id)
+            offsets.append(len(names))
+        return cls(
+            parents=tuple(parents), offsets=tuple(offsets),
+            names=tuple(names), ids=ids,
+            by_name={name: row for row, name in enumerate(names)},
+            by_parent={name: i for i, name in enumerate(parents)},
+            by_id={area_id: row for row, area_id in enumerate(ids)},
+            digest=digest)
+
+
+def _digest(raw: RawAreas) -> str:
+    return sha256(dumps(raw, ensure_ascii=False,
+                        separators=(",", ":")).encode()).hexdigest()
+
+
+class AreaCatalog:
+    """
+    Live areas of ``GetAreaListForLive`` in one compact, immutable table.
+
+    Names are interned and every lookup (child name to id or parent, id to
+    name, parent to children) is an index into the same table, which is
+    swapped as a whole on update so readers never see a half-filled catalog.
+    The raw list is persisted in the config directory together with its
+    SHA-256 digest; the cached catalog is used at login and the fresh list is
+    applied as a diff once it arrives.
+    """
+    FILE_NAME = "areas.json"
+    PLACEHOLDER = "请选择"
+
+    def __init__(self) -> None:
+        self._table = _AreaTable()
+        self.logger = get_logger(self.__class__.__name__)
+
+    def __bool__(self) -> bool:
+        return bool(self._table.parents)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._table.by_name
+
+    @property
+    def digest(self) -> str:
+        return self._table.digest
+
+    def parents(self) -> list[str]:
+        return list(self._table.parents)
+
+    def choices(self) -> list[str]:
+        """Parent names for selection widgets, led by ``PLACEHOLDER``."""
+        return [self.PLACEHOLDER, *self._table.parents]
+
+    def children(self, parent: str) -> list[str]:
+        table = self._table
+        if (i := table.by_parent.get(parent)) is None:
+            return []
+        return list(table.names[table.offsets[i]:table.offsets[i + 1]])
+
+    def has_child(self, parent: str, name: str) -> bool:
+        table = self._table
+        if (i := table.by_parent.get(parent)) is None or \
+                (row := table.by_name.get(name)) is None:
+            return False
+        return table.offsets[i] <= row < table.offsets[i + 1]
+
+    def code(self, name: str) -> Optional[int]:
+        table = self._table
+        if (row := table.by_name.get(name)) is None:
+            return None
+        return table.ids[row]
+
+    def name_of(self, area_id: int) -> Optional[str]:
+        table = self._table
+        if (row := table.by_id.get(area_id)) is None:
+            return None
+        return table.names[row]
+
+    def parent_of(self, name: str) -> Optional[str]:
+        table = self._table
+        if (row := table.by_name.get(name)) is None:
+            return None
+        return table.parents[bisect_right(table.offsets, row) - 1]
+
+    def load_cached(self) -> bool:
+        """
+        Fills an empty catalog from the cache file.
+
+        :return: Whether the catalog has areas afterwards.
+        """
+        if self:
+            return True
+        _, path = get_cache_path(CacheType.CONFIG, self.FILE_NAME,
+                                 is_makedir=False)
+        if not path.exists():
+            return False
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                cached = load(f)
+            raw, digest = cached["areas"], cached["digest"]
+            if _digest(raw) != digest:
+                raise ValueError("digest mismatch")
+            self._table = _AreaTable.build(raw, digest)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f"ignoring area cache {path}: {e!r}")
+            return False
+        self.logger.info(f"{len(self._table.names)} areas loaded from cache")
+        return True
+
+    def update(self, area_v1_info: list[dict]) -> Optional[AreaDiff]:
+        """
+        Replaces the catalog with a fresh ``area_v1_info`` list and persists
+        it when its digest differs from the current one.
+
+        :param area_v1_info: ``data.area_v1_info`` of ``GetAreaListForLive``.
+        :return: The change against the previous catalog, or None when the
+            list is unchanged. The diff may be empty when areas were only
+            reordered.
+        """
+        raw = [[int(info["id"]), info["name"],
+                [[int(sub["id"]), sub["name"]] for sub in info["list"]]]
+               for info in area_v1_info]
+        if (digest := _digest(raw)) == self._table.digest:
+            return None
+        old, self._table = self._table, _AreaTable.build(raw, digest)
+        diff = AreaDiff(
+            added=[n for n in self._table.names if n not in old.by_name],
+            removed=[n for n in old.names if n not in self._table.by_name],
+            added_parents=[p for p in self._table.parents
+                           if p not in old.by_parent],
+            removed_parents=[p for p in old.parents
+                             if p not in self._table.by_parent])
+        _, path = get_cache_path(CacheType.CONFIG, self.FILE_NAME)
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                dump({"digest": digest, "areas": raw}, f, ensure_ascii=False,
+                     separators=(",", ":"))
+        except OSError as e:
+            self.logger.warning(f"failed to cache areas: {e!r}")
+        return diff
@@ -5,13 +5,14 @@ from ._version import __version__
 __all__ = [
     "KEYRING_SERVICE_NAME", "KEYRING_COOKIES", "KEYRING_COOKIES_INDEX",
     "KEYRING_SETTINGS", "KEYRING_ROOM_INFO", "KEYRING_APP_SETTINGS",
+    "KEYRING_VAULT_KEY", "KEYRING_REFRESH_TOKEN",
     "LOCAL_SERVER_NAME", "LOGGER_NAME", "USERNAME_DISPLAY_TEMPLATE",
     "MAX_RECENT_TITLE", "VERSION", "DARK_COVER_CSS", "DARK_CSS",
     "LIGHT_COVER_CSS",
     "LIGHT_CSS",
     "ProxyMode", "PreferProto", "CoverStatus",
     "WidgetIndex", "CacheType", "BackgroundMode", "HeadersType", "LoginResult",
-    "FaceAuthType"
+    "FaceAuthType", "WorkerPriority"
 ]
 
 
@@ -42,6 +43,7 @@ class WidgetIndex(IntEnum):
     WIDGET_PANEL = 1
     WIDGET_LOGGING = 2
     WIDGET_SETTINGS = 3
+    WIDGET_PERFORMANCE = 4
 
 
 @unique
@@ -78,12 +80,22 @@ class FaceAuthType(IntEnum):
     V2 = 60043
 
 
+@unique
+class WorkerPriority(IntEnum):
+    CRITICAL = 0  # 开播、下播等用户直接等待的操作
+    INTERACTIVE = 1
+    BACKGROUND = 2  # 刷新、版本检查等可延后的任务
+
+
 KEYRING_SERVICE_NAME = "StartLive|userCredentials"
 KEYRING_COOKIES = "cookies"
 KEYRING_COOKIES_INDEX = "cookiesIndex"
 KEYRING_SETTINGS = "settings"
 KEYRING_APP_SETTINGS = "appSettings"
 KEYRING_ROOM_INFO = "roomInfo"
+KEYRING_VAULT_KEY = "vaultKey"
+# 与 Cookie 分开保存，键为 refreshToken|<uid>
+KEYRING_REFRESH_TOKEN = "refreshToken"
 LOCAL_SERVER_NAME = "StartLive|singleInstanceServer"
 LOGGER_NAME = "StartLiveLogger"
 USERNAME_DISPLAY_TEMPLATE = "{}（{}）"
@@ -0,0 +1,11 @@
+class CredentialVaultError(Exception):
+    path: str
+    reason: Exception
+
+    def __init__(self, path: str, reason: Exception):
+        super().__init__(f"failed to open credential vault {path}: {reason!r}")
+        self.path = path
+        self.reason = reason
+
+    def __repr__(self):
+        return f"凭据保险库无法打开: {self.path} ({self.reason!r})"
@@ -0,0 +1,8 @@
+class SubmissionDropped(RuntimeError):
+    worker_type: str
+    reason: str
+
+    def __init__(self, worker_type: str, reason: str):
+        super().__init__(f"{worker_type} submission dropped: {reason}")
+        self.worker_type = worker_type
+        self.reason = reason
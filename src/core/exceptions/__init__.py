@@ -3,9 +3,11 @@ from .AreaUpdateError import AreaUpdateError
 from .CoverUploadError import CoverUploadError
 from .CredentialDuplicatedError import CredentialDuplicatedError
 from .CredentialExpiredError import CredentialExpiredError
+from .CredentialVaultError import CredentialVaultError
 from .LoginError import LoginError
 from .RoomStatusError import RoomStatusError
 from .StartLiveError import StartLiveError
 from .StopLiveError import StopLiveError
+from .SubmissionDropped import SubmissionDropped
 from .TaskCancelled import TaskCancelled
 from .TitleUpdateError import TitleUpdateError
@@ -0,0 +1,3 @@
+from .credential_store import CredentialStore, credential_store, \
+    refresh_token_key
+from .credential_vault import CredentialVault
@@ -0,0 +1,290 @@
+from json import loads
+from threading import Lock, Timer
+from time import perf_counter
+from typing import Optional
+
+# package import
+from keyring import get_password, set_password, delete_password
+from keyring.errors import PasswordDeleteError
+
+# local package import
+from .credential_vault import CredentialVault
+from ..constant import *
+from ..exceptions import CredentialVaultError
+from ..log import get_logger
+from ..metrics import LatencyRing, LatencyStats
+
+# 缓存中尚未读取过的键
+_UNKNOWN = object()
+# 等待写出的删除操作
+_DELETE = object()
+
+
+def refresh_token_key(cookie_key: str) -> str:
+    """Key of the refresh token saved next to ``cookies|<uid>``."""
+    return f"{KEYRING_REFRESH_TOKEN}|{cookie_key.partition('|')[2]}"
+
+
+class CredentialStore:
+    """
+    Cached, batched access to the credentials of one service.
+
+    Every key is read from the keyring at most once per process; later reads,
+    including reads of missing keys, are served from memory. ``set`` and
+    ``delete`` update the cache at once and queue the change; a background
+    timer writes the queue out ``delay`` seconds after the first change, so
+    repeated writes of a key reach the keyring once. ``flush`` writes the
+    queue synchronously and is called before the application exits.
+
+    When a ``CredentialVault`` file exists, every entry is loaded from it on
+    first use instead and each flush rewrites the file once, see
+    ``enable_vault``. A vault that exists but cannot be opened never falls
+    back to the keyring, whose entries were moved into it: reads find
+    nothing, changes are not written anywhere and ``open_error`` holds the
+    reason until the vault is discarded.
+
+    Keyring and vault round-trips are timed per operation, see ``stats``.
+    """
+    OPERATIONS = ("get", "set", "delete", "vault read", "vault write")
+
+    def __init__(self, service: str, /, *, delay: float = 1.0,
+                 vault: CredentialVault | None = None) -> None:
+        self._service = service
+        self._delay = delay
+        self._vault = vault or CredentialVault(service)
+        self._cache: dict[str, Optional[str]] = {}
+        self._pending: dict[str, object] = {}
+        # 使用保险库时为其中的全部条目，否则为 None
+        self._entries: Optional[dict[str, str]] = None
+        self._opened = False
+        self._open_error: Optional[CredentialVaultError] = None
+        self._timer: Optional[Timer] = None
+        self._lock = Lock()
+        # 保证后台写出、flush 和迁移不会交错执行
+        self._flush_lock = Lock()
+        self._latency = {op: LatencyRing() for op in self.OPERATIONS}
+        self._failed = dict.fromkeys(self.OPERATIONS, 0)
+        self._hits = 0
+        self.logger = get_logger(self.__class__.__name__)
+
+    @property
+    def vault_enabled(self) -> bool:
+        self._open()
+        return self._entries is not None
+
+    @property
+    def open_error(self) -> Optional[CredentialVaultError]:
+        """Why the existing vault could not be opened, None when it could."""
+        self._open()
+        return self._open_error
+
+    def _open(self) -> None:
+        if self._opened:
+            return
+        with self._lock:
+            if self._opened:
+                return
+            self._opened = True
+            if not self._vault.exists():
+                return
+            try:
+                entries = self._timed("vault read", self._vault.load)
+            except Exception as e:
+                # 迁移时已删除钥匙串中的条目，回退到钥匙串只会像是退出了登录，
+                # 并把之后的写入分散到两处
+                self.logger.exception(
+                    f"failed to open {self._vault.path}, credentials locked")
+                self._open_error = CredentialVaultError(str(self._vault.path),
+                                                        e)
+                self._entries = {}
+                return
+            self._entries = entries
+            self._cache.update(entries)
+            self.logger.info(f"{len(entries)} entries loaded from vault")
+
+    def get(self, key: str) -> Optional[str]:
+        self._open()
+        if (value := self._cache.get(key, _UNKNOWN)) is not _UNKNOWN:
+            self._hits += 1
+            return value
+        if self._entries is not None:
+            # 保险库已全部载入，未缓存的键即不存在
+            self._hits += 1
+            return None
+        value = self._timed("get", get_password, self._service, key)
+        with self._lock:
+            # 读取期间有新的写入时以写入为准
+            return self._cache.setdefault(key, value)
+
+    def set(self, key: str, value: str) -> None:
+        self._queue(key, value)
+
+    def delete(self, key: str) -> None:
+        """Removes ``key``; deleting a missing key is not an error."""
+        self._queue(key, _DELETE)
+
+    def _queue(self, key: str, value: object) -> None:
+        self._open()
+        with self._lock:
+            self._cache[key] = None if value is _DELETE else value
+            self._pending[key] = value
+            if self._timer is None:
+                self._timer = Timer(self._delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Writes all queued changes before returning."""
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            if self._open_error is not None:
+                self.logger.warning(f"vault locked, {len(pending)} changes "
+                                    f"not written")
+                return
+            if self._entries is not None:
+                self._flush_vault(pending)
+                return
+            for key, value in pending.items():
+                try:
+                    if value is _DELETE:
+                        self._timed("delete", self._delete, key)
+                    else:
+                        self._timed("set", set_password, self._service, key,
+                                    value)
+                except Exception:
+                    self.logger.exception(f"failed to write {key}")
+            self.logger.info(f"{len(pending)} keyring changes written")
+
+    def _flush_vault(self, pending: dict[str, object]) -> None:
+        for key, value in pending.items():
+            if value is _DELETE:
+                self._entries.pop(key, None)
+            else:
+                self._entries[key] = value
+        try:
+            self._timed("vault write", self._vault.save, self._entries)
+        except Exception:
+            self.logger.exception(f"failed to write {self._vault.path}")
+            return
+        self.logger.info(f"{len(pending)} vault changes written")
+
+    def _stored_keys(self) -> list[str]:
+        keys = [KEYRING_COOKIES_INDEX, KEYRING_SETTINGS, KEYRING_APP_SETTINGS,
+                KEYRING_COOKIES, KEYRING_ROOM_INFO]
+        if (index := self.get(KEYRING_COOKIES_INDEX)) is not None:
+            try:
+                index = loads(index)
+            except ValueError:
+                index = []
+            if isinstance(index, list):
+                for key in index:
+                    if isinstance(key, str):
+                        keys.extend((key, refresh_token_key(key)))
+        return keys
+
+    def enable_vault(self) -> int:
+        """
+        Moves every stored credential from the keyring into the vault, leaving
+        only its master key in the keyring.
+
+        The vault is written before any keyring entry is deleted, so a failed
+        migration loses nothing.
+
+        :raises Exception: Whatever the keyring or the file system raised
+            while writing the vault; the keyring is left untouched.
+        :return: The number of entries moved.
+        """
+        # 未打开时已有的保险库会被当作不存在而覆盖
+        self._open()
+        self.flush()
+        with self._flush_lock:
+            if self._entries is not None:
+                return 0
+            entries = {key: value for key in self._stored_keys()
+                       if (value := self.get(key)) is not None}
+            self._timed("vault write", self._vault.save, entries)
+            self._entries = entries
+            for key in entries:
+                try:
+                    self._timed("delete", self._delete, key)
+                except Exception:
+                    self.logger.exception(f"failed to delete {key}")
+        self.logger.info(f"{len(entries)} entries moved into vault")
+        return len(entries)
+
+    def disable_vault(self) -> int:
+        """
+        Moves every entry of the vault back into the keyring and removes the
+        vault and its master key.
+
+        :raises CredentialVaultError: If the vault could not be opened.
+        :raises Exception: Whatever the keyring raised; the vault is kept and
+            stays in use.
+        :return: The number of entries moved.
+        """
+        self._open()
+        self.flush()
+        with self._flush_lock:
+            if self._open_error is not None:
+                raise self._open_error
+            if (entries := self._entries) is None:
+                return 0
+            for key, value in entries.items():
+                self._timed("set", set_password, self._service, key, value)
+            self._entries = None
+            self._vault.destroy()
+        self.logger.info(f"{len(entries)} entries moved into keyring")
+        return len(entries)
+
+    def discard_vault(self) -> None:
+        """
+        Removes the vault and its master key without moving entries. An
+        unreadable vault is unlocked this way; later changes go to the
+        keyring.
+        """
+        self.flush()
+        with self._flush_lock:
+            self._entries = None
+            self._open_error = None
+            self._vault.destroy()
+
+    def _delete(self, key: str) -> None:
+        try:
+            delete_password(self._service, key)
+        except PasswordDeleteError:
+            pass
+
+    def _timed(self, op: str, fn, /, *args):
+        start = perf_counter()
+        try:
+            return fn(*args)
+        except Exception:
+            self._failed[op] += 1
+            raise
+        finally:
+            self._latency[op].add(perf_counter() - start)
+
+    def stats(self) -> list[LatencyStats]:
+        """
+        Latency per operation, plus the number of reads served from memory as
+        ``get (cached)``.
+        """
+        stats = [LatencyStats(op, ring.total, *ring.percentiles(50, 95, 99),
+                              failed=self._failed[op])
+                 for op, ring in self._latency.items()]
+        stats.append(LatencyStats("get (cached)", self._hits, None, None, None))
+        return stats
+
+    def reset_stats(self) -> None:
+        self._latency = {op: LatencyRing() for op in self.OPERATIONS}
+        self._failed = dict.fromkeys(self.OPERATIONS, 0)
+        self._hits = 0
+
+
+credential_store = CredentialStore(KEYRING_SERVICE_NAME)
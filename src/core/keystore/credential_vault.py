@@ -0,0 +1,90 @@
+from base64 import b64decode, b64encode
+from json import dumps, loads
+from os import remove, replace, urandom
+from pathlib import Path
+
+# package import
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from keyring import get_password, set_password, delete_password
+from keyring.errors import PasswordDeleteError
+
+# local package import
+from ..cache import get_cache_path
+from ..constant import CacheType, KEYRING_VAULT_KEY
+
+
+class CredentialVault:
+    """
+    All credentials of one service in a single AES-GCM encrypted file.
+
+    Only the 256-bit master key is kept in the keyring, so loading every
+    account and setting costs one keyring call and one file read. The file is
+    ``MAGIC``, a 12-byte nonce and the ciphertext of a JSON object; it is
+    rewritten atomically with a fresh nonce on every save.
+    """
+    MAGIC = b"SLV1"
+    FILE_NAME = "credentials.vault"
+
+    def __init__(self, service: str, /, path: Path | None = None) -> None:
+        self._service = service
+        self._path = path or get_cache_path(CacheType.CONFIG, self.FILE_NAME,
+                                            is_makedir=False)[1]
+        self._key: bytes | None = None
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def exists(self) -> bool:
+        return self._path.is_file()
+
+    def _master_key(self, *, create: bool = False) -> bytes:
+        if self._key is None:
+            if (encoded := get_password(self._service,
+                                        KEYRING_VAULT_KEY)) is not None:
+                self._key = b64decode(encoded)
+            elif create:
+                self._key = AESGCM.generate_key(bit_length=256)
+                set_password(self._service, KEYRING_VAULT_KEY,
+                             b64encode(self._key).decode())
+            else:
+                raise KeyError(f"{KEYRING_VAULT_KEY} not found in keyring")
+        return self._key
+
+    def load(self) -> dict[str, str]:
+        """
+        Decrypts the vault.
+
+        :raises KeyError: If the master key is missing from the keyring.
+        :raises ValueError: If the file is not a vault.
+        :raises cryptography.exceptions.InvalidTag: If the file was modified
+            or encrypted with another key.
+        """
+        data = self._path.read_bytes()
+        magic = len(self.MAGIC)
+        if data[:magic] != self.MAGIC:
+            raise ValueError(f"{self._path} is not a credential vault")
+        nonce, ciphertext = data[magic:magic + 12], data[magic + 12:]
+        plaintext = AESGCM(self._master_key()).decrypt(nonce, ciphertext,
+                                                       self.MAGIC)
+        return loads(plaintext)
+
+    def save(self, entries: dict[str, str]) -> None:
+        nonce = urandom(12)
+        ciphertext = AESGCM(self._master_key(create=True)).encrypt(
+            nonce, dumps(entries, separators=(",", ":")).encode(), self.MAGIC)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        # 先写临时文件再替换，写入中断时旧文件仍然完整
+        temp = self._path.with_suffix(".tmp")
+        temp.write_bytes(self.MAGIC + nonce + ciphertext)
+        replace(temp, self._path)
+
+    def destroy(self) -> None:
+        """Removes the vault file and its master key."""
+        if self.exists():
+            remove(self._path)
+        try:
+            delete_password(self._service, KEYRING_VAULT_KEY)
+        except PasswordDeleteError:
+            pass
+        self._key = None
@@ -0,0 +1,5 @@
+from .latency_ring import LatencyRing
+from .worker_metrics import (WorkerRecord, WorkerMetrics, LatencyStats,
+                             Outcome, current_record, recording,
+                             worker_metrics)
+from .tracing import Tracer, TraceLink, Span, tracer
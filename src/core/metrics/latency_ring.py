@@ -0,0 +1,52 @@
+from itertools import count
+from math import ceil
+from typing import Optional
+
+
+class LatencyRing:
+    """
+    Fixed-size ring buffer of the most recent samples.
+
+    Writers never take a lock: ``next`` on an ``itertools.count`` and a single
+    list item assignment are both atomic under the GIL, so concurrent worker
+    threads can record samples while the GUI thread reads percentiles from a
+    snapshot. A reader may see a sample being overwritten, never a torn one.
+    """
+    __slots__ = ("_buf", "_size", "_cursor")
+
+    def __init__(self, size: int = 256) -> None:
+        self._size = size
+        # 每个槽位保存 (序号, 样本)，总数由序号推出
+        self._buf: list[Optional[tuple[int, float]]] = [None] * size
+        self._cursor = count()
+
+    def add(self, value: float) -> None:
+        index = next(self._cursor)
+        self._buf[index % self._size] = (index, value)
+
+    @property
+    def total(self) -> int:
+        """Number of samples ever added, including overwritten ones."""
+        # 槽位只会被更大的序号覆盖，因此结果不会回退
+        return max((slot[0] + 1 for slot in self._buf[:] if slot is not None),
+                   default=0)
+
+    def snapshot(self) -> list[float]:
+        return sorted(slot[1] for slot in self._buf[:] if slot is not None)
+
+    def percentiles(self, *ps: float) -> tuple[Optional[float], ...]:
+        """
+        Nearest-rank percentiles over the buffered samples.
+
+        :param ps: Percentiles in the range (0, 100].
+        :return: One value per requested percentile, None when empty.
+        """
+        samples = self.snapshot()
+        if not samples:
+            return (None,) * len(ps)
+        n = len(samples)
+        return tuple(samples[min(n, max(1, ceil(p / 100 * n))) - 1]
+                     for p in ps)
+
+    def __len__(self) -> int:
+        return sum(slot is not None for slot in self._buf[:])
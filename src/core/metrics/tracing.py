@@ -0,0 +1,157 @@
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import count
+from json import dump
+from os import getpid
+from pathlib import Path
+from threading import local, get_ident, current_thread, Lock
+from time import perf_counter_ns
+from typing import Iterator, Optional, Any
+
+_local = local()
+
+
+@dataclass(slots=True)
+class TraceLink:
+    """
+    Causal link captured where work is handed to another thread.
+
+    The first span started from the link draws a flow arrow from the capture
+    point; later spans (e.g. further polling rounds) only record the parent.
+    """
+    parent: int
+    flow: int
+    used: bool = False
+
+
+@dataclass(slots=True, eq=False)
+class Span:
+    id: int
+    parent: int
+    name: str
+    cat: str
+    start: int
+    args: dict[str, Any]
+
+
+class Tracer:
+    """
+    Records worker, HTTP and GUI-dispatch spans as Chrome trace events.
+
+    Spans are "complete" (``X``) events carrying their own and their parent's
+    id in ``args``; hand-offs between threads add flow (``s``/``f``) events, so
+    chrome://tracing and Perfetto draw the whole chain as one tree. While
+    tracing is off every entry point returns immediately.
+    """
+    _events: list[dict]
+
+    def __init__(self, max_events: int = 200_000) -> None:
+        self._max_events = max_events
+        self._enabled = False
+        self._events = []
+        self._threads: dict[int, str] = {}
+        self._ids = count(1)
+        self._pid = getpid()
+        self._lock = Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def start(self) -> None:
+        with self._lock:
+            self._events = []
+            self._threads = {}
+            self._enabled = True
+
+    def stop(self, path: Path) -> Optional[Path]:
+        """
+        Stops tracing and writes the collected events to ``path``.
+
+        :return: The written path, or None if tracing was not running.
+        """
+        with self._lock:
+            if not self._enabled:
+                return None
+            self._enabled = False
+            events, self._events = self._events, []
+            threads, self._threads = self._threads, {}
+        events.extend(
+            {"ph": "M", "name": "thread_name", "pid": self._pid, "tid": tid,
+             "args": {"name": name}}
+            for tid, name in threads.items())
+        with open(path, "w", encoding="utf-8") as f:
+            dump({"traceEvents": events, "displayTimeUnit": "ms"}, f,
+                 ensure_ascii=False)
+        return path
+
+    def current(self) -> Optional[Span]:
+        stack = getattr(_local, "stack", None)
+        return stack[-1] if stack else None
+
+    def link(self) -> Optional[TraceLink]:
+        """Captures the current span as the parent of work run elsewhere."""
+        if not self._enabled:
+            return None
+        parent = self.current()
+        link = TraceLink(parent.id if parent is not None else 0,
+                         next(self._ids))
+        self._emit({"ph": "s", "name": "handoff", "cat": "flow",
+                    "id": link.flow, "ts": self._now()})
+        return link
+
+    @contextmanager
+    def span(self, name: str, cat: str, *, link: Optional[TraceLink] = None,
+             parent: Optional[int] = None, **args) -> Iterator[Optional[Span]]:
+        """
+        Records the enclosed block as a span.
+
+        :param name: Span name shown in the viewer.
+        :param cat: Category, e.g. ``worker``, ``http`` or ``gui``.
+        :param link: Link captured on the submitting thread, if any.
+        :param parent: Explicit parent span id, used when there is no link.
+        :param args: Extra arguments shown with the span; can be updated
+            through the yielded span's ``args``.
+        """
+        if not self._enabled:
+            yield None
+            return
+        if link is not None:
+            parent_id = link.parent
+        elif parent is not None:
+            parent_id = parent
+        else:
+            parent_id = current.id if (current := self.current()) else 0
+        span = Span(next(self._ids), parent_id, name, cat, self._now(), args)
+        if link is not None and not link.used:
+            link.used = True
+            self._emit({"ph": "f", "bp": "e", "name": "handoff",
+                        "cat": "flow", "id": link.flow, "ts": span.start})
+        if (stack := getattr(_local, "stack", None)) is None:
+            stack = _local.stack = []
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            stack.pop()
+            end = self._now()
+            self._emit({"ph": "X", "name": name, "cat": cat,
+                        "ts": span.start, "dur": max(end - span.start, 1),
+                        "args": {"id": span.id, "parent": parent_id,
+                                 **{k: str(v) for k, v in span.args.items()}}})
+
+    @staticmethod
+    def _now() -> int:
+        return perf_counter_ns() // 1000
+
+    def _emit(self, event: dict) -> None:
+        tid = get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = current_thread().name
+        event["pid"] = self._pid
+        event["tid"] = tid
+        if len(self._events) < self._max_events:
+            self._events.append(event)
+
+
+tracer = Tracer()
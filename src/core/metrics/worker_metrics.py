@@ -0,0 +1,189 @@
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import StrEnum, unique
+from threading import Lock, local
+from time import perf_counter
+from typing import Iterator, Optional
+
+from .latency_ring import LatencyRing
+from .tracing import TraceLink
+
+_local = local()
+
+
+@unique
+class Outcome(StrEnum):
+    PENDING = "pending"
+    OK = "ok"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass(slots=True, eq=False)
+class WorkerRecord:
+    """One submission of a worker, filled in while it runs."""
+    worker_type: str
+    priority: str
+    submitted: float = field(default_factory=perf_counter)
+    started: float = 0.0
+    finished: float = 0.0
+    # 轮询任务为各轮耗时之和
+    run_time: float = 0.0
+    http_time: float = 0.0
+    http_calls: int = 0
+    endpoints: list[str] = field(default_factory=list)
+    outcome: Outcome = Outcome.PENDING
+    detail: str = ""
+    # 追踪开启时由提交方捕获
+    trace_link: Optional[TraceLink] = None
+    span_id: int = 0
+
+    @property
+    def queue_wait(self) -> float:
+        return max(0.0, self.started - self.submitted) if self.started else 0.0
+
+    def add_http(self, endpoint: str, elapsed: float) -> None:
+        self.http_time += elapsed
+        self.http_calls += 1
+        if endpoint not in self.endpoints:
+            self.endpoints.append(endpoint)
+
+
+@dataclass(slots=True)
+class LatencyStats:
+    name: str
+    count: int
+    p50: Optional[float]
+    p95: Optional[float]
+    p99: Optional[float]
+    failed: int = 0
+    cancelled: int = 0
+    queue_p95: Optional[float] = None
+    http_p95: Optional[float] = None
+    # 与进行中的相同请求合并、未单独发出的次数
+    shared: int = 0
+
+
+class _WorkerSeries:
+    __slots__ = ("run", "queue_wait", "http", "failed", "cancelled")
+
+    def __init__(self, size: int) -> None:
+        self.run = LatencyRing(size)
+        self.queue_wait = LatencyRing(size)
+        self.http = LatencyRing(size)
+        self.failed = 0
+        self.cancelled = 0
+
+
+def current_record() -> Optional[WorkerRecord]:
+    return getattr(_local, "record", None)
+
+
+@contextmanager
+def recording(record: Optional[WorkerRecord]) -> Iterator[None]:
+    """
+    Attributes HTTP calls made by this thread to ``record`` and adds the
+    elapsed time to its run time. A None record is a no-op.
+    """
+    if record is None:
+        yield
+        return
+    previous = current_record()
+    _local.record = record
+    start = perf_counter()
+    if not record.started:
+        record.started = start
+    try:
+        yield
+    finally:
+        record.run_time += perf_counter() - start
+        _local.record = previous
+
+
+class WorkerMetrics:
+    """
+    Rolling latency statistics per worker class and per HTTP endpoint.
+
+    Samples live in fixed-size ``LatencyRing`` buffers, so recording from the
+    worker threads never blocks and memory stays bounded.
+    """
+    _workers: dict[str, _WorkerSeries]
+    _endpoints: dict[str, LatencyRing]
+
+    def __init__(self, size: int = 256, history: int = 100) -> None:
+        self._size = size
+        self._workers = {}
+        self._endpoints = {}
+        self._shared: dict[str, int] = {}
+        # 合并计数是读-改-写，多个等待同一请求的线程会同时递增
+        self._shared_lock = Lock()
+        self._recent: deque[WorkerRecord] = deque(maxlen=history)
+
+    def add_http(self, endpoint: str, elapsed: float) -> None:
+        if (ring := self._endpoints.get(endpoint)) is None:
+            ring = self._endpoints.setdefault(endpoint,
+                                              LatencyRing(self._size))
+        ring.add(elapsed)
+        if (record := current_record()) is not None:
+            record.add_http(endpoint, elapsed)
+
+    def add_shared(self, endpoint: str) -> None:
+        with self._shared_lock:
+            self._shared[endpoint] = self._shared.get(endpoint, 0) + 1
+
+    def finish(self, record: WorkerRecord) -> None:
+        record.finished = perf_counter()
+        if (series := self._workers.get(record.worker_type)) is None:
+            series = self._workers.setdefault(record.worker_type,
+                                              _WorkerSeries(self._size))
+        match record.outcome:
+            case Outcome.OK:
+                series.run.add(record.run_time)
+                series.queue_wait.add(record.queue_wait)
+                series.http.add(record.http_time)
+            case Outcome.FAILED:
+                series.failed += 1
+            case Outcome.CANCELLED:
+                series.cancelled += 1
+        self._recent.append(record)
+
+    def worker_stats(self) -> list[LatencyStats]:
+        stats = []
+        for name, series in list(self._workers.items()):
+            p50, p95, p99 = series.run.percentiles(50, 95, 99)
+            stats.append(LatencyStats(
+                name, series.run.total + series.failed + series.cancelled,
+                p50, p95, p99,
+                failed=series.failed, cancelled=series.cancelled,
+                queue_p95=series.queue_wait.percentiles(95)[0],
+                http_p95=series.http.percentiles(95)[0]))
+        return stats
+
+    def endpoint_stats(self) -> list[LatencyStats]:
+        stats = []
+        for name, ring in list(self._endpoints.items()):
+            p50, p95, p99 = ring.percentiles(50, 95, 99)
+            stats.append(LatencyStats(name, ring.total, p50, p95, p99,
+                                      shared=self._shared.get(name, 0)))
+        return stats
+
+    def endpoint_percentile(self, endpoint: str,
+                            p: float) -> Optional[float]:
+        """Percentile of one endpoint's latency, None before any sample."""
+        if (ring := self._endpoints.get(endpoint)) is None:
+            return None
+        return ring.percentiles(p)[0]
+
+    def recent(self) -> list[WorkerRecord]:
+        return list(self._recent)
+
+    def reset(self) -> None:
+        self._workers = {}
+        self._endpoints = {}
+        with self._shared_lock:
+            self._shared = {}
+        self._recent.clear()
+
+
+worker_metrics = WorkerMetrics()
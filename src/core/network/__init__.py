@@ -0,0 +1,11 @@
+from .adaptive_timeout import AdaptiveTimeouts, LatencyHistogram, \
+    adaptive_timeouts
+from .cancel_scope import RequestScope, current_scope, request_scope
+from .happy_eyeballs import DnsCache, create_connection, dns_cache
+from .hedging import HedgePolicy, HedgeProgress, hedged_request
+from .pool import PooledAdapter, PooledSession, RacingHTTPConnection, \
+    RacingHTTPSConnection, SessionPool, session_pool
+from .rate_limit import TokenBucket
+from .response_cache import CachePolicy, CacheStats, ResponseCache, \
+    response_cache
+from .single_flight import SingleFlight
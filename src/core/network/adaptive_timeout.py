@@ -0,0 +1,184 @@
+from json import dump, load
+from math import log
+from threading import Lock
+from typing import Any, Optional
+
+from ..cache import get_cache_path
+from ..constant import CacheType
+from ..log import get_logger
+
+# (connect, read)
+TimeoutPair = tuple[float, float]
+
+
+class LatencyHistogram:
+    """
+    Log-scale latency histogram, 25 ms to about a minute in 25 % steps.
+
+    Counts are halved once they pass ``DECAY_AT`` so old samples fade out and
+    the histogram follows the network it runs on.
+    """
+    __slots__ = ("counts", "total")
+    BASE = 0.025
+    GROWTH = 1.25
+    BUCKETS = 36
+    DECAY_AT = 1000
+
+    def __init__(self, counts: Optional[list[float]] = None) -> None:
+        self.counts = [0.0] * self.BUCKETS
+        if counts is not None:
+            self.counts[:len(counts)] = counts[:self.BUCKETS]
+        self.total = sum(self.counts)
+
+    def add(self, elapsed: float) -> None:
+        if elapsed <= self.BASE:
+            bucket = 0
+        else:
+            bucket = min(self.BUCKETS - 1,
+                         int(log(elapsed / self.BASE, self.GROWTH)) + 1)
+        self.counts[bucket] += 1
+        self.total += 1
+        if self.total > self.DECAY_AT:
+            self.counts = [c / 2 for c in self.counts]
+            self.total /= 2
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Upper bound of the bucket holding the p-th percentile."""
+        if not self.total:
+            return None
+        rank, seen = p / 100 * self.total, 0.0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.BASE * self.GROWTH ** bucket
+        return self.BASE * self.GROWTH ** (self.BUCKETS - 1)
+
+
+class AdaptiveTimeouts:
+    """
+    Read timeouts derived from the latency seen per endpoint.
+
+    Every request's latency goes into a histogram of its endpoint. Once an
+    endpoint has ``min_samples`` samples, the read timeout is its P99 times
+    ``k``, clamped to a floor and a ceiling; before that the session default
+    applies. The samples cover the whole request, which says nothing about how
+    long connecting takes, so the connect timeout stays the session default.
+    Uploads get a budget of their own that grows with the payload size. The
+    histograms are saved in the config directory, so a new run starts from what
+    the last one learned.
+    """
+    FILE_NAME = "latency.json"
+    # 上传体积超过该值或带有 files 时按上传计算
+    UPLOAD_THRESHOLD = 256 * 1024
+
+    def __init__(self, *, k: float = 3.0, min_samples: int = 20,
+                 read_bounds: tuple[float, float] = (2.0, 15.0),
+                 upload_bounds: tuple[float, float] = (15.0, 180.0),
+                 upload_rate: float = 64 * 1024) -> None:
+        """
+        :param k: Multiplier applied to the P99 latency.
+        :param min_samples: Samples an endpoint needs before its own
+            histogram is trusted.
+        :param read_bounds: Floor and ceiling of read timeouts.
+        :param upload_bounds: Floor and ceiling of upload read timeouts.
+        :param upload_rate: Slowest upload throughput still considered alive,
+            in bytes per second.
+        """
+        self.k = k
+        self.min_samples = min_samples
+        self.read_bounds = read_bounds
+        self.upload_bounds = upload_bounds
+        self.upload_rate = upload_rate
+        self._histograms: Optional[dict[str, LatencyHistogram]] = None
+        self._dirty = False
+        self._lock = Lock()
+        self.logger = get_logger(self.__class__.__name__)
+
+    def _load(self) -> dict[str, LatencyHistogram]:
+        if self._histograms is not None:
+            return self._histograms
+        self._histograms = {}
+        _, path = get_cache_path(CacheType.CONFIG, self.FILE_NAME,
+                                 is_makedir=False)
+        if path.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    # 旧版本还按主机记录，这些条目不再使用
+                    self._histograms = {name: LatencyHistogram(counts)
+                                        for name, counts in load(f).items()
+                                        if " " in name}
+            except (OSError, ValueError, TypeError, AttributeError):
+                self.logger.exception(f"ignoring broken {path}")
+        return self._histograms
+
+    def observe(self, endpoint: str, elapsed: float) -> None:
+        """
+        Records the latency of one request.
+
+        :param endpoint: ``"METHOD host/path"`` as used by the worker metrics.
+        :param elapsed: Seconds from sending to the full response, or to the
+            timeout.
+        """
+        with self._lock:
+            histograms = self._load()
+            if (histogram := histograms.get(endpoint)) is None:
+                histogram = histograms[endpoint] = LatencyHistogram()
+            histogram.add(elapsed)
+            self._dirty = True
+
+    def timeout_for(self, endpoint: str, kwargs: dict[str, Any],
+                    default: float) -> TimeoutPair:
+        """
+        Picks the timeout of a request.
+
+        :param endpoint: ``"METHOD host/path"`` of the request.
+        :param kwargs: Keyword arguments of ``Session.request``, to tell
+            uploads apart.
+        :param default: Connect timeout, and the read timeout while there are
+            too few samples.
+        :return: (connect, read) timeout in seconds.
+        """
+        with self._lock:
+            read = self._scaled(self._load().get(endpoint), default)
+        if (size := self.upload_size(kwargs)) is not None:
+            low, high = self.upload_bounds
+            read = min(high, max(low, read + size / self.upload_rate))
+        return default, read
+
+    def upload_size(self, kwargs: dict[str, Any]) -> Optional[int]:
+        """Payload size in bytes when the request is an upload, else None."""
+        size, files = 0, kwargs.get("files") or {}
+        for value in files.values() if isinstance(files, dict) \
+                else (value for _, value in files):
+            content = value[1] if isinstance(value, tuple) else value
+            if isinstance(content, (bytes, bytearray, memoryview)):
+                size += len(content)
+        if isinstance(data := kwargs.get("data"),
+                      (bytes, bytearray, memoryview)):
+            size += len(data)
+        if files or size > self.UPLOAD_THRESHOLD:
+            return size
+        return None
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            _, path = get_cache_path(CacheType.CONFIG, self.FILE_NAME)
+            try:
+                with open(path, "w", encoding="utf-8") as f:
+                    dump({name: [round(c, 2) for c in h.counts]
+                          for name, h in self._histograms.items()}, f)
+                self._dirty = False
+            except OSError as e:
+                self.logger.warning(f"failed to write {path}: {e!r}")
+
+    def _scaled(self, histogram: Optional[LatencyHistogram],
+                default: float) -> float:
+        if histogram is None or histogram.total < self.min_samples:
+            return default
+        low, high = self.read_bounds
+        return min(high, max(low, histogram.percentile(99) * self.k))
+
+
+adaptive_timeouts = AdaptiveTimeouts()
@@ -0,0 +1,70 @@
+from contextlib import contextmanager, suppress
+from socket import socket, SHUT_RDWR
+from threading import Lock, local
+from typing import Iterator, Optional
+
+_local = local()
+
+
+class RequestScope:
+    """
+    记录一次请求过程中从连接池取出的连接。
+
+    取消时直接关闭底层 socket，阻塞在 ``recv`` 上的线程会立即返回，
+    不必等到超时。
+    """
+
+    def __init__(self) -> None:
+        self._conns = []
+        self._lock = Lock()
+        self.aborted = False
+
+    def attach(self, conn) -> None:
+        with self._lock:
+            self._conns.append(conn)
+            if self.aborted:
+                self._shutdown(conn)
+
+    def detach(self, conn) -> None:
+        # 连接归还连接池后可能被其他请求取出，不能再随本次请求关闭
+        with self._lock:
+            with suppress(ValueError):
+                self._conns.remove(conn)
+
+    def recheck(self, conn) -> None:
+        # 已登记的连接刚建立 socket，补上这之前发生的取消
+        with self._lock:
+            if self.aborted:
+                self._shutdown(conn)
+
+    def abort(self) -> None:
+        # 在锁内关闭，避免与 detach 交错时关掉已归还的连接
+        with self._lock:
+            self.aborted = True
+            for conn in self._conns:
+                self._shutdown(conn)
+
+    @staticmethod
+    def _shutdown(conn) -> None:
+        # 握手中的连接只能经 _handshake_sock 关闭，见 pool._RacingConnectionMixin
+        for sock in (getattr(conn, "sock", None),
+                     getattr(conn, "_handshake_sock", None)):
+            if sock is None:
+                continue
+            # 绕过 SSLSocket.shutdown，避免和读线程争用 SSL 对象
+            with suppress(OSError):
+                socket.shutdown(sock, SHUT_RDWR)
+
+
+def current_scope() -> Optional[RequestScope]:
+    return getattr(_local, "scope", None)
+
+
+@contextmanager
+def request_scope(scope: RequestScope) -> Iterator[RequestScope]:
+    previous = current_scope()
+    _local.scope = scope
+    try:
+        yield scope
+    finally:
+        _local.scope = previous
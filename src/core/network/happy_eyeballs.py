@@ -0,0 +1,141 @@
+import errno
+import socket
+from collections import OrderedDict
+from itertools import chain, zip_longest
+from os import strerror
+from selectors import DefaultSelector, EVENT_WRITE
+from threading import Lock
+from time import monotonic
+from typing import Any, Optional
+
+from urllib3.util.connection import allowed_gai_family
+from urllib3.util.timeout import _DEFAULT_TIMEOUT
+
+AddrInfo = tuple[Any, ...]
+
+_IN_PROGRESS = {0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN,
+                getattr(errno, "WSAEWOULDBLOCK", errno.EWOULDBLOCK)}
+
+
+class DnsCache:
+    """
+    Small TTL cache in front of ``getaddrinfo``.
+
+    ``getaddrinfo`` reports no record TTL, so entries simply live for ``ttl``
+    seconds; the least recently resolved entry is dropped once more than
+    ``max_entries`` names are cached.
+    """
+
+    def __init__(self, ttl: float = 300, max_entries: int = 32) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, int, int],
+                                   tuple[float, list[AddrInfo]]] = \
+            OrderedDict()
+        self._lock = Lock()
+
+    def resolve(self, host: str, port: int,
+                family: int = socket.AF_UNSPEC) -> list[AddrInfo]:
+        key = (host, port, family)
+        with self._lock:
+            if (entry := self._entries.get(key)) is not None and \
+                    entry[0] > monotonic():
+                return entry[1]
+        infos = socket.getaddrinfo(host, port, family, socket.SOCK_STREAM)
+        with self._lock:
+            self._entries[key] = (monotonic() + self.ttl, infos)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return infos
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+dns_cache = DnsCache()
+
+
+def _interleave(infos: list[AddrInfo]) -> list[AddrInfo]:
+    # RFC 8305：按首选地址族开始，两个地址族交替尝试
+    if not infos:
+        return []
+    first = infos[0][0]
+    preferred = [i for i in infos if i[0] == first]
+    others = [i for i in infos if i[0] != first]
+    return [i for i in chain.from_iterable(zip_longest(preferred, others))
+            if i is not None]
+
+
+def create_connection(address: tuple[str, int], timeout=_DEFAULT_TIMEOUT,
+                      source_address: Optional[tuple[str, int]] = None,
+                      socket_options=None, *,
+                      attempt_delay: float = 0.25) -> socket.socket:
+    """
+    Drop-in for ``urllib3.util.connection.create_connection`` that races the
+    resolved addresses (happy eyeballs).
+
+    Addresses come from ``dns_cache`` with IPv6 and IPv4 interleaved. A new
+    attempt starts every ``attempt_delay`` seconds, or at once when the
+    previous one fails, while earlier attempts keep running; the first socket
+    to connect wins and the others are closed.
+
+    :raises TimeoutError: No attempt connected within ``timeout``.
+    :raises OSError: Every attempt failed; the last error is raised.
+    """
+    host, port = address
+    if host.startswith("["):
+        host = host.strip("[]")
+    infos = _interleave(dns_cache.resolve(host, port, allowed_gai_family()))
+    if timeout is _DEFAULT_TIMEOUT:
+        timeout = socket.getdefaulttimeout()
+    deadline = None if timeout is None else monotonic() + timeout
+    selector = DefaultSelector()
+    pending: list[socket.socket] = []
+    error: Optional[OSError] = None
+    next_at = 0.0
+    try:
+        while infos or pending:
+            now = monotonic()
+            if infos and (not pending or now >= next_at):
+                af, socktype, proto, _, sa = infos.pop(0)
+                sock = socket.socket(af, socktype, proto)
+                try:
+                    for option in socket_options or ():
+                        sock.setsockopt(*option)
+                    if source_address:
+                        sock.bind(source_address)
+                    sock.setblocking(False)
+                    if (code := sock.connect_ex(sa)) not in _IN_PROGRESS:
+                        raise OSError(code, strerror(code))
+                except OSError as e:
+                    error = e
+                    sock.close()
+                    continue
+                selector.register(sock, EVENT_WRITE)
+                pending.append(sock)
+                next_at = now + attempt_delay
+            wait = next_at - now if infos else None
+            if deadline is not None:
+                if (remaining := deadline - now) <= 0:
+                    raise TimeoutError("timed out")
+                wait = remaining if wait is None else min(wait, remaining)
+            for key, _ in selector.select(wait):
+                sock = key.fileobj
+                selector.unregister(sock)
+                pending.remove(sock)
+                if (code := sock.getsockopt(socket.SOL_SOCKET,
+                                            socket.SO_ERROR)) == 0:
+                    sock.settimeout(timeout)
+                    return sock
+                error = OSError(code, strerror(code))
+                sock.close()
+                # 失败后不必等待，立即尝试下一个地址
+                next_at = 0.0
+    finally:
+        for sock in pending:
+            sock.close()
+        selector.close()
+    raise error if error is not None else \
+        OSError(f"getaddrinfo returned no address for {host}")
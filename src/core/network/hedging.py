@@ -0,0 +1,224 @@
+from concurrent.futures import Future
+from contextlib import suppress
+from dataclasses import dataclass
+from queue import Empty, SimpleQueue
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Optional
+from urllib.parse import urlsplit
+
+from requests import Response
+from requests.exceptions import HTTPError, Timeout
+
+from ..exceptions import TaskCancelled
+from ..log import get_logger
+from ..metrics import worker_metrics
+from .adaptive_timeout import adaptive_timeouts
+
+AttemptSubmitter = Callable[[Callable[[], Any]], Future]
+
+
+@dataclass(frozen=True, slots=True)
+class HedgePolicy:
+    # 从第一次发出到放弃的总预算
+    deadline: float = 12.0
+    # 包括第一次在内最多发出的请求数
+    attempts: int = 3
+    # 对冲延迟取该接口的 P95，限制在以下范围内，无样本时取 default
+    hedge_min: float = 0.5
+    hedge_max: float = 3.0
+    hedge_default: float = 1.5
+    # 该接口延迟样本不足时单次请求的超时
+    attempt_timeout: float = 5.0
+
+    def hedge_delay(self, endpoint: str) -> float:
+        if (p95 := worker_metrics.endpoint_percentile(endpoint, 95)) is None:
+            return self.hedge_default
+        return min(self.hedge_max, max(self.hedge_min, p95))
+
+
+@dataclass(frozen=True, slots=True)
+class HedgeProgress:
+    """Reported each time a request is sent, the first one included."""
+    attempt: int
+    attempts: int
+    remaining: float
+    deadline: float
+
+
+class _AttemptToken:
+    """Cancellation token of one attempt, so a loser can be stopped alone."""
+
+    def __init__(self) -> None:
+        self._cancelled = False
+        self._callbacks: list[Callable[[], None]] = []
+        self._lock = Lock()
+
+    def __bool__(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            callbacks, self._callbacks = self._callbacks, []
+        for cb in callbacks:
+            with suppress(Exception):
+                cb()
+
+    def add_cancel_callback(self, cb: Callable[[], None]) -> None:
+        with self._lock:
+            if not self._cancelled:
+                self._callbacks.append(cb)
+                return
+        cb()
+
+    def remove_cancel_callback(self, cb: Callable[[], None]) -> None:
+        with self._lock, suppress(ValueError):
+            self._callbacks.remove(cb)
+
+
+def _run_inline(fn: Callable[[], Any]) -> Future:
+    future = Future()
+    fn()
+    future.set_result(None)
+    return future
+
+
+def hedged_request(session, method: str, url: str, *,
+                   policy: HedgePolicy = HedgePolicy(),
+                   report: Optional[Callable[[HedgeProgress], None]] = None,
+                   submit: Optional[AttemptSubmitter] = None,
+                   **kwargs) -> Response:
+    """
+    Sends an idempotent request, hedged and retried within a deadline.
+
+    The first request goes out at once. When it has not answered after the
+    endpoint's recent P95 latency, another one is sent on a separate
+    connection, and a transport error or a 5xx answer is retried at once when
+    no other request is outstanding. The first valid answer (any status below
+    500) wins. Every attempt has its own cancellation token: the losers are
+    cancelled as soon as there is a winner, and every attempt still running
+    is cancelled when the deadline passes or the caller is cancelled, so no
+    request outlives the call.
+
+    Attempts run through ``submit``, the worker's share of the thread pool.
+    An attempt that is still queued when the next one is due is taken back
+    and run on the calling thread, so a busy pool delays hedging but never
+    the request. Without ``submit`` the attempts run one after another.
+
+    Only use it for requests that are safe to repeat.
+
+    :param session: ``PooledSession`` of the caller. Every attempt uses a
+        detached copy that shares its cookies and cancellation.
+    :param method: HTTP method.
+    :param url: Request URL.
+    :param policy: Deadline, attempt count and hedge delay bounds.
+    :param report: Called with a ``HedgeProgress`` for every attempt.
+    :param submit: Submits an attempt to the thread pool.
+    :param kwargs: Keyword arguments of ``Session.request``.
+    :return: The first valid response.
+    :raises Timeout: No valid answer arrived within the deadline.
+    :raises TaskCancelled: The caller was cancelled.
+    """
+    logger = get_logger("HedgedRequest")
+    # 每次请求的超时不超过剩余预算
+    kwargs.pop("timeout", None)
+    parts = urlsplit(url)
+    endpoint = f"{method.upper()} {parts.netloc}{parts.path}"
+    delay = policy.hedge_delay(endpoint)
+    deadline = monotonic() + policy.deadline
+    submit = submit or _run_inline
+    answers: SimpleQueue[tuple[Optional[Response], Optional[Exception]]] = \
+        SimpleQueue()
+    # 每次请求的 (future, token, 会话, 请求函数)
+    attempts: list[tuple[Future, _AttemptToken, Any, Callable[[], None]]] = []
+
+    def attempt(attempt_session, timeout: tuple[float, float]) -> None:
+        try:
+            answers.put((attempt_session.request(
+                method, url, **kwargs, timeout=timeout), None))
+        except Exception as e:
+            answers.put((None, e))
+        finally:
+            attempt_session.close()
+
+    def launch() -> None:
+        remaining = deadline - monotonic()
+        if report is not None:
+            report(HedgeProgress(len(attempts) + 1, policy.attempts,
+                                 remaining, policy.deadline))
+        connect, read = adaptive_timeouts.timeout_for(
+            endpoint, kwargs, policy.attempt_timeout)
+        token = _AttemptToken()
+        attempt_session = session.detached()
+        attempt_session.bind_cancel_token(token)
+
+        def run() -> None:
+            attempt(attempt_session,
+                    (min(connect, remaining), min(read, remaining)))
+
+        attempts.append((submit(run), token, attempt_session, run))
+
+    def take_back_queued() -> bool:
+        # 线程池繁忙、请求仍在排队时由调用线程自己发出
+        for future, _, _, run in attempts:
+            if future.cancel():
+                run()
+                return True
+        return False
+
+    def cancel_all() -> None:
+        for future, token, attempt_session, _ in attempts:
+            token.cancel()
+            if future.cancel():
+                # 从未发出的请求也要释放其会话
+                attempt_session.close()
+
+    parent = session.cancel_token
+    if parent is not None:
+        if parent:
+            raise TaskCancelled()
+        parent.add_cancel_callback(cancel_all)
+    try:
+        pending, error = 0, None
+        while True:
+            if pending == 0 and len(attempts) < policy.attempts:
+                launch()
+                pending += 1
+            remaining = deadline - monotonic()
+            if remaining <= 0 or pending == 0:
+                break
+            try:
+                response, e = answers.get(
+                    timeout=min(remaining, delay)
+                    if len(attempts) < policy.attempts else remaining)
+            except Empty:
+                if take_back_queued():
+                    continue
+                if len(attempts) < policy.attempts \
+                        and deadline - monotonic() > 0:
+                    logger.info(
+                        f"{endpoint} slower than {delay:.2f}s, hedging")
+                    launch()
+                    pending += 1
+                continue
+            pending -= 1
+            if parent or isinstance(e, TaskCancelled):
+                raise TaskCancelled()
+            if e is None and response.status_code < 500:
+                return response
+            error = e or HTTPError(
+                f"{endpoint} answered {response.status_code}",
+                response=response)
+            logger.warning(f"{endpoint} attempt failed: {error!r}")
+        if error is not None and pending == 0:
+            raise error
+        raise Timeout(f"{endpoint} got no valid answer within "
+                      f"{policy.deadline:.0f}s") from error
+    finally:
+        # 胜出之外的请求以及超过期限仍未返回的请求都不再需要
+        if parent is not None:
+            parent.remove_cancel_callback(cancel_all)
+        cancel_all()
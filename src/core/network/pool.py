@@ -0,0 +1,451 @@
+import socket
+import sys
+from copy import copy
+from functools import partial
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Optional, Protocol
+from urllib.parse import urlsplit
+
+from requests import Request, Session
+from requests.exceptions import Timeout
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, \
+    NewConnectionError
+from urllib3.util.proxy import connection_requires_http_tunnel
+
+from .adaptive_timeout import adaptive_timeouts
+from .cancel_scope import RequestScope, current_scope, request_scope
+from .happy_eyeballs import create_connection
+from .response_cache import response_cache, unsigned_key
+from .single_flight import SingleFlight
+from ..constant import HeadersType, ProxyMode
+from ..exceptions import TaskCancelled
+from ..log import get_logger
+from ..metrics import worker_metrics, tracer
+
+try:
+    from urllib3.contrib.socks import SOCKSHTTPConnectionPool, \
+        SOCKSHTTPSConnectionPool
+except ImportError:
+    SOCKSHTTPConnectionPool = SOCKSHTTPSConnectionPool = None
+
+# (headers type, proxy mode, proxy url)
+PoolKey = tuple[HeadersType, ProxyMode, str]
+
+
+class CancelToken(Protocol):
+    def __bool__(self) -> bool:
+        ...
+
+    def add_cancel_callback(self, cb: Callable[[], None]) -> None:
+        ...
+
+    def remove_cancel_callback(self, cb: Callable[[], None]) -> None:
+        ...
+
+
+class _RacingConnectionMixin:
+    """建立连接时经 DNS 缓存解析，并让 IPv6/IPv4 地址并行竞速。"""
+    # TLS 握手期间 sock 已交给 SSLSocket 接管，取消时改为关闭这个副本
+    _handshake_sock: Optional[socket.socket] = None
+
+    def connect(self) -> None:
+        try:
+            super().connect()
+        finally:
+            if (handle := self._handshake_sock) is not None:
+                self._handshake_sock = None
+                handle.close()
+
+    def _new_conn(self) -> socket.socket:
+        # 异常转换与 urllib3 的 HTTPConnection._new_conn 保持一致
+        try:
+            sock = create_connection(
+                (self._dns_host, self.port), self.timeout,
+                source_address=self.source_address,
+                socket_options=self.socket_options)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        except TimeoutError as e:
+            raise ConnectTimeoutError(
+                self, f"Connection to {self.host} timed out. "
+                      f"(connect timeout={self.timeout})") from e
+        except OSError as e:
+            raise NewConnectionError(
+                self, f"Failed to establish a new connection: {e}") from e
+        sys.audit("http.client.connect", self, self.host, self.port)
+        if (scope := current_scope()) is not None:
+            self._handshake_sock = sock.dup()
+            scope.recheck(self)
+        return sock
+
+
+class RacingHTTPConnection(_RacingConnectionMixin, HTTPConnection):
+    pass
+
+
+class RacingHTTPSConnection(_RacingConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _ScopedPoolMixin:
+    """
+    取出连接时登记到当前线程的 RequestScope，以便取消时关闭；
+    归还时解除登记。
+    """
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        if (scope := current_scope()) is not None:
+            scope.attach(conn)
+            conn._request_scope = scope
+        return conn
+
+    def _put_conn(self, conn) -> None:
+        # 响应可能在其他线程读完后才归还，这里按连接记录的 scope 解除
+        if (scope := getattr(conn, "_request_scope", None)) is not None:
+            conn._request_scope = None
+            scope.detach(conn)
+        super()._put_conn(conn)
+
+
+class ScopedHTTPConnectionPool(_ScopedPoolMixin, HTTPConnectionPool):
+    ConnectionCls = RacingHTTPConnection
+
+
+class ScopedHTTPSConnectionPool(_ScopedPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = RacingHTTPSConnection
+
+
+_pool_classes = {
+    "http": ScopedHTTPConnectionPool,
+    "https": ScopedHTTPSConnectionPool,
+}
+
+if SOCKSHTTPConnectionPool is not None:
+    class ScopedSOCKSHTTPConnectionPool(_ScopedPoolMixin,
+                                        SOCKSHTTPConnectionPool):
+        pass
+
+
+    class ScopedSOCKSHTTPSConnectionPool(_ScopedPoolMixin,
+                                         SOCKSHTTPSConnectionPool):
+        pass
+
+
+    _socks_pool_classes = {
+        "http": ScopedSOCKSHTTPConnectionPool,
+        "https": ScopedSOCKSHTTPSConnectionPool,
+    }
+else:
+    _socks_pool_classes = None
+
+
+class PooledAdapter(HTTPAdapter):
+    """
+    进程内共享的 HTTPAdapter，多个 Session 复用同一组 keep-alive 连接池。
+
+    urllib3 的 PoolManager 本身是线程安全的，这里只需要保护
+    ``proxy_manager`` 字典的惰性创建。
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._proxy_lock = Lock()
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _pool_classes
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        with self._proxy_lock:
+            manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        if not proxy.lower().startswith("socks"):
+            manager.pool_classes_by_scheme = _pool_classes
+        elif _socks_pool_classes is not None:
+            manager.pool_classes_by_scheme = _socks_pool_classes
+        return manager
+
+
+class _ReleasedAdapter(BaseAdapter):
+    """挂载到已释放的 PooledSession 上，使误用立即报出明确的错误。"""
+
+    def send(self, request, *args, **kwargs):
+        raise RuntimeError(f"{request.method} {request.url}: the session was "
+                           f"released to the pool and can no longer be used")
+
+    def close(self) -> None:
+        pass
+
+
+_released_adapter = _ReleasedAdapter()
+_in_flight = SingleFlight()
+
+
+class PooledSession(Session):
+    """
+    挂载共享 adapter 的 Session。
+
+    Cookie 与请求头仍然属于每个 Worker 自己，只有底层连接被复用，
+    因此 ``close`` 不会关闭共享的连接池。
+    """
+
+    def __init__(self, adapter: PooledAdapter, /, *, verify: bool,
+                 timeout: float, proxies: dict[str, str] | None = None):
+        super().__init__()
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self._default_verify = verify
+        self._default_timeout = timeout
+        self._default_proxies = proxies
+        self._cancel_token: Optional[CancelToken] = None
+
+    def bind_cancel_token(self, token: CancelToken, /) -> None:
+        """
+        Binds a cancellation token to this session.
+
+        Once the token is cancelled, sockets used by in-flight requests are
+        shut down immediately and the request raises ``TaskCancelled``.
+        """
+        self._cancel_token = token
+
+    @property
+    def cancel_token(self) -> Optional[CancelToken]:
+        """Cancellation token bound to this session, if any."""
+        return self._cancel_token
+
+    @property
+    def account_scope(self) -> str:
+        """Uid of the account whose cookies this session carries."""
+        # 登录响应和 cookiejar_from_dict 可能写入不同域名的同名 Cookie
+        return next((c.value for c in self.cookies
+                     if c.name == "DedeUserID" and c.value), "")
+
+    def detached(self, *, cancellable: bool = False) -> "PooledSession":
+        """
+        Copies this session onto the same adapter.
+
+        :param cancellable: Whether the copy keeps the cancellation token.
+            Copies for work that outlives the current worker leave it out.
+        """
+        session = PooledSession(self.adapters["https://"],
+                                verify=self._default_verify,
+                                timeout=self._default_timeout,
+                                proxies=self._default_proxies)
+        session.trust_env = self.trust_env
+        session.headers.update(self.headers)
+        session.cookies.update(self.cookies)
+        if cancellable:
+            session._cancel_token = self._cancel_token
+        return session
+
+    def request(self, method, url, **kwargs) -> Any:
+        kwargs.setdefault("verify", self._default_verify)
+        if self._default_proxies is not None:
+            kwargs.setdefault("proxies", self._default_proxies)
+        return response_cache.fetch(self, method, url, kwargs)
+
+    def fetch_uncached(self, method, url, **kwargs) -> Any:
+        parts = urlsplit(url)
+        endpoint = f"{method.upper()} {parts.netloc}{parts.path}"
+        if endpoint.startswith("GET ") and not kwargs.get("stream"):
+            # 同账号同参数的 GET 正在进行时直接等待其结果
+            key = (endpoint, self.account_scope,
+                   unsigned_key(parts.query, kwargs.get("params")))
+            response, shared = _in_flight.do(
+                key, partial(self._send, endpoint, method, url, **kwargs),
+                token=self._cancel_token, share=copy)
+            if shared:
+                worker_metrics.add_shared(endpoint)
+            return response
+        return self._send(endpoint, method, url, **kwargs)
+
+    def _send(self, endpoint: str, method, url, **kwargs) -> Any:
+        if "timeout" not in kwargs:
+            kwargs["timeout"] = adaptive_timeouts.timeout_for(
+                endpoint, kwargs, self._default_timeout)
+        # 上传耗时取决于体积，不计入延迟分布
+        learn = adaptive_timeouts.upload_size(kwargs) is None
+        start = perf_counter()
+        with tracer.span(endpoint, "http") as span:
+            try:
+                response = self._cancellable_request(method, url, **kwargs)
+            except Timeout:
+                # 超时也作为样本，过紧的超时会随之放宽
+                if learn:
+                    adaptive_timeouts.observe(endpoint, perf_counter() - start)
+                raise
+            finally:
+                worker_metrics.add_http(endpoint, perf_counter() - start)
+            if learn:
+                adaptive_timeouts.observe(endpoint, perf_counter() - start)
+            if span is not None:
+                span.args["status"] = response.status_code
+            return response
+
+    def _cancellable_request(self, method, url, **kwargs) -> Any:
+        if (token := self._cancel_token) is None:
+            return super().request(method, url, **kwargs)
+
+        if token:
+            raise TaskCancelled()
+        scope = RequestScope()
+        token.add_cancel_callback(scope.abort)
+        try:
+            with request_scope(scope):
+                return super().request(method, url, **kwargs)
+        except Exception as e:
+            if token:
+                raise TaskCancelled() from e
+            raise
+        finally:
+            token.remove_cancel_callback(scope.abort)
+
+    def close(self) -> None:
+        # 连接池归 SessionPool 所有，这里只把共享 adapter 换下，可重复调用
+        self.mount("https://", _released_adapter)
+        self.mount("http://", _released_adapter)
+
+
+class SessionPool:
+    _adapters: dict[PoolKey, PooledAdapter]
+
+    def __init__(self, pool_connections: int = 4,
+                 pool_maxsize: int = 16, timeout: float = 5) -> None:
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._timeout = timeout
+        self._adapters = {}
+        self._proxy_key: tuple[ProxyMode, str] | None = None
+        self._lock = Lock()
+        self.logger = get_logger(self.__class__.__name__)
+
+    @staticmethod
+    def make_key(h_type: HeadersType, proxy_mode: ProxyMode,
+                 proxy_url: str) -> PoolKey:
+        if proxy_mode != ProxyMode.CUSTOM:
+            proxy_url = ""
+        return h_type, proxy_mode, proxy_url
+
+    def adapter(self, key: PoolKey, /) -> PooledAdapter:
+        with self._lock:
+            if (proxy_key := key[1:]) != self._proxy_key:
+                # 代理设置变化后旧连接全部作废
+                if self._proxy_key is not None:
+                    self.logger.info(
+                        f"proxy changed to {proxy_key}, invalidating pools")
+                self._close_all()
+                self._proxy_key = proxy_key
+            if (adapter := self._adapters.get(key)) is None:
+                adapter = self._adapters[key] = PooledAdapter(
+                    pool_connections=self._pool_connections,
+                    pool_maxsize=self._pool_maxsize)
+                self.logger.info(f"connection pool created for {key}")
+            return adapter
+
+    def acquire(self, h_type: HeadersType, proxy_mode: ProxyMode,
+                proxy_url: str = "") -> PooledSession:
+        key = self.make_key(h_type, proxy_mode, proxy_url)
+        adapter = self.adapter(key)
+        match proxy_mode:
+            case ProxyMode.SYSTEM:
+                session = PooledSession(adapter, verify=False,
+                                        timeout=self._timeout)
+                session.trust_env = True
+            case ProxyMode.CUSTOM:
+                session = PooledSession(adapter, verify=False,
+                                        timeout=self._timeout,
+                                        proxies={
+                                            "http": proxy_url,
+                                            "https": proxy_url,
+                                        })
+                session.trust_env = False
+            case _:
+                session = PooledSession(adapter, verify=True,
+                                        timeout=self._timeout)
+                session.trust_env = False
+        return session
+
+    def prewarm(self, h_type: HeadersType, proxy_mode: ProxyMode,
+                proxy_url: str, url: str, *,
+                timeout: float | None = None,
+                token: Optional[CancelToken] = None) -> bool:
+        """
+        Opens a keep-alive connection for ``url`` ahead of the first request.
+
+        The connection is made the way a request would make it: through the
+        configured proxy, including the TLS handshake, and is left idle in
+        the pool of ``h_type``. Like a request, it belongs to a
+        ``RequestScope`` that ``token`` aborts, so cancelling shuts the socket
+        instead of waiting for the handshake to time out.
+
+        :param h_type: Headers type whose pool receives the connection.
+        :param proxy_mode: Proxy mode of the application settings.
+        :param proxy_url: Custom proxy URL.
+        :param url: Any URL on the host to connect to.
+        :param timeout: Timeout of each socket operation; the connect timeout
+            of the pool's sessions by default.
+        :param token: Cancellation token of the caller.
+        :return: Whether a connection was opened; False when the pool
+            already holds one.
+        :raises TaskCancelled: If ``token`` was cancelled.
+        """
+        if token:
+            raise TaskCancelled()
+        scope = RequestScope()
+        if token is not None:
+            token.add_cancel_callback(scope.abort)
+        session = self.acquire(h_type, proxy_mode, proxy_url)
+        try:
+            settings = session.merge_environment_settings(
+                url, session._default_proxies or {}, None,
+                session._default_verify, None)
+            pool = session.get_adapter(url).get_connection_with_tls_context(
+                Request("GET", url).prepare(), settings["verify"],
+                proxies=settings["proxies"])
+            with request_scope(scope):
+                # 以下均为 urllib3 私有接口，requirements.txt 固定了其次版本
+                conn = pool._get_conn()
+                try:
+                    if conn.is_connected:
+                        return False
+                    conn.timeout = self._timeout if timeout is None \
+                        else timeout
+                    if connection_requires_http_tunnel(pool.proxy,
+                                                       pool.proxy_config,
+                                                       pool.scheme):
+                        # 经 HTTP 代理时先建立 CONNECT 隧道
+                        pool._prepare_proxy(conn)
+                    else:
+                        conn.connect()
+                    if token:
+                        # 取消发生在连接建立之后，不留下半途的连接
+                        raise TaskCancelled()
+                    return True
+                except Exception as e:
+                    conn.close()
+                    if token and not isinstance(e, TaskCancelled):
+                        raise TaskCancelled() from e
+                    raise
+                finally:
+                    pool._put_conn(conn)
+        finally:
+            if token is not None:
+                token.remove_cancel_callback(scope.abort)
+            session.close()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._close_all()
+            self._proxy_key = None
+
+    def _close_all(self) -> None:
+        for adapter in self._adapters.values():
+            adapter.close()
+        self._adapters.clear()
+
+
+session_pool = SessionPool()
@@ -0,0 +1,28 @@
+from threading import Lock
+from time import monotonic
+
+
+class TokenBucket:
+    """
+    线程安全的令牌桶。
+
+    ``reserve`` 总是立即取走一个令牌并返回使用前需要等待的秒数，令牌不足时
+    余额为负，后来者依次排在更晚的时刻，因此并发调用者整体不会超过
+    ``rate`` 次每秒，空闲后最多允许 ``capacity`` 次突发。
+    """
+
+    def __init__(self, rate: float, capacity: int = 1) -> None:
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._last = monotonic()
+        self._lock = Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(self._capacity,
+                               self._tokens + (now - self._last) * self._rate)
+            self._last = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self._rate)
@@ -0,0 +1,311 @@
+from concurrent.futures import Future
+from dataclasses import dataclass, replace as dc_replace
+from hashlib import sha256
+from json import dump, dumps, load, loads
+from os import replace
+from pathlib import Path
+from threading import Lock
+from time import time
+from typing import Any, Callable, Optional, Protocol
+from urllib.parse import urlsplit
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from ..cache import get_cache_path
+from ..constant import CacheType
+from ..log import get_logger
+
+# 每次签名都会变化，不参与缓存键
+VOLATILE_PARAMS = frozenset({"ts", "sign"})
+
+RefreshSubmitter = Callable[[Callable[[], Any]], Future]
+
+
+def unsigned_key(query: str, params: Any) -> str:
+    """Identity of a request's query and parameters, ignoring the signature."""
+    if params is None:
+        params = {}
+    items = params.items() if isinstance(params, dict) else params
+    return dumps([query, sorted((str(k), str(v)) for k, v in items
+                                if k not in VOLATILE_PARAMS)],
+                 ensure_ascii=False, separators=(",", ":"))
+
+
+class CacheableSession(Protocol):
+    @property
+    def account_scope(self) -> str:
+        ...
+
+    def fetch_uncached(self, method: str, url: str, **kwargs) -> Response:
+        ...
+
+    def detached(self, *, cancellable: bool = False) -> "CacheableSession":
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+@dataclass(frozen=True, slots=True)
+class CachePolicy:
+    # 存入后 ttl 秒内直接返回缓存
+    ttl: float
+    # 之后 stale 秒内先返回旧缓存，同时在后台刷新
+    stale: float = 0
+    # 按账号隔离，未登录时不缓存
+    per_account: bool = True
+
+
+@dataclass(slots=True)
+class CacheStats:
+    name: str
+    fresh: int = 0
+    stale: int = 0
+    miss: int = 0
+    refresh_failed: int = 0
+
+
+@dataclass(slots=True)
+class _Entry:
+    url: str
+    stored_at: float
+    body: str
+
+    def response(self) -> Response:
+        response = Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = self.url
+        response.headers = CaseInsensitiveDict(
+            {"Content-Type": "application/json; charset=utf-8"})
+        response.encoding = "utf-8"
+        response._content = self.body.encode("utf-8")
+        return response
+
+
+class ResponseCache:
+    """
+    Stale-while-revalidate cache for read-only endpoints, sitting under
+    ``PooledSession.request``.
+
+    Only GET requests to endpoints listed in ``POLICIES`` are cached, and only
+    successful answers (HTTP 200 with ``code == 0``). Keys are the URL and its
+    parameters without ``ts``/``sign``, scoped by the account uid unless the
+    policy is shared. Within ``ttl`` a cached answer is returned without
+    touching the network; within the following ``stale`` seconds it is still
+    returned at once while a detached copy of the session refreshes it on the
+    executor bound with ``bind_executor``, so the next caller sees the new
+    value; with no executor bound a stale entry counts as a miss. The login
+    check ``nav`` is deliberately not cached, since a cached answer would hide
+    an expired login. Entries of one endpoint and account share a file in the
+    config directory; POSTs to the endpoints in ``INVALIDATES`` drop the
+    entries they change.
+    """
+    DIR_NAME = "http_cache"
+    POLICIES: dict[str, CachePolicy] = {
+        "api.live.bilibili.com/xlive/app-blink/v1/preLive/GetAreaListForLive":
+            CachePolicy(ttl=6 * 3600, stale=7 * 24 * 3600, per_account=False),
+        "api.live.bilibili.com/xlive/app-blink/v1/room/AnnounceInfo":
+            CachePolicy(ttl=60, stale=24 * 3600),
+        "api.live.bilibili.com/room/v1/Area/getMyChooseArea":
+            CachePolicy(ttl=300, stale=24 * 3600),
+        "api.live.bilibili.com/xlive/app-blink/v1/upStreamConfig/"
+        "GetAnchorSelfStreamTimeShift":
+            CachePolicy(ttl=60, stale=24 * 3600),
+    }
+    INVALIDATES: dict[str, tuple[str, ...]] = {
+        "api.live.bilibili.com/xlive/app-blink/v2/room/AnchorChangeRoomArea":
+            ("api.live.bilibili.com/room/v1/Area/getMyChooseArea",),
+        "api.live.bilibili.com/xlive/app-blink/v1/room/AnnounceCommit":
+            ("api.live.bilibili.com/xlive/app-blink/v1/room/AnnounceInfo",),
+        "api.live.bilibili.com/xlive/app-blink/v1/upStreamConfig/"
+        "SetAnchorSelfStreamTimeShift":
+            ("api.live.bilibili.com/xlive/app-blink/v1/upStreamConfig/"
+             "GetAnchorSelfStreamTimeShift",),
+    }
+
+    def __init__(self) -> None:
+        # 文件名 -> {缓存键: 条目}，按需从磁盘读入
+        self._files: dict[str, dict[str, _Entry]] = {}
+        self._refreshing: set[tuple[str, str]] = set()
+        self._submit_refresh: Optional[RefreshSubmitter] = None
+        self._stats = {endpoint: CacheStats(endpoint.rsplit("/", 1)[-1])
+                       for endpoint in self.POLICIES}
+        self._lock = Lock()
+        self.logger = get_logger(self.__class__.__name__)
+
+    def fetch(self, session: CacheableSession, method: str, url: str,
+              kwargs: dict[str, Any]) -> Response:
+        """
+        Sends a request through the cache.
+
+        :param session: Session the request was made on.
+        :param method: HTTP method.
+        :param url: Request URL.
+        :param kwargs: Keyword arguments of ``Session.request``.
+        :return: The live or the cached response.
+        """
+        parts = urlsplit(url)
+        endpoint = f"{parts.netloc}{parts.path}"
+        if method.upper() != "GET":
+            try:
+                return session.fetch_uncached(method, url, **kwargs)
+            finally:
+                for target in self.INVALIDATES.get(endpoint, ()):
+                    self.invalidate(target, session.account_scope)
+        if (policy := self.POLICIES.get(endpoint)) is None:
+            return session.fetch_uncached(method, url, **kwargs)
+        scope = session.account_scope if policy.per_account else ""
+        if policy.per_account and not scope:
+            return session.fetch_uncached(method, url, **kwargs)
+
+        stem = self._stem(endpoint, scope)
+        key = unsigned_key(parts.query, kwargs.get("params"))
+        stats = self._stats[endpoint]
+        with self._lock:
+            entry = self._load(stem).get(key)
+        if entry is not None:
+            age = time() - entry.stored_at
+            if age < policy.ttl:
+                stats.fresh += 1
+                return entry.response()
+            if age < policy.ttl + policy.stale and self._revalidate(
+                    session, stem, key, method, url, kwargs, stats):
+                stats.stale += 1
+                return entry.response()
+        stats.miss += 1
+        response = session.fetch_uncached(method, url, **kwargs)
+        self._store(stem, key, url, response)
+        return response
+
+    def bind_executor(self, submit: Optional[RefreshSubmitter]) -> None:
+        """
+        Binds the thread pool that runs background refreshes.
+
+        :param submit: Submits a refresh at background priority; set by
+            ``WorkerManager`` and cleared when it shuts down.
+        :return: None
+        """
+        self._submit_refresh = submit
+
+    def invalidate(self, endpoint: str, scope: str = "") -> None:
+        """Drops every cached entry of ``endpoint`` for the account ``scope``."""
+        stem = self._stem(endpoint, scope)
+        with self._lock:
+            self._files[stem] = {}
+            self._path(stem).unlink(missing_ok=True)
+
+    def discard_scope(self, scope: str) -> None:
+        """Drops every cached entry of a removed account."""
+        if not scope:
+            return
+        with self._lock:
+            for stem in [s for s in self._files if s.startswith(f"{scope}-")]:
+                del self._files[stem]
+            for path in self._dir().glob(f"{scope}-*.json"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> list[CacheStats]:
+        return [dc_replace(s) for s in self._stats.values()]
+
+    def reset_stats(self) -> None:
+        for endpoint, stats in self._stats.items():
+            self._stats[endpoint] = CacheStats(stats.name)
+
+    @staticmethod
+    def _stem(endpoint: str, scope: str) -> str:
+        return f"{scope or 'shared'}-" \
+               f"{sha256(endpoint.encode()).hexdigest()[:16]}"
+
+    def _dir(self) -> Path:
+        base, _ = get_cache_path(CacheType.CONFIG, self.DIR_NAME,
+                                 is_makedir=False)
+        return base / self.DIR_NAME
+
+    def _path(self, stem: str) -> Path:
+        return self._dir() / f"{stem}.json"
+
+    def _load(self, stem: str) -> dict[str, _Entry]:
+        if (entries := self._files.get(stem)) is not None:
+            return entries
+        entries = self._files[stem] = {}
+        if (path := self._path(stem)).exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entries.update({key: _Entry(*entry)
+                                    for key, entry in load(f).items()})
+            except (OSError, ValueError, TypeError):
+                self.logger.exception(f"ignoring broken {path}")
+        return entries
+
+    def _store(self, stem: str, key: str, url: str,
+               response: Response) -> None:
+        if response.status_code != 200:
+            return
+        try:
+            body = response.content.decode("utf-8")
+            if loads(body).get("code") != 0:
+                return
+        except (ValueError, AttributeError):
+            return
+        with self._lock:
+            entries = self._load(stem)
+            entries[key] = _Entry(url, time(), body)
+            path = self._path(stem)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                with open(tmp, "w", encoding="utf-8") as f:
+                    dump({k: [e.url, e.stored_at, e.body]
+                          for k, e in entries.items()}, f, ensure_ascii=False)
+                replace(tmp, path)
+            except OSError as e:
+                self.logger.warning(f"failed to write {path}: {e!r}")
+
+    def _revalidate(self, session: CacheableSession, stem: str, key: str,
+                    method: str, url: str, kwargs: dict[str, Any],
+                    stats: CacheStats) -> bool:
+        """
+        Schedules a background refresh of a stale entry.
+
+        :return: False when no refresh can run, so the caller has to fetch
+            the entry itself.
+        """
+        if (submit := self._submit_refresh) is None:
+            return False
+        with self._lock:
+            if (stem, key) in self._refreshing:
+                return True
+            self._refreshing.add((stem, key))
+        detached = session.detached()
+
+        def release() -> None:
+            detached.close()
+            with self._lock:
+                self._refreshing.discard((stem, key))
+
+        def on_done(future: Future) -> None:
+            # 关闭线程池时排队中的刷新会被取消，refresh 不会执行
+            if future.cancelled():
+                release()
+
+        def refresh() -> None:
+            try:
+                self._store(stem, key, url,
+                            detached.fetch_uncached(method, url, **kwargs))
+            except Exception as e:
+                stats.refresh_failed += 1
+                self.logger.warning(f"refreshing {stats.name} failed: {e!r}")
+            finally:
+                release()
+
+        try:
+            submit(refresh).add_done_callback(on_done)
+        except RuntimeError:
+            # 线程池已关闭
+            release()
+            return False
+        return True
+
+response_cache = ResponseCache()
@@ -0,0 +1,91 @@
+from threading import Event, Lock
+from typing import Callable, Generic, Hashable, Optional, TypeVar, \
+    TYPE_CHECKING
+
+from ..exceptions import TaskCancelled
+
+if TYPE_CHECKING:
+    from .pool import CancelToken
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    __slots__ = ("waiters", "result", "error", "done")
+
+    def __init__(self) -> None:
+        self.waiters: list[Event] = []
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+        self.done = False
+
+
+class SingleFlight:
+    """
+    合并同时发出的相同请求。
+
+    同一个键上第一个调用者（leader）真正执行 ``fn``，在它完成之前到达的
+    调用者（follower）只等待并共享其结果或异常。leader 被取消时不会把
+    取消传给 follower，由其中一个重新发起；follower 自己被取消时立即
+    返回，不影响 leader。
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T], *,
+           token: Optional["CancelToken"] = None,
+           share: Callable[[T], T] = lambda result: result) -> tuple[T, bool]:
+        """
+        Runs ``fn`` once for all concurrent callers with the same key.
+
+        :param key: Identity of the call.
+        :param fn: The call itself.
+        :param token: Cancellation token of this caller.
+        :param share: Makes the copy of the leader's result handed to each
+            follower.
+        :return: The result, and whether it was shared from another caller.
+        """
+        while True:
+            with self._lock:
+                if (call := self._calls.get(key)) is None:
+                    call = self._calls[key] = _Call()
+                    leader = True
+                else:
+                    wake = Event()
+                    call.waiters.append(wake)
+                    leader = False
+            if leader:
+                return self._lead(key, call, fn), False
+            if token is not None:
+                # 已取消时立即回调
+                token.add_cancel_callback(wake.set)
+            try:
+                wake.wait()
+            finally:
+                if token is not None:
+                    token.remove_cancel_callback(wake.set)
+            if not call.done:
+                raise TaskCancelled()
+            if isinstance(call.error, TaskCancelled):
+                # leader 被取消，重新竞争
+                continue
+            if call.error is not None:
+                raise call.error
+            return share(call.result), True
+
+    def _lead(self, key: Hashable, call: _Call, fn: Callable[[], T]) -> T:
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                call.done = True
+                waiters = call.waiters
+            for wake in waiters:
+                wake.set()
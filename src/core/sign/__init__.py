@@ -1,5 +1,6 @@
 from .app_sign import livehime_sign, order_payload
 from .bili_ticket import ticket_hmac_sha256
 from .captcha_codec import RiskCaptchaCodec
+from .correspond_path import correspond_path
 from .gen_buvid import gen_buvid
 from .gen_dm_track import gen_dm_track
@@ -0,0 +1,21 @@
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding
+
+# 网页端刷新 Cookie 时用于生成 correspondPath 的公钥
+_PUBLIC_KEY = serialization.load_pem_public_key(b"""\
+-----BEGIN PUBLIC KEY-----
+MIGfMA0GCSqGSIb3DQEBAQUAA4GNADCBiQKBgQDLgd2OAkcGVtoE3ThUREbio0Eg
+Uc/prcajMKXvkCKFCWhJYJcLkcM2DKKcSeFpD/j6Boy538YXnR6VhcuUJOhH2x71
+nzPjfdTcqMz7djHum0qSZA0AyCBDABUqCrfNgCiJ00Ra7GmRj+YCK1NJEuewlb40
+JNrRuoEUXpabUzGB8QIDAQAB
+-----END PUBLIC KEY-----
+""")
+
+
+def correspond_path(timestamp_ms: int) -> str:
+    # RSA-OAEP(SHA256) 加密 "refresh_{毫秒时间戳}" 后转为十六进制
+    encrypted = _PUBLIC_KEY.encrypt(
+        f"refresh_{timestamp_ms}".encode(),
+        padding.OAEP(mgf=padding.MGF1(algorithm=hashes.SHA256()),
+                     algorithm=hashes.SHA256(), label=None))
+    return encrypted.hex()
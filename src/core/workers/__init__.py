@@ -1,2 +1,5 @@
 from .dispatcher import Dispatcher
+from .priority_executor import PriorityExecutor
+from .worker_graph import WorkerGraph, StageTiming
 from .worker_manager import WorkerManager
+from .account_prefetcher import AccountPrefetcher
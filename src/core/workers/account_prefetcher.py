@@ -0,0 +1,151 @@
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Iterable, Optional, Protocol
+
+from .announce import FetchAnnounceWorker
+from .area import FetchRecentAreaWorker
+from .base import BaseWorker, Presenter
+from .credentials import LoadCookiesWorker
+from .pre_live import FetchPreLiveWorker
+from .title import LoadRecentTitleWorker
+from .worker_graph import WorkerGraph, StageTiming
+from .. import app_state
+from ..app_state import AccountContext
+from ..constant import WorkerPriority
+from ..log import get_logger
+
+
+class PrioritySubmitter(Protocol):
+    def __call__(self, worker: BaseWorker, /, on_progress: bool = False,
+                 on_done: Callable[[Optional[BaseException]], None]
+                 | None = None,
+                 priority: WorkerPriority | None = None) -> Future:
+        ...
+
+
+class _RecentTitlePresenter(Presenter):
+    def __init__(self, context: AccountContext):
+        super().__init__()
+        self._context = context
+
+    def prepare_success_view(self, recent_title: list[str]):
+        # 与界面加载时的顺序一致：当前标题在前，其后是本地缓存的历史标题
+        titles = self._context.room_info["recent_title"]
+        if (title := self._context.room_info["title"]) not in titles:
+            titles.insert(0, title)
+        for title in recent_title:
+            if title not in titles:
+                titles.append(title)
+
+    def prepare_fail_view(self, exception: Exception): ...
+
+    def prepare_progress_view(self, *args, **kwargs): ...
+
+
+class AccountPrefetcher:
+    """
+    Warms the state of saved accounts in the background.
+
+    Every account without a cached context gets a fresh ``AccountContext``
+    filled by a ``WorkerGraph``: cookies from the keyring, then PreLive and
+    GetInfo, the announcement, recent areas and the title history from the
+    local cache. PreLive runs in prefetch mode, so a live room is only
+    recorded as live and never restarted from the background. At most
+    ``max_concurrent`` accounts are fetched at a time and every worker runs
+    at background priority. Once PreLive succeeded the context is put into
+    ``app_state.account_contexts``, so switching to the account shows a
+    populated panel without waiting. ``on_finished`` is called once every
+    account is done, unless the prefetch was cancelled.
+
+    Callbacks run on the dispatcher thread, like those of ``WorkerGraph``.
+    """
+
+    def __init__(self, submit: PrioritySubmitter, keys: Iterable[str], /, *,
+                 max_concurrent: int = 2,
+                 on_ready: Callable[[str], None] | None = None,
+                 on_finished: Callable[[], None] | None = None):
+        self._submit = submit
+        self._queue = deque(keys)
+        self._max_concurrent = max(1, max_concurrent)
+        self._on_ready = on_ready
+        self._on_finished = on_finished
+        self._graphs: dict[str, WorkerGraph] = {}
+        self._cancelled = False
+        self._finished = False
+        self.logger = get_logger(self.__class__.__name__)
+
+    def start(self) -> None:
+        self.logger.info(f"prefetching {len(self._queue)} accounts, "
+                         f"{self._max_concurrent} at a time")
+        self._pump()
+
+    def cancel(self) -> None:
+        self._cancelled = True
+        self._queue.clear()
+        for graph in self._graphs.values():
+            graph.cancel()
+        self._graphs.clear()
+
+    def _submit_background(self, worker: BaseWorker, /,
+                           on_progress: bool = False,
+                           on_done: Callable[[Optional[BaseException]], None]
+                           | None = None) -> Future:
+        return self._submit(worker, on_progress=on_progress, on_done=on_done,
+                            priority=WorkerPriority.BACKGROUND)
+
+    def _pump(self) -> None:
+        while (not self._cancelled and self._queue
+               and len(self._graphs) < self._max_concurrent):
+            key = self._queue.popleft()
+            if (cached := app_state.account_contexts.get(key)) is not None \
+                    and cached.room_info["room_id"]:
+                continue
+            self._graphs[key] = graph = self._build(key)
+            graph.start()
+        # 阶段同步完成时 _pump 会嵌套调用，只通知一次
+        if not (self._cancelled or self._finished or self._queue
+                or self._graphs):
+            self._finished = True
+            self.logger.info("prefetch finished")
+            if self._on_finished is not None:
+                self._on_finished()
+
+    def _build(self, key: str) -> WorkerGraph:
+        context = AccountContext(session_pool=app_state.session_pool,
+                                 name=key)
+        graph = WorkerGraph(
+            self._submit_background, f"prefetch {key}",
+            on_complete=lambda timings: self._account_done(key, context,
+                                                           timings))
+        graph.add("cookies", lambda: LoadCookiesWorker(key, context=context))
+        graph.add("pre_live",
+                  lambda: FetchPreLiveWorker(None, context=context,
+                                             prefetch=True),
+                  after=("cookies",))
+        graph.add("announce",
+                  lambda: FetchAnnounceWorker(None, context=context),
+                  after=("cookies",))
+        graph.add("recent_area",
+                  lambda: FetchRecentAreaWorker(context=context),
+                  after=("pre_live",))
+        graph.add("title",
+                  lambda: LoadRecentTitleWorker(
+                      _RecentTitlePresenter(context), context=context),
+                  after=("pre_live",))
+        return graph
+
+    def _account_done(self, key: str, context: AccountContext,
+                      timings: dict[str, StageTiming]) -> None:
+        if self._graphs.pop(key, None) is None:
+            return
+        pre_live = timings["pre_live"]
+        cached = app_state.account_contexts.get(key)
+        # 期间已切换到该账号时保留界面正在使用的上下文
+        if pre_live.error is None and not pre_live.skipped and (
+                cached is None or not cached.room_info["room_id"]
+                and cached is not app_state.default_context):
+            app_state.account_contexts[key] = context
+            self.logger.info(f"account {key} prefetched")
+            if self._on_ready is not None:
+                self._on_ready(key)
+        self._pump()
@@ -1,16 +1,20 @@
 # module import
-from typing import Callable
+from typing import Callable, Optional
 
-from ..base import BaseWorker, Presenter
-from ... import app_state
+from ..base import BaseWorker, Presenter, SubmitPolicy
+from ...app_state import AccountContext
 from ...exceptions import AnnounceUpdateError
 from ...log import get_logger
 from ...sign import livehime_sign, order_payload
 
 
 class AnnounceUpdateWorker(BaseWorker):
-    def __init__(self, presenter: Presenter, /, content: str):
-        super().__init__(name="主播公告更新", presenter=presenter)
+    submit_policy = SubmitPolicy.replace_pending()
+
+    def __init__(self, presenter: Presenter, /, content: str, *,
+                 context: Optional[AccountContext] = None):
+        super().__init__(name="主播公告更新", presenter=presenter,
+                         context=context)
         self.content = content
         self.logger = get_logger(self.__class__.__name__)
 
@@ -20,8 +24,8 @@ class AnnounceUpdateWorker(BaseWorker):
         announce_data.update(
             {
                 "content": self.content,
-                "csrf_token": app_state.cookies_dict["bili_jct"],
-                "csrf": app_state.cookies_dict["bili_jct"],
+                "csrf_token": self.context.cookies["bili_jct"],
+                "csrf": self.context.cookies["bili_jct"],
                 "type": "1",
             }
         )
@@ -36,4 +40,4 @@ class AnnounceUpdateWorker(BaseWorker):
         self.logger.info(f"AnnounceCommit Result: {response}")
         if response["code"] != 0:
             raise AnnounceUpdateError(response["message"])
-        app_state.room_info["announcement"] = self.content
+        self.context.room_info["announcement"] = self.content
@@ -1,15 +1,18 @@
 # module import
-from typing import Callable
+from typing import Callable, Optional
 
 from ..base import BaseWorker, Presenter
 from ... import app_state
+from ...app_state import AccountContext
 from ...log import get_logger
 from ...sign import livehime_sign
 
 
 class FetchAnnounceWorker(BaseWorker):
-    def __init__(self, presenter: Presenter):
-        super().__init__(name="主播公告获取", presenter=presenter)
+    def __init__(self, presenter: Presenter, *,
+                 context: Optional[AccountContext] = None):
+        super().__init__(name="主播公告获取", presenter=presenter,
+                         context=context)
         self.logger = get_logger(self.__class__.__name__)
 
     def run(self, report_progress: Callable | None, *args, **kwargs):
@@ -22,7 +25,7 @@ class FetchAnnounceWorker(BaseWorker):
         response = response.json()
         self.logger.info(f"Announcement info Result: {response}")
         content: dict = response["data"]["announces"]
-        app_state.room_info["announcement"] = content.get("1", {}).get(
+        self.context.room_info["announcement"] = content.get("1", {}).get(
             "content", ""
         )
         app_state.scan_status["announce_updated"] = True
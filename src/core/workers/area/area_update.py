@@ -1,29 +1,35 @@
 # module import
-from typing import Callable
+from typing import Callable, Optional
 
 from ..base import Presenter
 from ... import app_state, constant
+from ...app_state import AccountContext
 from ...exceptions import AreaUpdateError
 from ...log import get_logger
 from ...sign import livehime_sign
-from ...workers.base import BaseWorker
+from ...workers.base import BaseWorker, SubmitPolicy
 
 
 class AreaUpdateWorker(BaseWorker):
-    def __init__(self, presenter: Presenter, /, area: str):
-        super().__init__(name="分区更新", presenter=presenter)
+    # 分区下拉框逐字触发，只提交停止输入后的最后一次
+    submit_policy = SubmitPolicy.debounce(500)
+
+    def __init__(self, presenter: Presenter, /, area: str, *,
+                 context: Optional[AccountContext] = None):
+        super().__init__(name="分区更新", presenter=presenter,
+                         context=context)
         self.area = area
         self.logger = get_logger(self.__class__.__name__)
 
     def run(self, report_progress: Callable | None, *args, **kwargs):
         url = "https://api.live.bilibili.com/xlive/app-blink/v2/room/AnchorChangeRoomArea"
         area_data = {
-            "area_id": app_state.area_codes[self.area],
+            "area_id": app_state.area_catalog.code(self.area),
             "build": constant.LIVEHIME_BUILD,
-            "csrf_token": app_state.cookies_dict["bili_jct"],
-            "csrf": app_state.cookies_dict["bili_jct"],
+            "csrf_token": self.context.cookies["bili_jct"],
+            "csrf": self.context.cookies["bili_jct"],
             "platform": "pc_link",
-            "room_id": app_state.room_info["room_id"],
+            "room_id": self.context.room_info["room_id"],
         }
         self.logger.info(f"AnchorChangeRoomArea Request")
         response = self._session.post(url, params=livehime_sign({}),
@@ -6,10 +6,14 @@ from ..base import Presenter
 from ... import app_state
 from ...log import get_logger
 from ...sign import livehime_sign
-from ...workers.base import BaseWorker
+from ...workers.base import BaseWorker, SubmitPolicy
 
 
 class FetchAreaWorker(BaseWorker):
+    account_bound = False
+    # 有缓存时在后台刷新，快速切换账号时合并为一次
+    submit_policy = SubmitPolicy.coalesce()
+
     def __init__(self, presenter: Presenter):
         super().__init__(name="分区获取", presenter=presenter)
         self.logger = get_logger(self.__class__.__name__)
@@ -22,13 +26,10 @@ class FetchAreaWorker(BaseWorker):
         response.encoding = "utf-8"
         self.logger.info("Area/getList Response")
         response = response.json()
-        for area_info in response["data"]["area_v1_info"]:
-            parent = area_info["name"]
-            app_state.parent_area.append(parent)
-            app_state.area_options[parent] = []
-            for sub_area in area_info["list"]:
-                app_state.area_codes[sub_area["name"]] = sub_area["id"]
-                app_state.area_options[area_info["name"]].append(
-                    sub_area["name"])
-                app_state.area_reverse[sub_area["name"]] = parent
+        diff = app_state.area_catalog.update(response["data"]["area_v1_info"])
+        if diff is not None:
+            self.logger.info(
+                f"areas updated: +{diff.added} -{diff.removed}, "
+                f"parents +{diff.added_parents} -{diff.removed_parents}")
         app_state.scan_status["area_updated"] = True
+        return diff
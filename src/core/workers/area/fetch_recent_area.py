@@ -1,15 +1,19 @@
 # module import
-from typing import Callable
+from typing import Callable, Optional
 
-from ..base import BaseWorker, Presenter
-from ... import app_state
+from ..base import BaseWorker, Presenter, SubmitPolicy
+from ...app_state import AccountContext
 from ...log import get_logger
 from ...sign import livehime_sign
 
 
 class FetchRecentAreaWorker(BaseWorker):
-    def __init__(self, presenter: Presenter):
-        super().__init__(name="历史分区获取", presenter=presenter)
+    submit_policy = SubmitPolicy.coalesce()
+
+    def __init__(self, presenter: Optional[Presenter] = None, *,
+                 context: Optional[AccountContext] = None):
+        super().__init__(name="历史分区获取", presenter=presenter,
+                         context=context)
         self.logger = get_logger(self.__class__.__name__)
 
     def run(self, report_progress: Callable | None, *args, **kwargs):
@@ -17,13 +21,13 @@ class FetchRecentAreaWorker(BaseWorker):
         url = "https://api.live.bilibili.com/room/v1/Area/getMyChooseArea"
         self.logger.info("getMyChooseArea Request")
         response = self._session.get(url, params=livehime_sign({
-            "roomid": app_state.room_info["room_id"],
+            "roomid": self.context.room_info["room_id"],
         }))
         self.logger.info("getMyChooseArea Response")
         response = response.json()
         if response["code"] != 0:
             raise ValueError(response["message"])
-        app_state.room_info["recent_areas"].clear()
+        self.context.room_info["recent_areas"].clear()
         for area_data in response["data"]:
-            app_state.room_info["recent_areas"].append(
+            self.context.room_info["recent_areas"].append(
                 (area_data["parent_name"], area_data["name"]))
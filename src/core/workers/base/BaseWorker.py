@@ -1,39 +1,72 @@
-from typing import Optional, Callable, Union
+from concurrent.futures import Future
+from threading import Lock
+from typing import Optional, Callable, Union, Iterable, Any, TypeVar
 
 from requests import Session
 
-from src.core.app_state import create_session
-from src.core.constant import HeadersType
+from src.core import app_state
+from src.core.app_state import AccountContext
+from src.core.constant import HeadersType, WorkerPriority
 from src.core.exceptions.WorkerException import WorkerException
+from src.core.metrics import WorkerRecord, recording, tracer
 from . import Presenter
+from .CancellationToken import CancellationToken
+from .SubmitPolicy import SubmitPolicy
+
+T = TypeVar("T")
+R = TypeVar("R")
+# 向共享线程池提交一个无参任务，返回其 Future
+TaskSubmitter = Callable[[Callable[[], Any]], Future]
 
 
 class BaseWorker:
     _session: Optional[Session]
+    _cancel_token: CancellationToken
+    _record: Optional[WorkerRecord]
+    _submit_task: Optional[TaskSubmitter]
+    context: AccountContext
     name: str
+    # 子类按需覆盖，WorkerManager 依此排队
+    priority: WorkerPriority = WorkerPriority.INTERACTIVE
+    submit_policy: SubmitPolicy = SubmitPolicy.reject()
+    # 与账号无关的 Worker 设为 False，切换账号时不会被取消
+    account_bound: bool = True
+    # 请求可能已送达服务器、中途取消会让账号状态失真的 Worker 设为 True，
+    # 切换账号时保留运行
+    survives_switch: bool = False
 
     def __init__(self, /, name: str, *, with_session: bool = True,
                  headers_type: HeadersType = HeadersType.APP,
-                 presenter: Optional[Union[Presenter, list[Presenter]]] = None):
+                 presenter: Optional[Union[Presenter, list[Presenter]]] = None,
+                 context: Optional[AccountContext] = None):
         super().__init__()
         self.name = name
+        # 账号相关的数据都从 context 读取，未指定时为界面使用的默认账号
+        self.context = context if context is not None \
+            else app_state.default_context
         if isinstance(presenter, list):
             self._presenters = presenter[:]
         elif presenter is not None:
             self._presenters = [presenter]
         else:
             self._presenters = []
+        self._cancel_token = CancellationToken()
+        self._record = None
+        self._submit_task = None
         if with_session:
-            self._session = create_session(headers_type)
+            self._session = self.context.create_session(headers_type)
+            # 取消时立即中断正在进行的请求
+            self._session.bind_cancel_token(self._cancel_token)
         else:
             self._session = None
 
     def start(self, report_progress: Callable | None, *args, **kwargs):
         try:
-            return self.run(report_progress, *args, **kwargs)
+            with recording(self._record), \
+                    tracer.span(f"{self.__class__.__name__}.run", "worker"):
+                return self.run(report_progress, *args, **kwargs)
         finally:
-            if self._session is not None:
-                self._session.close()
+            self.release()
 
     def run(self, report_progress: Callable | None, *args, **kwargs):
         """
@@ -50,6 +83,113 @@ class BaseWorker:
         """
         raise NotImplementedError
 
+    def stop(self) -> None:
+        """
+        Stops the ongoing operation by triggering the cancellation token.
+
+        Any HTTP request the worker is currently waiting on is aborted and
+        raises ``TaskCancelled``.
+
+        :return: None
+        """
+        self._cancel_token.cancel()
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Raises an exception if the cancellation token has been triggered.
+
+        :return: None
+        :raises TaskCancelled: If the cancellation token has been triggered.
+        """
+        self._cancel_token.raise_if_cancelled()
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Sleeps for up to ``timeout`` seconds, waking up early on cancellation.
+
+        Use this instead of ``time.sleep`` inside ``run`` so that stopping the
+        worker never has to wait for a sleep to finish.
+
+        :param timeout: Maximum number of seconds to wait.
+        :return: True if the worker is still running after the wait, False if
+            it has been cancelled.
+        :rtype: bool
+        """
+        return not self._cancel_token.wait(timeout)
+
+    def bind_record(self, record: Optional[WorkerRecord]) -> None:
+        """
+        Binds the metrics record of the current submission. Run time and the
+        HTTP requests made while running are accounted to it.
+
+        :param record: The record created by ``WorkerManager``.
+        :return: None
+        """
+        self._record = record
+
+    def bind_executor(self, submit: Optional[TaskSubmitter]) -> None:
+        """
+        Binds the shared thread pool used by ``run_parallel``.
+
+        :param submit: Submits a task at the priority of this worker's
+            submission; set by ``WorkerManager``.
+        :return: None
+        """
+        self._submit_task = submit
+
+    def run_parallel(self, fn: Callable[[T], R], items: Iterable[T], /, *,
+                     limit: Optional[int] = None) -> list[R]:
+        """
+        Calls ``fn`` on every item, up to ``limit`` at a time, on the shared
+        thread pool instead of a private one.
+
+        The calling thread takes items as well, so the call finishes even when
+        every pool thread is busy; helpers that never got a thread are simply
+        cancelled. Without a bound pool the items run one after another.
+
+        :param fn: Called once per item.
+        :param items: The items.
+        :param limit: Maximum number of items in progress at a time.
+        :return: The results, in the order of ``items``.
+        :raises TaskCancelled: If the worker was stopped; remaining items are
+            skipped.
+        """
+        items = list(items)
+        results: list[Optional[R]] = [None] * len(items)
+        pending = iter(enumerate(items))
+        lock = Lock()
+
+        def drain() -> None:
+            while not self._cancel_token:
+                with lock:
+                    if (entry := next(pending, None)) is None:
+                        return
+                index, item = entry
+                results[index] = fn(item)
+
+        runners = min(limit or len(items), len(items))
+        helpers = [self._submit_task(drain) for _ in range(runners - 1)] \
+            if self._submit_task is not None else []
+        try:
+            drain()
+        finally:
+            for helper in helpers:
+                # 未开始的辅助任务已无事可做
+                if not helper.cancel():
+                    helper.result()
+        self.raise_if_cancelled()
+        return results
+
+    def release(self) -> None:
+        """
+        Releases the worker's session. Called once the worker has finished, or
+        when it is dropped without ever being started.
+
+        :return: None
+        """
+        if self._session is not None:
+            self._session.close()
+
     def add_presenter(self, presenter: Presenter) -> None:
         self._presenters.append(presenter)
 
@@ -41,3 +41,10 @@ class CancellationToken:
                 run_now = False
         if run_now:
             cb()
+
+    def remove_cancel_callback(self, cb: Callable[[], None]) -> None:
+        with self._lock:
+            try:
+                self._callbacks.remove(cb)
+            except ValueError:
+                pass
@@ -1,42 +1,18 @@
 from typing import Optional
 
+from src.core.app_state import AccountContext
 from src.core.constant import HeadersType
-from src.core.workers.base import BaseWorker, CancellationToken, Presenter
+from src.core.workers.base import BaseWorker, Presenter
 
 
 class LongLiveWorker(BaseWorker):
-    _cancel_token: CancellationToken
-
     def __init__(self, name: str, with_session: bool = True,
                  headers_type: HeadersType = HeadersType.APP,
-                 presenter: Optional[Presenter] = None):
+                 presenter: Optional[Presenter] = None, *,
+                 context: Optional[AccountContext] = None):
         super().__init__(name=name, with_session=with_session,
-                         headers_type=headers_type, presenter=presenter)
-        self._cancel_token = CancellationToken()
-
-    def stop(self) -> None:
-        """
-        Stops the ongoing operation by triggering the cancellation token.
-
-        This method is designed to stop the execution of processes controlled by
-        the cancellation token. It effectively flags the operation for cancellation.
-
-        :return: None
-        """
-        self._cancel_token.cancel()
-
-    def raise_if_cancelled(self) -> None:
-        """
-        Raises an exception if the cancellation token has been triggered.
-
-        This method checks the state of the cancellation token and raises an exception
-        if cancellation has been requested. It is used to ensure that operations can
-        respond appropriately to cancellation requests.
-
-        :return: None
-        :raises TaskCancelled: If the cancellation token has been triggered.
-        """
-        self._cancel_token.raise_if_cancelled()
+                         headers_type=headers_type, presenter=presenter,
+                         context=context)
 
     @property
     def is_running(self) -> bool:
@@ -0,0 +1,124 @@
+from typing import Callable, Optional, Any
+
+from src.core.app_state import AccountContext
+from src.core.constant import HeadersType
+from src.core.exceptions import TaskCancelled
+from src.core.metrics import recording, tracer
+from src.core.workers.base import LongLiveWorker, Presenter
+
+
+class PollAgain:
+    """Returned by ``PollingWorker.poll`` to ask for another round."""
+    __slots__ = ("delay",)
+
+    def __init__(self, delay: Optional[float] = None):
+        self.delay = delay
+
+
+POLL_AGAIN = PollAgain()
+
+
+class PollingWorker(LongLiveWorker):
+    """
+    A long-lived worker whose loop body is a single, short ``poll`` step.
+
+    When submitted to ``WorkerManager`` the worker does not hold a pool thread
+    between rounds: the manager's polling scheduler runs one ``poll`` on the
+    shared pool whenever it is due.
+    """
+    interval: float
+    backoff: float
+    max_interval: float
+    initial_delay: float
+
+    def __init__(self, name: str, with_session: bool = True,
+                 headers_type: HeadersType = HeadersType.APP,
+                 presenter: Optional[Presenter] = None, *,
+                 interval: float = 1.0, backoff: float = 1.0,
+                 max_interval: Optional[float] = None,
+                 initial_delay: float = 0.0,
+                 context: Optional[AccountContext] = None):
+        super().__init__(name=name, with_session=with_session,
+                         headers_type=headers_type, presenter=presenter,
+                         context=context)
+        self.interval = interval
+        self.backoff = backoff
+        self.max_interval = interval if max_interval is None else max_interval
+        self.initial_delay = initial_delay
+        self._current_interval = interval
+        self._waker: Optional[Callable[[], None]] = None
+
+    def poll(self, report_progress: Callable | None) -> Any:
+        """
+        Performs one polling round.
+
+        :param report_progress: Callable function to report progress.
+        :return: ``POLL_AGAIN`` (or a ``PollAgain`` with an explicit delay) to
+            keep polling; any other value finishes the worker with that result.
+        """
+        raise NotImplementedError
+
+    def cancelled_result(self) -> Any:
+        """
+        Result reported when the worker is stopped between two rounds.
+
+        :raises TaskCancelled: By default, so no success view is prepared.
+        """
+        raise TaskCancelled()
+
+    def next_delay(self, hint: PollAgain, /) -> float:
+        """
+        Computes the delay before the next round, applying the backoff.
+
+        :param hint: The ``PollAgain`` returned by ``poll``.
+        :return: Seconds to wait before the next round.
+        """
+        if hint.delay is not None:
+            return hint.delay
+        delay = self._current_interval
+        self._current_interval = min(self._current_interval * self.backoff,
+                                     self.max_interval)
+        return delay
+
+    def reset_backoff(self) -> None:
+        self._current_interval = self.interval
+
+    def bind_waker(self, waker: Optional[Callable[[], None]], /) -> None:
+        self._waker = waker
+
+    def wake(self) -> None:
+        """Runs the next round as soon as possible."""
+        if (waker := self._waker) is not None:
+            waker()
+
+    def step(self, report_progress: Callable | None) -> Any:
+        """
+        Runs one round and releases the session once the worker is finished.
+        """
+        record = self._record
+        link = record.trace_link if record is not None else None
+        try:
+            with recording(record), tracer.span(
+                    f"{self.__class__.__name__}.poll", "worker",
+                    link=link) as span:
+                if span is not None and record is not None:
+                    record.span_id = span.id
+                if self.is_running:
+                    result = self.poll(report_progress)
+                else:
+                    result = self.cancelled_result()
+        except BaseException:
+            self.release()
+            raise
+        if not isinstance(result, PollAgain):
+            self.release()
+        return result
+
+    def run(self, report_progress: Callable | None, *args, **kwargs):
+        # 不经过调度器时退化为普通循环
+        while True:
+            result = self.poll(report_progress)
+            if not isinstance(result, PollAgain):
+                return result
+            if not self.wait(self.next_delay(result)):
+                return self.cancelled_result()
@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+from enum import StrEnum, unique
+
+
+@unique
+class SubmitMode(StrEnum):
+    # 同类任务已存在时直接拒绝
+    REJECT = "reject"
+    # 等待中的任务被最新一次提交替换
+    REPLACE_PENDING = "replace-pending"
+    # 运行期间的重复提交合并为结束后的一次重跑
+    COALESCE = "coalesce"
+    # 静默一段时间后才提交最后一次
+    DEBOUNCE = "debounce"
+
+
+@dataclass(frozen=True, slots=True)
+class SubmitPolicy:
+    """
+    How ``WorkerManager.submit`` treats a worker whose type is already active.
+
+    Set it per worker type with the ``submit_policy`` class attribute.
+    """
+    mode: SubmitMode = SubmitMode.REJECT
+    delay: float = 0.0
+
+    @classmethod
+    def reject(cls) -> "SubmitPolicy":
+        return cls(SubmitMode.REJECT)
+
+    @classmethod
+    def replace_pending(cls) -> "SubmitPolicy":
+        return cls(SubmitMode.REPLACE_PENDING)
+
+    @classmethod
+    def coalesce(cls) -> "SubmitPolicy":
+        return cls(SubmitMode.COALESCE)
+
+    @classmethod
+    def debounce(cls, ms: int) -> "SubmitPolicy":
+        return cls(SubmitMode.DEBOUNCE, ms / 1000)
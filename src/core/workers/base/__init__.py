@@ -1,4 +1,6 @@
 from .BaseWorker import BaseWorker
 from .CancellationToken import CancellationToken
 from .LongLiveWorker import LongLiveWorker
+from .PollingWorker import PollingWorker, PollAgain, POLL_AGAIN
 from .Presenter import Presenter
+from .SubmitPolicy import SubmitPolicy, SubmitMode
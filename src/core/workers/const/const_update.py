@@ -7,12 +7,15 @@ from src.core import constant
 # package import
 from src.core.app_state import dumps
 from src.core.cache import get_cache_path
-from src.core.constant import CacheType
+from src.core.constant import CacheType, WorkerPriority
 from src.core.log import get_logger
 from src.core.workers.base import BaseWorker, Presenter
 
 
 class ConstantUpdateWorker(BaseWorker):
+    priority = WorkerPriority.BACKGROUND
+    account_bound = False
+
     def __init__(self, presenter: Presenter):
         super().__init__(name="配置更新", presenter=presenter)
         self.logger = get_logger(self.__class__.__name__)
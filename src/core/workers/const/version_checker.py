@@ -5,12 +5,15 @@ from typing import Callable
 from semver import compare
 
 # local package import
-from src.core.constant import VERSION
+from src.core.constant import VERSION, WorkerPriority
 from src.core.log import get_logger
 from src.core.workers.base import BaseWorker, Presenter
 
 
 class VersionCheckerWorker(BaseWorker):
+    priority = WorkerPriority.BACKGROUND
+    account_bound = False
+
     def __init__(self, presenter: Presenter):
         super().__init__(name="版本检查", presenter=presenter)
         self.logger = get_logger(self.__class__.__name__)
@@ -1,42 +1,55 @@
 # module import
-from time import sleep
-from typing import Callable
+from typing import Callable, Optional
 
 # local package import
-from src.core import app_state
+from src.core.app_state import AccountContext
+from src.core.constant import WorkerPriority
 # package import
 from src.core.log import get_logger
 from src.core.sign import livehime_sign
-from src.core.workers.base import LongLiveWorker, Presenter
+from src.core.workers.base import PollingWorker, Presenter, POLL_AGAIN
 
 
-class CoverStateUpdateWorker(LongLiveWorker):
-    def __init__(self, presenter: Presenter):
-        super().__init__(name="封面审核更新", presenter=presenter)
+class CoverStateUpdateWorker(PollingWorker):
+    priority = WorkerPriority.BACKGROUND
+
+    def __init__(self, presenter: Presenter, *,
+                 context: Optional[AccountContext] = None):
+        # 审核通常需要数分钟，逐步放宽轮询间隔
+        super().__init__(name="封面审核更新", presenter=presenter,
+                         interval=3, backoff=1.5, max_interval=30,
+                         initial_delay=3,
+                         context=context)
         self.logger = get_logger(self.__class__.__name__)
 
-    def run(self, report_progress: Callable | None, *args, **kwargs):
-        while self.is_running and app_state.room_info["cover_status"] == 0:
-            url = "https://api.live.bilibili.com/xlive/app-blink/v1/preLive/PreLive"
-            params = livehime_sign({
-                "area": "true",
-                "cover": "true",
-                "coverVertical": "true",
-                "liveDirectionType": 0,
-                "mobi_app": "pc_link",
-                "schedule": "true",
-                "title": "true",
-            })
-            self.logger.info("PreLive Request")
-            response = self._session.get(url, params=params)
-            response.encoding = "utf-8"
-            self.logger.info("PreLive Response")
-            response = response.json()
-            self.logger.info(f"PreLive Result: {response}")
-            app_state.room_info.update({
-                "cover_audit_reason": response["data"]["cover"]["auditReason"],
-                "cover_url": response["data"]["cover"]["url"],
-                "cover_status": response["data"]["cover"]["auditStatus"],
-                "title": response["data"]["title"],
-            })
-            sleep(3)
+    def cancelled_result(self):
+        return None
+
+    def poll(self, report_progress: Callable | None):
+        if self.context.room_info["cover_status"] != 0:
+            return None
+        url = "https://api.live.bilibili.com/xlive/app-blink/v1/preLive/PreLive"
+        params = livehime_sign({
+            "area": "true",
+            "cover": "true",
+            "coverVertical": "true",
+            "liveDirectionType": 0,
+            "mobi_app": "pc_link",
+            "schedule": "true",
+            "title": "true",
+        })
+        self.logger.info("PreLive Request")
+        response = self._session.get(url, params=params)
+        response.encoding = "utf-8"
+        self.logger.info("PreLive Response")
+        response = response.json()
+        self.logger.info(f"PreLive Result: {response}")
+        self.context.room_info.update({
+            "cover_audit_reason": response["data"]["cover"]["auditReason"],
+            "cover_url": response["data"]["cover"]["url"],
+            "cover_status": response["data"]["cover"]["auditStatus"],
+            "title": response["data"]["title"],
+        })
+        if self.context.room_info["cover_status"] == 0:
+            return POLL_AGAIN
+        return None
@@ -1,8 +1,8 @@
 # module import
-from typing import Callable
+from typing import Callable, Optional
 
 # local package import
-from src.core import app_state
+from src.core.app_state import AccountContext
 # package import
 from src.core.constant import HeadersType
 from src.core.exceptions import CoverUploadError
@@ -12,9 +12,11 @@ from src.core.workers.base import BaseWorker, Presenter
 
 class CoverUploadWorker(BaseWorker):
     def __init__(self, presenter: Presenter, /,
-                 data: bytes | bytearray | memoryview):
+                 data: bytes | bytearray | memoryview, *,
+                 context: Optional[AccountContext] = None):
         super().__init__(name="封面上传", headers_type=HeadersType.WEB,
-                         presenter=presenter)
+                         presenter=presenter,
+                         context=context)
         self.data = data
         self.logger = get_logger(self.__class__.__name__)
 
@@ -23,7 +25,7 @@ class CoverUploadWorker(BaseWorker):
         url = "https://api.bilibili.com/x/upload/web/image"
         self.logger.info("CoverUpload Request")
         params = {
-            "csrf": app_state.cookies_dict["bili_jct"],
+            "csrf": self.context.cookies["bili_jct"],
         }
         upload_data = {
             "bucket": (None, "live"),
@@ -49,8 +51,8 @@ class CoverUploadWorker(BaseWorker):
             "cover": cover_url,
             "coverVertical": "",
             "liveDirectionType": "1",
-            "csrf_token": app_state.cookies_dict["bili_jct"],
-            "csrf": app_state.cookies_dict["bili_jct"],
+            "csrf_token": self.context.cookies["bili_jct"],
+            "csrf": self.context.cookies["bili_jct"],
             "visit_id": "",
         }
         response = self._session.post(url, data=data)
@@ -60,7 +62,7 @@ class CoverUploadWorker(BaseWorker):
         self.logger.info(f"UpdatePreLiveInfo Result: {response}")
         if response["code"] != 0:
             raise CoverUploadError(response["message"])
-        app_state.room_info.update({
+        self.context.room_info.update({
             "cover_url": cover_url,
             "cover_audit_reason": response["data"]["audit_info"][
                 "audit_title_reason"],
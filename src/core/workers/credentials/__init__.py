@@ -1 +1,2 @@
 from .credential_manager import CredentialManagerWorker
+from .load_cookies import LoadCookiesWorker
@@ -1,35 +1,45 @@
 from json import loads
-from typing import Callable
+from typing import Callable, Optional
 
 # package import
-from keyring import get_password, set_password, delete_password
 from requests.cookies import cookiejar_from_dict
 
 # local package import
 from src.core import app_state
+from src.core.app_state import AccountContext
 from src.core.app_state import dumps
 from src.core.constant import *
 from src.core.constant import HeadersType
 from src.core.exceptions import CredentialExpiredError, \
     CredentialDuplicatedError
+from src.core.keystore import credential_store, refresh_token_key
 from src.core.log import get_logger
 from src.core.sign import livehime_sign
-from src.core.workers.base import BaseWorker, Presenter
+from src.core.workers.base import BaseWorker, Presenter, SubmitPolicy
+from src.core.workers.usernames import username_cache
 
 
 class CredentialManagerWorker(BaseWorker):
+    # 快速连续切换账号时，只保留最后一次提交
+    submit_policy = SubmitPolicy.replace_pending()
+
     def __init__(self, presenter: Presenter, /, cookie_index: int,
-                 is_new: bool = False):
+                 is_new: bool = False, *,
+                 revalidate: bool = False,
+                 context: Optional[AccountContext] = None):
         super().__init__(name="凭据管理", headers_type=HeadersType.WEB,
-                         presenter=presenter)
+                         presenter=presenter,
+                         context=context)
         self.cookie_index = cookie_index
         self.is_new = is_new
+        # 切换到已缓存的账号时只校验 Cookie 是否仍然有效
+        self.revalidate = revalidate
         self.logger = get_logger(self.__class__.__name__)
 
     @staticmethod
     def get_cookie_indices() -> list[str]:
-        if (cookies_index := get_password(KEYRING_SERVICE_NAME,
-                                          KEYRING_COOKIES_INDEX)) is not None:
+        if (cookies_index := credential_store.get(
+                KEYRING_COOKIES_INDEX)) is not None:
             cookies_index = loads(cookies_index)
             if not isinstance(cookies_index, list):
                 return []
@@ -40,13 +50,13 @@ class CredentialManagerWorker(BaseWorker):
         return []
 
     @staticmethod
-    def reset_default():
-        app_state.room_info_default()
+    def reset_default(context: Optional[AccountContext] = None):
+        (context or app_state.default_context).reset()
         app_state.scan_settings_default()
-        app_state.stream_status_default()
 
     @staticmethod
-    def add_cookie(allow_duplicate: bool = False) -> str:
+    def add_cookie(allow_duplicate: bool = False,
+                   context: Optional[AccountContext] = None) -> str:
         """
         Adds a new cookie credential to the credential manager.
 
@@ -55,12 +65,18 @@ class CredentialManagerWorker(BaseWorker):
         If the cookie credential already exists, a duplicate error is raised.
         The credential is stored securely alongside the index of cookie credentials.
 
+        :param allow_duplicate: Whether an existing credential is overwritten
+            instead of raising.
+        :param context: Account whose cookies are stored, defaults to the
+            GUI account.
         :raises CredentialDuplicatedError: If the cookie credential already exists in
             the credential manager.
         :return: The unique key for the added cookie credential.
         :rtype: str
         """
-        uid = app_state.cookies_dict["DedeUserID"]
+        context = context or app_state.default_context
+        cookies = context.cookies
+        uid = cookies["DedeUserID"]
         cookie_key = f"cookies|{uid}"
         CredentialManagerWorker.get_cookie_indices()
         if cookie_key in app_state.cookie_indices:
@@ -69,88 +85,128 @@ class CredentialManagerWorker(BaseWorker):
         else:
             app_state.cookie_indices.append(cookie_key)
             app_state.usernames[cookie_key] = cookie_key
-        set_password(KEYRING_SERVICE_NAME, cookie_key,
-                     dumps(app_state.cookies_dict))
-        set_password(KEYRING_SERVICE_NAME, KEYRING_COOKIES_INDEX,
-                     dumps(app_state.cookie_indices))
+        credential_store.set(cookie_key, dumps(cookies))
+        if context.refresh_token is not None:
+            credential_store.set(refresh_token_key(cookie_key),
+                                 context.refresh_token)
+        credential_store.set(KEYRING_COOKIES_INDEX,
+                             dumps(app_state.cookie_indices))
+        context.name = cookie_key
+        app_state.account_contexts[cookie_key] = context
         return cookie_key
 
+    @staticmethod
+    def load_refresh_token(cookie_key: str, cookies: dict[str, str]) -> \
+            Optional[str]:
+        """
+        Reads the refresh token saved for ``cookie_key``.
+
+        A token saved inside the cookies by an earlier build is taken out of
+        ``cookies`` and moved to its own key.
+
+        :param cookie_key: Cookie index entry, e.g. ``cookies|<uid>``.
+        :param cookies: The loaded cookies; modified in place.
+        :return: The refresh token, or None when none was saved.
+        """
+        key = refresh_token_key(cookie_key)
+        if (legacy := cookies.pop("refresh_token", None)) is not None:
+            credential_store.set(cookie_key, dumps(cookies))
+            if credential_store.get(key) is None:
+                credential_store.set(key, legacy)
+        return credential_store.get(key)
+
+    def _request_nav(self) -> None:
+        nav_url = "https://api.bilibili.com/x/web-interface/nav"
+        self.logger.info(f"nav Request")
+        response = self._session.get(
+            nav_url,
+            params=livehime_sign({},
+                                 access_key=False,
+                                 build=False,
+                                 version=False))
+        response.encoding = "utf-8"
+        self.logger.info("nav Response")
+        response = response.json()
+        if response["code"] != 0:
+            app_state.scan_status["expired"] = True
+            self.logger.info(f"nav Result: {response}")
+            raise CredentialExpiredError("登录凭据过期, 请重新登录")
+        if (current_username := app_state.cookie_indices[
+            self.cookie_index]) in app_state.usernames:
+            app_state.usernames[
+                current_username] = USERNAME_DISPLAY_TEMPLATE.format(
+                response["data"]["uname"],
+                response["data"]["mid"]
+            )
+            username_cache.put(current_username,
+                               app_state.usernames[current_username])
+
     def run(self, report_progress: Callable | None, *args, **kwargs):
+        if self.revalidate:
+            # 会话已带上缓存的 Cookie，房间信息等由调用方在后台刷新
+            self._request_nav()
+            return self.cookie_index
+
+        if (error := credential_store.open_error) is not None:
+            # 保险库无法解密时不当作未登录处理，交给界面提示
+            raise error
 
         if app_state.obs_settings:
             self.logger.info(
                 f"use existing obs settings: {app_state.obs_settings.internal}")
-        elif (saved_settings := get_password(KEYRING_SERVICE_NAME,
-                                             KEYRING_SETTINGS)) is not None:
+        elif (saved_settings := credential_store.get(
+                KEYRING_SETTINGS)) is not None:
             app_state.obs_settings.update(loads(saved_settings))
             self.logger.info(f"obs_settings loaded: {saved_settings}")
         else:
             app_state.obs_settings_default()
             self.logger.info(f"obs_default_settings loaded")
-        if get_password(KEYRING_SERVICE_NAME,
-                        KEYRING_ROOM_INFO) is not None:
-            delete_password(KEYRING_SERVICE_NAME, KEYRING_ROOM_INFO)
-        app_state.room_info_default()
+        if credential_store.get(KEYRING_ROOM_INFO) is not None:
+            credential_store.delete(KEYRING_ROOM_INFO)
+        self.context.reset_room_info()
         self.logger.info(f"room_default_settings loaded")
 
         if self.is_new:
             app_state.scan_status["is_new"] = True
             self.logger.info(f"new credentials created, exiting")
-            app_state.cookies_dict.clear()
+            self.context.cookies.clear()
             return self.cookie_index
 
         # Old version cookie storage, change to index
-        if (saved_cookies := get_password(KEYRING_SERVICE_NAME,
-                                          KEYRING_COOKIES)) is not None and \
-                get_password(KEYRING_SERVICE_NAME,
-                             KEYRING_COOKIES_INDEX) is None:
+        if (saved_cookies := credential_store.get(
+                KEYRING_COOKIES)) is not None and \
+                credential_store.get(KEYRING_COOKIES_INDEX) is None:
             saved_cookies = loads(saved_cookies)
             uid = saved_cookies["DedeUserID"]
-            delete_password(KEYRING_SERVICE_NAME, KEYRING_COOKIES)
-            set_password(KEYRING_SERVICE_NAME, KEYRING_COOKIES_INDEX,
-                         dumps([f"cookies|{uid}"]))
-            set_password(KEYRING_SERVICE_NAME, f"cookies|{uid}",
-                         dumps(saved_cookies))
+            credential_store.delete(KEYRING_COOKIES)
+            credential_store.set(KEYRING_COOKIES_INDEX,
+                                 dumps([f"cookies|{uid}"]))
+            credential_store.set(f"cookies|{uid}", dumps(saved_cookies))
             self.logger.info(f"cookies index created")
 
         self.get_cookie_indices()
         self.logger.info(
             f"cookies index loaded: {app_state.cookie_indices}")
         app_state.usernames.clear()
-        app_state.usernames.update({i: i for i in app_state.cookie_indices})
+        # 先显示缓存的用户名，过期的由 FetchUsernamesWorker 在后台刷新
+        app_state.usernames.update({i: username_cache.get(i, i)
+                                    for i in app_state.cookie_indices})
         if not app_state.cookie_indices or (
-                saved_cookies := get_password(
-                    KEYRING_SERVICE_NAME,
+                saved_cookies := credential_store.get(
                     app_state.cookie_indices[
                         self.cookie_index])) is None:
             app_state.scan_status["is_new"] = True
             return self.cookie_index
         saved_cookies = loads(saved_cookies)
+        cookie_key = app_state.cookie_indices[self.cookie_index]
+        refresh_token = self.load_refresh_token(cookie_key, saved_cookies)
         cookiejar_from_dict(saved_cookies, cookiejar=self._session.cookies,
                             overwrite=True)
-        nav_url = "https://api.bilibili.com/x/web-interface/nav"
-        self.logger.info(f"nav Request")
-        response = self._session.get(
-            nav_url,
-            params=livehime_sign({},
-                                 access_key=False,
-                                 build=False,
-                                 version=False))
-        response.encoding = "utf-8"
-        self.logger.info("nav Response")
-        response = response.json()
-        if response["code"] != 0:
-            app_state.scan_status["expired"] = True
-            self.logger.info(f"nav Result: {response}")
-            raise CredentialExpiredError("登录凭据过期, 请重新登录")
-        if (current_username := app_state.cookie_indices[
-            self.cookie_index]) in app_state.usernames:
-            app_state.usernames[
-                current_username] = USERNAME_DISPLAY_TEMPLATE.format(
-                response["data"]["uname"],
-                response["data"]["mid"]
-            )
-        app_state.cookies_dict.clear()
-        app_state.cookies_dict.update(saved_cookies)
+        self._request_nav()
+        self.context.cookies.clear()
+        self.context.cookies.update(saved_cookies)
+        self.context.refresh_token = refresh_token
+        self.context.name = cookie_key
+        app_state.account_contexts[cookie_key] = self.context
         app_state.scan_status["scanned"] = True
         return self.cookie_index
@@ -0,0 +1,36 @@
+from json import loads
+from typing import Callable, Optional
+
+# local package import
+from src.core.app_state import AccountContext
+from src.core.constant import WorkerPriority
+from src.core.exceptions import CredentialExpiredError
+from src.core.keystore import credential_store
+from src.core.log import get_logger
+from src.core.workers.base import BaseWorker, Presenter
+from .credential_manager import CredentialManagerWorker
+
+
+class LoadCookiesWorker(BaseWorker):
+    """Reads the saved cookies of ``cookie_key`` into the context without
+    touching the GUI account, used before prefetching another account."""
+    priority = WorkerPriority.BACKGROUND
+
+    def __init__(self, cookie_key: str, /,
+                 presenter: Optional[Presenter] = None, *,
+                 context: Optional[AccountContext] = None):
+        super().__init__(name="凭据读取", with_session=False,
+                         presenter=presenter, context=context)
+        self.cookie_key = cookie_key
+        self.logger = get_logger(self.__class__.__name__)
+
+    def run(self, report_progress: Callable | None, *args, **kwargs):
+        if (saved_cookies := credential_store.get(self.cookie_key)) is None:
+            raise CredentialExpiredError(f"{self.cookie_key} 没有保存的凭据")
+        cookies = loads(saved_cookies)
+        self.context.refresh_token = \
+            CredentialManagerWorker.load_refresh_token(self.cookie_key,
+                                                       cookies)
+        self.context.cookies.clear()
+        self.context.cookies.update(cookies)
+        self.logger.info(f"cookies of {self.cookie_key} loaded")
@@ -1,16 +1,20 @@
-from typing import Callable
+from typing import Callable, Optional
 
 # local package import
-from src.core import app_state
-from src.core.constant import FaceAuthType
+from src.core.app_state import AccountContext
+from src.core.constant import FaceAuthType, WorkerPriority
 from src.core.log import get_logger
 from src.core.sign import livehime_sign, order_payload
 from src.core.workers.base import BaseWorker
 
 
 class ReportFaceRecognitionWorker(BaseWorker):
-    def __init__(self, area: int, message: str, auth_type: FaceAuthType):
-        super().__init__(name="人脸报告")
+    priority = WorkerPriority.CRITICAL
+
+    def __init__(self, area: int, message: str, auth_type: FaceAuthType, *,
+                 context: Optional[AccountContext] = None):
+        super().__init__(name="人脸报告",
+                         context=context)
         self._area = area
         self._message = message
         self._auth_type = auth_type
@@ -22,11 +26,11 @@ class ReportFaceRecognitionWorker(BaseWorker):
         report_data = livehime_sign({})
         report_data.update({
             "area_v2_id": self._area,
-            "csrf": app_state.cookies_dict["bili_jct"],
-            "csrf_token": app_state.cookies_dict["bili_jct"],
+            "csrf": self.context.cookies["bili_jct"],
+            "csrf_token": self.context.cookies["bili_jct"],
             "face_auth_code": self._auth_type,
             "face_auth_message": self._message,
-            "room_id": app_state.room_info.room_id,
+            "room_id": self.context.room_info.room_id,
             "scene": "startLive"
         })
         response = self._session.post(url, data=order_payload(report_data))
@@ -1,25 +1,54 @@
-from typing import Callable
+from typing import Callable, Optional
 from warnings import warn
 
 from src.core import app_state, constant
-from src.core.constant import PreferProto, FaceAuthType
+from src.core.app_state import AccountContext
+from src.core.constant import PreferProto, FaceAuthType, WorkerPriority
 from src.core.exceptions import StartLiveError
 from src.core.log import get_logger
+from src.core.network import HedgePolicy, hedged_request
 from src.core.sign import livehime_sign, order_payload
 from src.core.workers.base import BaseWorker, Presenter
 
 
 class StartLiveWorker(BaseWorker):
-    def __init__(self, presenter: Presenter, /, area):
-        super().__init__(name="开播任务", presenter=presenter)
+    priority = WorkerPriority.CRITICAL
+    # 开播请求可能已送达，切换账号后结果仍要记到发起的账号上
+    survives_switch = True
+    # 重复开播返回同一推流地址，可以安全地对冲和重试
+    hedge_policy = HedgePolicy(deadline=12)
+
+    def __init__(self, presenter: Presenter, /, area, *,
+                 context: Optional[AccountContext] = None):
+        super().__init__(name="开播任务", presenter=presenter,
+                         context=context)
         self.area = area
 
     def run(self, report_progress: Callable | None, *args, **kwargs):
 
-        return self.start_live(self._session, self.area)
+        return self.start_live(self._session, self.area, self.context,
+                               report_progress=report_progress,
+                               submit=self._submit_task)
 
     @classmethod
-    def start_live(cls, session, area) -> int | None:
+    def start_live(cls, session, area,
+                   context: Optional[AccountContext] = None, *,
+                   report_progress: Callable | None = None,
+                   submit: Callable | None = None) -> int | None:
+        """
+        Sends startLive and stores the stream address in ``context``.
+
+        :param session: Session of the calling worker.
+        :param area: Child area id.
+        :param context: Account going live, defaults to the GUI account.
+        :param report_progress: Receives a ``HedgeProgress`` for every
+            startLive request sent within ``hedge_policy.deadline``.
+        :param submit: Thread pool share of the calling worker, used for the
+            hedged requests.
+        :return: 0/1/-1 as returned by ``parse_live_addr``, or the face
+            authentication type.
+        """
+        context = context or app_state.default_context
         logger = get_logger(cls.__name__)
         live_url = "https://api.live.bilibili.com/room/v1/Room/startLive"
         # self.fetch_upstream()
@@ -27,31 +56,33 @@ class StartLiveWorker(BaseWorker):
             logger.info("startLive sign with csrf")
             live_data = livehime_sign({
                 "area_v2": area,
-                "csrf_token": app_state.cookies_dict["bili_jct"],
-                "csrf": app_state.cookies_dict["bili_jct"],
-                "room_id": app_state.room_info["room_id"],
+                "csrf_token": context.cookies["bili_jct"],
+                "csrf": context.cookies["bili_jct"],
+                "room_id": context.room_info["room_id"],
                 "type": 2,
             })
         else:
             logger.info("startLive sign without csrf")
             live_data = livehime_sign({
-                "room_id": app_state.room_info["room_id"],
+                "room_id": context.room_info["room_id"],
                 "area_v2": area,
                 "type": 2,
             })
             live_data.update({
-                "csrf_token": app_state.cookies_dict["bili_jct"],
-                "csrf": app_state.cookies_dict["bili_jct"]
+                "csrf_token": context.cookies["bili_jct"],
+                "csrf": context.cookies["bili_jct"]
             })
             live_data = order_payload(live_data)
         logger.info(f"startLive Request")
-        response = session.post(live_url, data=live_data)
+        response = hedged_request(session, "POST", live_url, data=live_data,
+                                  policy=cls.hedge_policy,
+                                  report=report_progress, submit=submit)
         response.encoding = "utf-8"
         logger.info("startLive Response")
         response = response.json()
         match response["code"]:
             case 0:
-                result = cls.parse_live_addr(response)
+                result = cls.parse_live_addr(response, context)
                 match result:
                     case 0:
                         return 0
@@ -65,7 +96,7 @@ class StartLiveWorker(BaseWorker):
                         return -1
             case FaceAuthType.V1:
                 logger.warning(f"startLive Response face auth: {response}")
-                app_state.stream_status.update({
+                context.stream_status.update({
                     "required_face": True,
                     "face_url": response["data"]["qr"],
                     "face_message": response["message"]
@@ -73,7 +104,7 @@ class StartLiveWorker(BaseWorker):
                 return FaceAuthType.V1
             case FaceAuthType.V2:
                 # face_auth v2 using v_voucher
-                app_state.stream_status.update({
+                context.stream_status.update({
                     "required_face": True,
                     "face_voucher": response["data"]["risk_extra"]["v_voucher"],
                     "face_message": response["message"]
@@ -84,7 +115,7 @@ class StartLiveWorker(BaseWorker):
                 raise StartLiveError(response["message"])
 
     @staticmethod
-    def parse_live_addr(response):
+    def parse_live_addr(response, context: AccountContext):
         prefer_proto = app_state.app_settings.get("prefer_proto",
                                                   PreferProto.RTMP)
         srt_protos = [d for d in response["data"]["protocols"] if
@@ -92,27 +123,27 @@ class StartLiveWorker(BaseWorker):
                           "addr", "") and d.get("code", "")]
         match prefer_proto:
             case PreferProto.RTMP:
-                app_state.stream_status.update({
+                context.stream_status.update({
                     "stream_addr": response["data"]["rtmp"]["addr"],
                     "stream_key": response["data"]["rtmp"]["code"]
                 })
                 return 0
             case PreferProto.SRT_FALLBACK_RTMP:
                 if srt_protos:
-                    app_state.stream_status.update({
+                    context.stream_status.update({
                         "stream_addr": srt_protos[0]["addr"],
                         "stream_key": srt_protos[0]["code"]
                     })
                     return 0
                 else:
-                    app_state.stream_status.update({
+                    context.stream_status.update({
                         "stream_addr": response["data"]["rtmp"]["addr"],
                         "stream_key": response["data"]["rtmp"]["code"]
                     })
                     return 1
             case PreferProto.SRT_ONLY:
                 if srt_protos:
-                    app_state.stream_status.update({
+                    context.stream_status.update({
                         "stream_addr": srt_protos[0]["addr"],
                         "stream_key": srt_protos[0]["code"]
                     })
@@ -129,8 +160,8 @@ class StartLiveWorker(BaseWorker):
             "backup_stream": 0,
         })
         stream_data.update({
-            "csrf_token": app_state.cookies_dict["bili_jct"],
-            "csrf": app_state.cookies_dict["bili_jct"]
+            "csrf_token": self.context.cookies["bili_jct"],
+            "csrf": self.context.cookies["bili_jct"]
         })
         stream_data = order_payload(stream_data)
         response = self._session.post(stream_url, data=stream_data)
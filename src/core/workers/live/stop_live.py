@@ -1,17 +1,28 @@
 # package import
-from typing import Callable
+from typing import Callable, Optional
 
 # local package import
-from src.core import app_state, constant
+from src.core import constant
+from src.core.app_state import AccountContext
+from src.core.constant import WorkerPriority
 from src.core.exceptions import StopLiveError
 from src.core.log import get_logger
+from src.core.network import HedgePolicy, hedged_request
 from src.core.sign import livehime_sign, order_payload
 from src.core.workers.base import BaseWorker, Presenter
 
 
 class StopLiveWorker(BaseWorker):
-    def __init__(self, presenter: Presenter):
-        super().__init__(name="停播任务", presenter=presenter)
+    priority = WorkerPriority.CRITICAL
+    # 停播请求可能已送达，切换账号后结果仍要记到发起的账号上
+    survives_switch = True
+    # 未开播时停播同样返回成功，可以安全地对冲和重试
+    hedge_policy = HedgePolicy(deadline=8)
+
+    def __init__(self, presenter: Presenter, *,
+                 context: Optional[AccountContext] = None):
+        super().__init__(name="停播任务", presenter=presenter,
+                         context=context)
         self.logger = get_logger(self.__class__.__name__)
 
     def run(self, report_progress: Callable | None, *args, **kwargs):
@@ -22,23 +33,26 @@ class StopLiveWorker(BaseWorker):
         if constant.STOP_LIVE_AUTH_CSRF:
             self.logger.info("stopLive sign with csrf")
             stop_data = livehime_sign({
-                "csrf_token": app_state.cookies_dict["bili_jct"],
-                "csrf": app_state.cookies_dict["bili_jct"],
-                "room_id": app_state.room_info["room_id"],
+                "csrf_token": self.context.cookies["bili_jct"],
+                "csrf": self.context.cookies["bili_jct"],
+                "room_id": self.context.room_info["room_id"],
             })
         else:
             self.logger.info("stopLive sign without csrf")
             stop_data = livehime_sign({
-                "room_id": app_state.room_info["room_id"],
+                "room_id": self.context.room_info["room_id"],
             })
 
             stop_data.update({
-                "csrf_token": app_state.cookies_dict["bili_jct"],
-                "csrf": app_state.cookies_dict["bili_jct"]
+                "csrf_token": self.context.cookies["bili_jct"],
+                "csrf": self.context.cookies["bili_jct"]
             })
             stop_data = order_payload(stop_data)
         self.logger.info(f"stopLive Request")
-        response = self._session.post(url, data=stop_data)
+        response = hedged_request(self._session, "POST", url, data=stop_data,
+                                  policy=self.hedge_policy,
+                                  report=report_progress,
+                                  submit=self._submit_task)
         response.encoding = "utf-8"
         self.logger.info("stopLive Response")
         response = response.json()
@@ -1,25 +1,27 @@
 # module import
-from typing import Callable
+from typing import Callable, Optional
 
 # local package import
-from src.core import app_state
+from src.core.app_state import AccountContext
 from src.core.log import get_logger
 from src.core.sign import livehime_sign
 from src.core.workers.base import BaseWorker, Presenter
 
 
 class FetchStreamTimeShiftWorker(BaseWorker):
-    def __init__(self, presenter: Presenter):
-        super().__init__(name="推流延迟获取", presenter=presenter)
+    def __init__(self, presenter: Presenter, *,
+                 context: Optional[AccountContext] = None):
+        super().__init__(name="推流延迟获取", presenter=presenter,
+                         context=context)
         self.logger = get_logger(self.__class__.__name__)
 
     def run(self, report_progress: Callable | None, *args, **kwargs):
         url = "https://api.live.bilibili.com/xlive/app-blink/v1/upStreamConfig/GetAnchorSelfStreamTimeShift"
         self.logger.info(f"AnchorSelfStreamTimeShift Request")
         response = self._session.get(url, params=livehime_sign({
-            "csrf": app_state.cookies_dict["bili_jct"],
-            "csrf_token": app_state.cookies_dict["bili_jct"],
-            "room_id": app_state.room_info["room_id"],
+            "csrf": self.context.cookies["bili_jct"],
+            "csrf_token": self.context.cookies["bili_jct"],
+            "room_id": self.context.room_info["room_id"],
         }))
         response.encoding = "utf-8"
         self.logger.info("AnchorSelfStreamTimeShift Response")
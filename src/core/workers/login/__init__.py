@@ -1,3 +1,4 @@
 from .buvid_ticket import TicketFetchWorker
+from .credential_refresh import CredentialRefreshWorker
 from .fetch_login import FetchLoginWorker
 from .fetch_qr import FetchQRWorker
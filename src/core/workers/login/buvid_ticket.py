@@ -1,9 +1,10 @@
 from time import time
-from typing import Callable
+from typing import Callable, Optional
 from urllib.parse import quote
 
 # local package import
 from src.core import app_state
+from src.core.app_state import AccountContext
 from src.core.constant import *
 from src.core.log import get_logger
 from src.core.sign import ticket_hmac_sha256
@@ -11,44 +12,63 @@ from src.core.workers.base import BaseWorker, Presenter
 
 
 class TicketFetchWorker(BaseWorker):
-    def __init__(self, presenter: Presenter):
+    def __init__(self, presenter: Presenter, *,
+                 context: Optional[AccountContext] = None):
         super().__init__(name="ticket获取", headers_type=HeadersType.WEB,
-                         presenter=presenter)
+                         presenter=presenter,
+                         context=context)
         self.logger = get_logger(self.__class__.__name__)
 
     def run(self, report_progress: Callable | None, *args, **kwargs):
 
-        if int(app_state.cookies_dict.get("bili_ticket_expires", 0)) < int(
+        if int(self.context.cookies.get("bili_ticket_expires", 0)) < int(
                 time()):
-            self.logger.info("buvid_ticket Request")
-            ticket_param = {
-                "key_id": "ec02",
-                "hexsign": ticket_hmac_sha256(int(time())),
-                "context[ts]": int(time()),
-                "csrf": app_state.cookies_dict.get("bili_jct", "")
-            }
-            response = self._session.post(
-                "https://api.bilibili.com/bapis/bilibili.api.ticket.v1.Ticket/GenWebTicket",
-                params=ticket_param)
-            self.logger.info("buvid_ticket Response")
-            response.encoding = "utf-8"
-            response = response.json()
-            app_state.cookies_dict["bili_ticket"] = response["data"][
-                "ticket"]
-            app_state.cookies_dict["bili_ticket_expires"] = str(
-                response["data"][
-                    "created_at"] + \
-                response["data"][
-                    "ttl"])
-
-        if not app_state.cookies_dict.get(
-                "buvid3") or not app_state.cookies_dict.get("buvid4"):
+            self.fetch_ticket(self._session, self.context)
+
+        if not self.context.cookies.get(
+                "buvid3") or not self.context.cookies.get("buvid4"):
             self.logger.info("buvid3 Request")
             response = self._session.get(
                 "https://api.bilibili.com/x/frontend/finger/spi")
             self.logger.info("buvid3 Response")
             response.encoding = "utf-8"
             response = response.json()
-            app_state.cookies_dict["buvid3"] = response["data"]["b_3"]
-            app_state.cookies_dict["buvid4"] = quote(
+            self.context.cookies["buvid3"] = response["data"]["b_3"]
+            self.context.cookies["buvid4"] = quote(
                 response["data"]["b_4"])
+
+    @classmethod
+    def fetch_ticket(cls, session,
+                     context: Optional[AccountContext] = None) -> None:
+        context = context or app_state.default_context
+        context.cookies.update(cls.request_ticket(
+            session, context.cookies.get("bili_jct", "")))
+
+    @classmethod
+    def request_ticket(cls, session, csrf: str) -> dict[str, str]:
+        """
+        Requests a new ``bili_ticket`` without touching any account state.
+
+        :param session: Session carrying the account's cookies.
+        :param csrf: ``bili_jct`` of the account.
+        :return: The ``bili_ticket`` and ``bili_ticket_expires`` cookies.
+        """
+        logger = get_logger(cls.__name__)
+        logger.info("buvid_ticket Request")
+        ticket_param = {
+            "key_id": "ec02",
+            "hexsign": ticket_hmac_sha256(int(time())),
+            "context[ts]": int(time()),
+            "csrf": csrf
+        }
+        response = session.post(
+            "https://api.bilibili.com/bapis/bilibili.api.ticket.v1.Ticket/GenWebTicket",
+            params=ticket_param)
+        logger.info("buvid_ticket Response")
+        response.encoding = "utf-8"
+        response = response.json()
+        return {
+            "bili_ticket": response["data"]["ticket"],
+            "bili_ticket_expires": str(
+                response["data"]["created_at"] + response["data"]["ttl"]),
+        }
@@ -0,0 +1,162 @@
+from re import search
+from time import time
+from typing import Callable, Optional
+
+# local package import
+from src.core import app_state
+from src.core.app_state import AccountContext
+from src.core.constant import *
+from src.core.exceptions import CredentialExpiredError, TaskCancelled
+from src.core.log import get_logger
+from src.core.sign import correspond_path
+from src.core.workers.base import PollingWorker, PollAgain
+from src.core.workers.credentials import CredentialManagerWorker
+from .buvid_ticket import TicketFetchWorker
+
+
+class CredentialRefreshWorker(PollingWorker):
+    """
+    Keeps the credentials of every loaded account fresh in the background.
+
+    ``bili_ticket`` is renewed ``ticket_margin`` seconds before it expires.
+    The login cookies are checked every ``cookie_check_interval`` seconds and
+    rotated with the saved ``refresh_token`` once Bilibili asks for it. Each
+    renewal is reported as progress the moment the server hands it out, and
+    is applied to the account and written back to the credential store on the
+    dispatcher thread, so requests on the start live path never carry an
+    expired credential and a later failing step cannot lose a rotated token.
+    Submit it with ``on_progress=True``.
+    """
+    priority = WorkerPriority.BACKGROUND
+    account_bound = False
+    ticket_margin = 3600
+    cookie_check_interval = 12 * 3600
+    retry_delay = 300
+
+    def __init__(self):
+        super().__init__(name="凭据刷新", with_session=False,
+                         interval=3600, initial_delay=30)
+        self._cookies_checked: dict[str, float] = {}
+        self._retry_at: dict[str, float] = {}
+        self.logger = get_logger(self.__class__.__name__)
+
+    def poll(self, report_progress: Callable | None):
+        now = time()
+        next_due = now + self.interval
+        for context in list(app_state.account_contexts.values()):
+            if context.name and context.uid:
+                next_due = min(next_due, self._refresh(context, now,
+                                                       report_progress))
+        # 下一次到期时间最早的账号决定何时再次运行
+        return PollAgain(max(60.0, next_due - time()))
+
+    def _refresh(self, context: AccountContext, now: float,
+                 report_progress: Callable | None) -> float:
+        name = context.name
+        if (retry_at := self._retry_at.get(name, 0.0)) > now:
+            return retry_at
+        ticket_due = int(context.cookies.get("bili_ticket_expires", 0)) \
+            - self.ticket_margin
+        cookie_due = self._cookies_checked.get(name, 0.0) \
+            + self.cookie_check_interval
+        if min(ticket_due, cookie_due) > now:
+            return min(ticket_due, cookie_due)
+        session = context.create_session(HeadersType.WEB)
+        session.bind_cancel_token(self._cancel_token)
+        report = report_progress or (lambda *args: None)
+        try:
+            csrf = context.cookies["bili_jct"]
+            if cookie_due <= now:
+                if (renewed := self._refresh_cookies(session, context,
+                                                     report)) is not None:
+                    csrf = renewed.get("bili_jct", csrf)
+                self._cookies_checked[name] = now
+                cookie_due = now + self.cookie_check_interval
+            if ticket_due <= now:
+                ticket = TicketFetchWorker.request_ticket(session, csrf)
+                report(context, ticket)
+                ticket_due = int(ticket["bili_ticket_expires"]) \
+                    - self.ticket_margin
+        except TaskCancelled:
+            raise
+        except Exception as e:
+            self.logger.warning(f"refreshing {name} failed: {e!r}")
+            self._retry_at[name] = now + self.retry_delay
+            return now + self.retry_delay
+        finally:
+            session.close()
+        return min(ticket_due, cookie_due)
+
+    def _refresh_cookies(self, session, context: AccountContext,
+                         report: Callable) -> Optional[dict[str, str]]:
+        """
+        Rotates the login cookies when Bilibili asks for it.
+
+        :return: The new cookies, or None when they were left unchanged.
+        """
+        csrf = context.cookies["bili_jct"]
+        self.logger.info(f"cookie info of {context.name} Request")
+        response = session.get(
+            "https://passport.bilibili.com/x/passport-login/web/cookie/info",
+            params={"csrf": csrf})
+        response.encoding = "utf-8"
+        self.logger.info(f"cookie info of {context.name} Response")
+        response = response.json()
+        if response["code"] != 0:
+            raise CredentialExpiredError(response["message"])
+        if not response["data"]["refresh"]:
+            return None
+        if (refresh_token := context.refresh_token) is None:
+            self.logger.warning(
+                f"cookies of {context.name} need refreshing, but no "
+                f"refresh_token was saved, please log in again")
+            return None
+
+        response = session.get(
+            "https://www.bilibili.com/correspond/1/"
+            f"{correspond_path(int(time() * 1000))}")
+        response.encoding = "utf-8"
+        if (match := search(r'<div id="1-name">(.+?)</div>',
+                            response.text)) is None:
+            raise CredentialExpiredError("refresh_csrf not found")
+
+        self.logger.info(f"cookie refresh of {context.name} Request")
+        response = session.post(
+            "https://passport.bilibili.com/x/passport-login/web/cookie/refresh",
+            data={
+                "csrf": csrf,
+                "refresh_csrf": match.group(1),
+                "source": "main_web",
+                "refresh_token": refresh_token,
+            })
+        response.encoding = "utf-8"
+        self.logger.info(f"cookie refresh of {context.name} Response")
+        result = response.json()
+        if result["code"] != 0:
+            raise CredentialExpiredError(result["message"])
+        cookies = response.cookies.get_dict()
+        # 服务器此时已换发新凭据，先保存，之后的确认失败也不会丢失
+        report(context, cookies, result["data"]["refresh_token"])
+
+        # 确认后旧的 refresh_token 才会失效
+        response = session.post(
+            "https://passport.bilibili.com/x/passport-login/web/confirm/refresh",
+            data={
+                "csrf": cookies.get("bili_jct", csrf),
+                "refresh_token": refresh_token,
+            })
+        response.encoding = "utf-8"
+        self.logger.info(
+            f"confirm refresh of {context.name} Result: {response.json()}")
+        return cookies
+
+    def on_progress(self, context: AccountContext, cookies: dict[str, str],
+                    refresh_token: Optional[str] = None):
+        # 期间被删除的账号不再写回
+        if app_state.account_contexts.get(context.name) is context:
+            context.cookies.update(cookies)
+            if refresh_token is not None:
+                context.refresh_token = refresh_token
+            CredentialManagerWorker.add_cookie(True, context)
+            self.logger.info(f"credentials of {context.name} refreshed")
+        super().on_progress(context)
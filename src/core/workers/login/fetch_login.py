@@ -1,64 +1,68 @@
 # module import
-from time import sleep
-from typing import Callable
+from typing import Callable, Optional
 
 # local package import
 from src.core import app_state
+from src.core.app_state import AccountContext
 # package import
 from src.core.constant import HeadersType, LoginResult
 from src.core.exceptions import LoginError
 from src.core.log import get_logger
-from src.core.workers.base import LongLiveWorker, Presenter
+from src.core.workers.base import PollingWorker, Presenter, PollAgain, \
+    POLL_AGAIN
 from src.core.workers.credentials import CredentialManagerWorker
 
 
-class FetchLoginWorker(LongLiveWorker):
-    def __init__(self, presenter: Presenter):
+class FetchLoginWorker(PollingWorker):
+    def __init__(self, presenter: Presenter, *,
+                 context: Optional[AccountContext] = None):
         super().__init__(name="登录", headers_type=HeadersType.WEB,
-                         presenter=presenter)
+                         presenter=presenter, interval=1,
+                         context=context)
         self.logger = get_logger(self.__class__.__name__)
 
-    def run(self, report_progress: Callable | None, *args, **kwargs):
+    def cancelled_result(self):
+        return LoginResult.CANCELLED
 
+    def poll(self, report_progress: Callable | None):
         check_url = "https://passport.bilibili.com/x/passport-login/web/qrcode/poll"
-        while app_state.scan_status["qr_key"] is None and self.is_running:
-            sleep(0.1)
+        if app_state.scan_status["qr_key"] is None:
+            # 等待二维码生成
+            return PollAgain(0.1)
+        if app_state.scan_status["scanned"]:
+            return LoginResult.CANCELLED
         params = {
             "qrcode_key": app_state.scan_status["qr_key"],
             "source": "live_pc",
             "web_location": "0.0"
         }
-        while not app_state.scan_status["scanned"] and self.is_running:
-            self.logger.info("QR poll Request")
-            response = self._session.get(check_url, params=params)
-            response.encoding = "utf-8"
-            self.logger.info("QR poll Response")
-            result = response.json()
-            match result["data"]["code"]:
-                case 86101:  # Not scanned yet
-                    self.logger.info(f"QR poll Result: {result}")
-                    sleep(1)
-                    continue
-                case 86038:  # QR expired
-                    self.logger.info(f"QR poll Result: {result}")
-                    app_state.scan_status["timeout"] = True
-                    return LoginResult.QR_EXPIRED
-                case 86090:  # Scanned but not confirmed
-                    self.logger.info(f"QR poll Result: {result}")
-                    app_state.scan_status["wait_for_confirm"] = True
-                    report_progress(LoginResult.QR_NOT_CONFIRMED)
-                    sleep(1)
-                    continue
-                case 0:  # Login successful
-                    app_state.cookies_dict.clear()
-                    app_state.cookies_dict.update(
-                        response.cookies.get_dict())
-                    # config.cookies_dict["refresh_token"] = result["data"][
-                    #     "refresh_token"]
+        self.logger.info("QR poll Request")
+        response = self._session.get(check_url, params=params)
+        response.encoding = "utf-8"
+        self.logger.info("QR poll Response")
+        result = response.json()
+        match result["data"]["code"]:
+            case 86101:  # Not scanned yet
+                self.logger.info(f"QR poll Result: {result}")
+                return POLL_AGAIN
+            case 86038:  # QR expired
+                self.logger.info(f"QR poll Result: {result}")
+                app_state.scan_status["timeout"] = True
+                return LoginResult.QR_EXPIRED
+            case 86090:  # Scanned but not confirmed
+                self.logger.info(f"QR poll Result: {result}")
+                app_state.scan_status["wait_for_confirm"] = True
+                report_progress(LoginResult.QR_NOT_CONFIRMED)
+                return POLL_AGAIN
+            case 0:  # Login successful
+                self.context.cookies.clear()
+                self.context.cookies.update(
+                    response.cookies.get_dict())
+                # 用于 CredentialRefreshWorker 在 Cookie 过期前刷新
+                self.context.refresh_token = result["data"]["refresh_token"]
 
-                    CredentialManagerWorker.add_cookie()
-                    app_state.scan_status["scanned"] = True
-                    return LoginResult.SUCCESS
-                case _:
-                    raise LoginError(result["message"])
-        return LoginResult.CANCELLED
+                CredentialManagerWorker.add_cookie(context=self.context)
+                app_state.scan_status["scanned"] = True
+                return LoginResult.SUCCESS
+            case _:
+                raise LoginError(result["message"])
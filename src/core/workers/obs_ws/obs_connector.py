@@ -11,6 +11,8 @@ from src.core.workers.base import BaseWorker, Presenter
 
 
 class ObsConnectorWorker(BaseWorker):
+    account_bound = False
+
     def __init__(self, presenter: Presenter, /,
                  host, port, password, *, cond: Condition):
         super().__init__(name="OBS通讯", with_session=False,
@@ -1,7 +1,7 @@
 # module import
 from contextlib import suppress
 from queue import Empty
-from typing import Callable
+from typing import Callable, Optional
 
 # package import
 from obsws_python.error import OBSSDKRequestError
@@ -9,23 +9,40 @@ from obsws_python.error import OBSSDKRequestError
 # local package import
 from src.core import app_state
 from src.core.log import get_logger
-from src.core.workers.base import LongLiveWorker, Presenter
+from src.core.workers.base import PollingWorker, Presenter, POLL_AGAIN
 
 
 # package import
 
 
-class ObsDaemonWorker(LongLiveWorker):
+class ObsDaemonWorker(PollingWorker):
+    account_bound = False
+    _active: Optional["ObsDaemonWorker"] = None
+
     def __init__(self, presenter: Presenter, /):
+        # 入队时会主动唤醒，定时轮询只是兜底
         super().__init__(name="OBS交互", with_session=False,
-                         presenter=presenter)
-
-    def run(self, report_progress: Callable | None, *args, **kwargs):
-        while app_state.obs_client is not None and self.is_running:
-            with suppress(Empty):
-                req, body = app_state.obs_req_queue.get(timeout=.2)
+                         presenter=presenter, interval=1)
+        ObsDaemonWorker._active = self
+
+    def cancelled_result(self):
+        return None
+
+    def poll(self, report_progress: Callable | None):
+        if app_state.obs_client is None:
+            return None
+        with suppress(Empty):
+            while True:
+                req, body = app_state.obs_req_queue.get_nowait()
                 with suppress(OBSSDKRequestError):
                     app_state.obs_client.send(req, body)
+        return POLL_AGAIN
+
+    @classmethod
+    def request(cls, req: str, body: dict) -> None:
+        app_state.obs_req_queue.put((req, body))
+        if (daemon := cls._active) is not None:
+            daemon.wake()
 
     @classmethod
     def disconnect_obs(cls):
@@ -35,5 +52,7 @@ class ObsDaemonWorker(LongLiveWorker):
         if app_state.obs_client is not None:
             app_state.obs_client.disconnect()
             app_state.obs_client = None
+        if (daemon := cls._active) is not None:
+            daemon.wake()
         logger.info("OBS disconnected")
         app_state.obs_op = False
@@ -0,0 +1,179 @@
+from concurrent.futures import Future, InvalidStateError
+from dataclasses import dataclass
+from functools import partial
+from heapq import heappush, heappop
+from itertools import count
+from threading import Condition, Event, Thread, current_thread
+from time import monotonic
+from typing import Callable, Optional, Any
+
+from .base import PollingWorker, PollAgain
+from ..constant import WorkerPriority
+from ..log import get_logger
+
+
+@dataclass(slots=True, eq=False)
+class _PollTask:
+    worker: PollingWorker
+    future: Future
+    report_progress: Callable
+    priority: WorkerPriority
+    due: float = 0.0
+    running: bool = False
+    woken: bool = False
+    done: bool = False
+
+
+class PollingScheduler:
+    """
+    Drives every ``PollingWorker`` from a single timer thread.
+
+    Pending rounds live in a min-heap ordered by due time; the scheduler thread
+    sleeps until the earliest one is due and then hands exactly one ``step`` to
+    the shared pool. Idle pollers hold no pool thread, so the number of threads
+    and wakeups stays constant no matter how many pollers are registered.
+    """
+    _heap: list[tuple[float, int, _PollTask]]
+    _tasks: set[_PollTask]
+
+    def __init__(self, run_step: Callable[[Callable[[], None], WorkerPriority],
+                                          Any]) -> None:
+        self._run_step = run_step
+        self._heap = []
+        self._tasks = set()
+        self._seq = count()
+        self._cond = Condition()
+        self._thread: Optional[Thread] = None
+        self._stop = Event()
+        self.logger = get_logger(self.__class__.__name__)
+
+    def schedule(self, worker: PollingWorker, future: Future,
+                 report_progress: Callable,
+                 priority: WorkerPriority = WorkerPriority.INTERACTIVE) -> None:
+        task = _PollTask(worker, future, report_progress, priority)
+        waker = partial(self.wake, task)
+        worker.bind_waker(waker)
+        # 取消后尽快在下一轮中结束，而不是等到下次到期
+        worker.add_cancel_callback(waker)
+        with self._cond:
+            self._tasks.add(task)
+            self._push(task, worker.initial_delay)
+            self._ensure_thread()
+
+    def wake(self, task: _PollTask) -> None:
+        with self._cond:
+            if task.done:
+                return
+            if task.running:
+                task.woken = True
+                return
+            self._push(task, 0.0)
+
+    def clear(self) -> None:
+        with self._cond:
+            for task in self._tasks:
+                task.done = True
+                task.worker.bind_waker(None)
+            self._tasks.clear()
+            self._heap.clear()
+            self._cond.notify_all()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stops the scheduler thread. Rounds still pending stay registered and
+        resume once ``schedule`` starts a new thread.
+
+        :param wait: Whether to wait for the thread to exit.
+        """
+        with self._cond:
+            self._stop.set()
+            self._cond.notify_all()
+            thread, self._thread = self._thread, None
+        if wait and thread is not None and thread is not current_thread():
+            thread.join()
+
+    @property
+    def active_count(self) -> int:
+        with self._cond:
+            return len(self._tasks)
+
+    def _push(self, task: _PollTask, delay: float) -> None:
+        # 旧的堆条目通过 due 不一致被惰性丢弃
+        task.due = monotonic() + delay
+        heappush(self._heap, (task.due, next(self._seq), task))
+        self._cond.notify()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        # 每个线程有自己的停止标志，已停止但尚未退出的旧线程不会被唤回
+        self._stop = Event()
+        self._thread = Thread(target=self._loop, args=(self._stop,),
+                              name="polling-scheduler", daemon=True)
+        self._thread.start()
+
+    def _loop(self, stop: Event) -> None:
+        while True:
+            with self._cond:
+                if (task := self._next_due(stop)) is None:
+                    return
+            try:
+                self._run_step(partial(self._step, task), task.priority)
+            except RuntimeError as e:
+                # 线程池已关闭
+                self._finish(task, exception=e)
+
+    def _next_due(self, stop: Event) -> Optional[_PollTask]:
+        while True:
+            if stop.is_set():
+                return None
+            if not self._heap:
+                self._cond.wait()
+                continue
+            due, _, task = self._heap[0]
+            if task.done or task.running or task.due != due:
+                heappop(self._heap)
+                continue
+            if (delay := due - monotonic()) > 0:
+                self._cond.wait(delay)
+                continue
+            heappop(self._heap)
+            task.running = True
+            return task
+
+    def _step(self, task: _PollTask) -> None:
+        if task.done or task.future.done():
+            self._finish(task)
+            return
+        worker = task.worker
+        try:
+            result = worker.step(task.report_progress)
+        except BaseException as e:
+            self._finish(task, exception=e)
+            return
+        if not isinstance(result, PollAgain):
+            self._finish(task, result=result)
+            return
+        delay = worker.next_delay(result)
+        with self._cond:
+            task.running = False
+            if task.done:
+                return
+            self._push(task, 0.0 if task.woken else delay)
+            task.woken = False
+
+    def _finish(self, task: _PollTask, *, result: Any = None,
+                exception: Optional[BaseException] = None) -> None:
+        with self._cond:
+            task.done = True
+            task.running = False
+            self._tasks.discard(task)
+        task.worker.bind_waker(None)
+        try:
+            if exception is not None:
+                task.future.set_exception(exception)
+            else:
+                task.future.set_result(result)
+        except InvalidStateError:
+            # future 已被取消
+            pass
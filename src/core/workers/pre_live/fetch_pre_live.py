@@ -1,29 +1,44 @@
-from typing import Callable
+from typing import Callable, Optional
 
 # local package import
 from src.core import app_state
+from src.core.app_state import AccountContext
 # package import
 from src.core.log import get_logger
 from src.core.sign import livehime_sign, order_payload
-from src.core.workers.base import BaseWorker, Presenter
+from src.core.workers.base import BaseWorker, Presenter, SubmitPolicy
 from src.core.workers.live import StartLiveWorker
 
 
 class FetchPreLiveWorker(BaseWorker):
-    def __init__(self, presenter: Presenter, /):
-        super().__init__(name="PreLive信息", presenter=presenter)
+    submit_policy = SubmitPolicy.replace_pending()
+
+    def __init__(self, presenter: Presenter, /, *,
+                 context: Optional[AccountContext] = None,
+                 prefetch: bool = False):
+        """
+        :param presenter: Presenter of the result, or None.
+        :param context: Account to fetch, the GUI account by default.
+        :param prefetch: Only record the room and live status of a background
+            account. No startLive is sent for a live room and the global scan
+            flags are left alone; the stream address is fetched once the user
+            switches to the account.
+        """
+        super().__init__(name="PreLive信息", presenter=presenter,
+                         context=context)
+        self._prefetch = prefetch
         self.logger = get_logger(self.__class__.__name__)
 
     def _fetch_room_info(self):
         live_info_url = "https://api.live.bilibili.com/xlive/app-blink/v1/room/GetInfo"
-        info_data = livehime_sign({"uId": app_state.cookies_dict["DedeUserID"]})
+        info_data = livehime_sign({"uId": self.context.cookies["DedeUserID"]})
         info_data = order_payload(info_data)
         self.logger.info("live_info Request")
         response = self._session.get(live_info_url, params=info_data)
         response.encoding = "utf-8"
         self.logger.info("live_info Response")
         response = response.json()
-        app_state.room_info.update(
+        self.context.room_info.update(
             {
                 "room_id": response["data"]["room_id"],
                 "parent_area": response["data"]["parent_name"],
@@ -32,15 +47,25 @@ class FetchPreLiveWorker(BaseWorker):
             }
         )
         if response["data"]["live_status"] == 1:
-            app_state.stream_status["live_status"] = True
+            self.context.stream_status["live_status"] = True
+            if self._prefetch:
+                return
             # [0.3.4] fix fetch upstream
             # Here we choose to start live again because as observation of duplicate live
             # The API only returns a message="重复开播" with streaming address
             # Which seems like have no other side effect
             # Subject to change if there is an unknown side effect
             StartLiveWorker.start_live(self._session,
-                                       response["data"]["area_v2_id"])
-        app_state.scan_status["room_updated"] = True
+                                       response["data"]["area_v2_id"],
+                                       self.context,
+                                       submit=self._submit_task)
+        elif self.context.stream_status["live_status"]:
+            # 切换回缓存的账号时，直播可能已在别处关闭
+            self.context.stream_status.update({
+                "live_status": False, "stream_addr": None,
+                "stream_key": None})
+        if not self._prefetch:
+            app_state.scan_status["room_updated"] = True
 
     def run(self, report_progress: Callable | None, *args, **kwargs):
         url = "https://api.live.bilibili.com/xlive/app-blink/v1/preLive/PreLive"
@@ -59,7 +84,7 @@ class FetchPreLiveWorker(BaseWorker):
         self.logger.info("PreLive Response")
         response = response.json()
         self.logger.info(f"PreLive Result: {response}")
-        app_state.room_info.update({
+        self.context.room_info.update({
             "cover_audit_reason": response["data"]["cover"]["auditReason"],
             "cover_url": response["data"]["cover"]["url"],
             "cover_status": response["data"]["cover"]["auditStatus"],
@@ -0,0 +1 @@
+from .connection_prewarm import ConnectionPrewarmWorker
@@ -0,0 +1,48 @@
+# module import
+from typing import Callable
+
+# local package import
+from src.core import app_state
+from src.core.constant import HeadersType
+from src.core.exceptions import TaskCancelled
+from src.core.log import get_logger
+from src.core.workers.base import BaseWorker, SubmitPolicy
+
+
+class ConnectionPrewarmWorker(BaseWorker):
+    """
+    Opens keep-alive connections to the API hosts while the credentials are
+    still being read from the keyring, so the first nav, QR code and
+    startLive requests find a connected socket instead of paying DNS, TCP and
+    TLS on the critical path.
+    """
+    submit_policy = SubmitPolicy.coalesce()
+    account_bound = False
+    # (请求头类型, 地址)，与登录和开播路径上首个请求使用的连接池一致
+    TARGETS = (
+        (HeadersType.WEB, "https://api.bilibili.com/"),
+        (HeadersType.WEB, "https://passport.bilibili.com/"),
+        (HeadersType.APP, "https://api.live.bilibili.com/"),
+    )
+
+    def __init__(self):
+        super().__init__(name="连接预热", with_session=False)
+        self.logger = get_logger(self.__class__.__name__)
+
+    def run(self, report_progress: Callable | None, *args, **kwargs):
+        opened = sum(self.run_parallel(self._prewarm, self.TARGETS))
+        self.logger.info(f"{opened}/{len(self.TARGETS)} connections pre-warmed")
+
+    def _prewarm(self, target: tuple[HeadersType, str]) -> bool:
+        h_type, url = target
+        try:
+            return self.context.session_pool.prewarm(
+                h_type, app_state.app_settings["proxy_mode"],
+                app_state.app_settings.get("custom_proxy_url", ""), url,
+                token=self._cancel_token)
+        except TaskCancelled:
+            raise
+        except Exception as e:
+            # 预热失败不影响正常请求，稍后按需建立连接
+            self.logger.warning(f"pre-warming {url} failed: {e!r}")
+            return False
@@ -0,0 +1,154 @@
+import os
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from heapq import heappush, heappop
+from itertools import count
+from threading import Condition, Thread
+from typing import Callable
+
+from ..constant import WorkerPriority
+from ..log import get_logger
+
+
+@dataclass(slots=True, order=True)
+class _WorkItem:
+    priority: WorkerPriority
+    seq: int
+    future: Future = field(compare=False)
+    fn: Callable = field(compare=False)
+    args: tuple = field(compare=False)
+    kwargs: dict = field(compare=False)
+
+    def run(self) -> None:
+        if not self.future.set_running_or_notify_cancel():
+            return
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except BaseException as e:
+            self.future.set_exception(e)
+        else:
+            self.future.set_result(result)
+
+
+class PriorityExecutor:
+    """
+    Thread pool that serves queued jobs by ``WorkerPriority`` instead of FIFO.
+
+    ``max_workers`` general threads take the most urgent job available, while
+    ``reserved_workers`` extra threads only ever run ``CRITICAL`` jobs, so a
+    critical job starts immediately even when every general thread is busy
+    with background work. Jobs of the same priority keep their FIFO order.
+    """
+    _queue: list[_WorkItem]
+    _threads: list[Thread]
+
+    def __init__(self, max_workers: int | None = None,
+                 reserved_workers: int = 1,
+                 thread_name_prefix: str = "") -> None:
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        if max_workers <= 0:
+            raise ValueError("max_workers must be greater than 0")
+        if reserved_workers < 0:
+            raise ValueError("reserved_workers must not be negative")
+        self._max_workers = max_workers
+        self._max_reserved = reserved_workers
+        self._thread_name_prefix = thread_name_prefix or "PriorityExecutor"
+        self._queue = []
+        self._threads = []
+        self._seq = count()
+        self._cond = Condition()
+        self._general = 0
+        self._reserved = 0
+        self._idle_general = 0
+        self._idle_reserved = 0
+        self._shutdown = False
+        self.logger = get_logger(self.__class__.__name__)
+
+    def submit(self, fn: Callable, /, *args,
+               priority: WorkerPriority = WorkerPriority.INTERACTIVE,
+               **kwargs) -> Future:
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            future = Future()
+            heappush(self._queue, _WorkItem(priority, next(self._seq), future,
+                                            fn, args, kwargs))
+            self._adjust_threads(priority)
+            self._cond.notify_all()
+        return future
+
+    def queued(self) -> dict[WorkerPriority, int]:
+        """Number of jobs waiting for a thread, per priority."""
+        with self._cond:
+            result = {p: 0 for p in WorkerPriority}
+            for item in self._queue:
+                result[item.priority] += 1
+            return result
+
+    def shutdown(self, wait: bool = True, *,
+                 cancel_futures: bool = False) -> None:
+        with self._cond:
+            self._shutdown = True
+            cancelled = self._queue if cancel_futures else []
+            if cancel_futures:
+                self._queue = []
+            self._cond.notify_all()
+            threads = list(self._threads)
+        # 在锁外取消，done 回调可能会再次提交任务
+        for item in cancelled:
+            item.future.cancel()
+        if wait:
+            for t in threads:
+                t.join()
+
+    def _adjust_threads(self, priority: WorkerPriority) -> None:
+        # 空闲计数在线程取走任务时才减少，被唤醒但尚未取走任务的线程仍计为
+        # 空闲，因此与排队任务数比较，而不是只看有没有空闲线程
+        if len(self._queue) <= self._idle_general:
+            return
+        if self._general < self._max_workers:
+            self._spawn(reserved=False)
+        elif (priority == WorkerPriority.CRITICAL
+              and self._reserved < self._max_reserved
+              and sum(item.priority == WorkerPriority.CRITICAL
+                      for item in self._queue) > self._idle_reserved):
+            self._spawn(reserved=True)
+
+    def _spawn(self, *, reserved: bool) -> None:
+        if reserved:
+            self._reserved += 1
+            name = f"{self._thread_name_prefix}_critical_{self._reserved - 1}"
+        else:
+            self._general += 1
+            name = f"{self._thread_name_prefix}_{self._general - 1}"
+        # 退出时由 WorkerManager.shutdown 负责收尾
+        t = Thread(target=self._work, args=(reserved,), name=name, daemon=True)
+        self._threads.append(t)
+        t.start()
+
+    def _next_item(self, reserved: bool) -> _WorkItem | None:
+        with self._cond:
+            while True:
+                if self._queue and (
+                        not reserved
+                        or self._queue[0].priority == WorkerPriority.CRITICAL):
+                    return heappop(self._queue)
+                if self._shutdown:
+                    return None
+                if reserved:
+                    self._idle_reserved += 1
+                    self._cond.wait()
+                    self._idle_reserved -= 1
+                else:
+                    self._idle_general += 1
+                    self._cond.wait()
+                    self._idle_general -= 1
+
+    def _work(self, reserved: bool) -> None:
+        while (item := self._next_item(reserved)) is not None:
+            try:
+                item.run()
+            except BaseException:
+                self.logger.exception("Unhandled error in work item")
+            del item
@@ -1,8 +1,8 @@
 # package import
-from typing import Callable
+from typing import Callable, Optional
 
 # local package import
-from src.core import app_state
+from src.core.app_state import AccountContext
 from src.core.cache import get_cache_path
 from src.core.constant import CacheType
 from src.core.log import get_logger
@@ -10,15 +10,17 @@ from src.core.workers.base import BaseWorker, Presenter
 
 
 class LoadRecentTitleWorker(BaseWorker):
-    def __init__(self, presenter: Presenter, /):
+    def __init__(self, presenter: Presenter, /, *,
+                 context: Optional[AccountContext] = None):
         super().__init__(name="加载最近标题", with_session=False,
-                         presenter=presenter)
+                         presenter=presenter,
+                         context=context)
         self.logger = get_logger(self.__class__.__name__)
 
     def run(self, report_progress: Callable | None, *args, **kwargs):
         _, _title_file = get_cache_path(
             CacheType.CONFIG,
-            f"title{app_state.cookies_dict["DedeUserID"]}")
+            f"title{self.context.cookies['DedeUserID']}")
         if not _title_file.exists():
             return []
         with open(_title_file, "r", encoding="utf-8") as f:
@@ -1 +1,2 @@
 from .fetch_usernames import FetchUsernamesWorker
+from .username_cache import UsernameCache, username_cache
@@ -1,38 +1,61 @@
 # module import
 from json import loads
-from time import sleep
 from typing import Callable
 
-from keyring import get_password
-
 # local package import
 from src.core import app_state
+from src.core.app_state import AccountContext
 from src.core.constant import *
+from src.core.keystore import credential_store
 from src.core.log import get_logger
+from src.core.network import TokenBucket
 from src.core.sign import livehime_sign
-from src.core.workers.base import BaseWorker
+from src.core.workers.base import BaseWorker, SubmitPolicy
+from .username_cache import username_cache
 
 
 class FetchUsernamesWorker(BaseWorker):
+    priority = WorkerPriority.BACKGROUND
+    submit_policy = SubmitPolicy.coalesce()
+    account_bound = False
+    max_concurrent = 3
+    # 所有提交共用，与原先逐个间隔 1 秒一致，nav 请求整体不超过每秒 1 次
+    _limiter = TokenBucket(rate=1)
+
     def __init__(self, skip_user: str):
-        super().__init__(name="用户名更新", headers_type=HeadersType.WEB)
+        super().__init__(name="用户名更新", with_session=False)
         self._current_user = skip_user
         self.logger = get_logger(self.__class__.__name__)
 
     def run(self, report_progress: Callable | None, *args, **kwargs):
         if not app_state.scan_status["scanned"]:
             return
+        # 缓存未过期的用户名已在加载凭据时显示，只刷新过期的
+        keys = [key for key in app_state.usernames
+                if key != self._current_user
+                and not username_cache.is_fresh(key)]
+        if keys:
+            # 在共享线程池上并发，不另开线程池
+            resolved = sum(self.run_parallel(self._resolve, keys,
+                                             limit=self.max_concurrent))
+            self.logger.info(f"{resolved}/{len(keys)} usernames resolved")
+        username_cache.save()
+
+    def _resolve(self, key: str) -> bool:
+        if (cookies := credential_store.get(key)) is None or \
+                not self.wait(self._limiter.reserve()):
+            return False
+        # 每个账号使用独立的 Session，不修改共享的 Cookie
+        context = AccountContext(session_pool=app_state.session_pool, name=key)
+        context.cookies.update(loads(cookies))
+        # 早期版本把 refresh_token 存在 Cookie 里，不随请求发送
+        context.cookies.pop("refresh_token", None)
+        session = context.create_session(HeadersType.WEB)
+        session.bind_cancel_token(self._cancel_token)
         url = "https://api.bilibili.com/x/web-interface/nav"
-        for key in app_state.usernames:
-            if key == self._current_user or (
-                    cookies := get_password(KEYRING_SERVICE_NAME,
-                                            key)) is None:
-                continue
-            sleep(1)
-            cookies = loads(cookies)
+        try:
             self.logger.info(f"fetch username of {key} Request")
-            self._session.cookies.update(cookies)
-            response = self._session.get(
+            response = session.get(
                 url,
                 params=livehime_sign({},
                                      access_key=False,
@@ -41,10 +64,18 @@ class FetchUsernamesWorker(BaseWorker):
             response.encoding = "utf-8"
             self.logger.info(f"fetch username of {key} Response")
             response = response.json()
-            if response["code"] != 0:
-                continue
-            app_state.usernames[key] = USERNAME_DISPLAY_TEMPLATE.format(
-                response["data"]["uname"],
-                response["data"]["mid"]
-            )
-            self.logger.info(f"fetch username of {key} Completed")
+        except Exception as e:
+            self.logger.warning(f"fetch username of {key} failed: {e!r}")
+            return False
+        finally:
+            session.close()
+        if response["code"] != 0:
+            return False
+        name = USERNAME_DISPLAY_TEMPLATE.format(
+            response["data"]["uname"],
+            response["data"]["mid"]
+        )
+        app_state.usernames[key] = name
+        username_cache.put(key, name)
+        self.logger.info(f"fetch username of {key} Completed")
+        return True
@@ -0,0 +1,77 @@
+from json import dump, load
+from threading import Lock
+from time import time
+
+# local package import
+from src.core.cache import get_cache_path
+from src.core.constant import CacheType
+from src.core.log import get_logger
+
+
+class UsernameCache:
+    """
+    Display names of saved accounts, persisted in the config directory.
+
+    Names are shown in the account menu right away, whatever their age; only
+    names older than ``ttl`` seconds are resolved again in the background.
+    """
+    FILE_NAME = "usernames.json"
+
+    def __init__(self, ttl: float = 24 * 3600) -> None:
+        self.ttl = ttl
+        # cookie key -> (display name, resolved at)
+        self._entries: dict[str, tuple[str, float]] | None = None
+        self._dirty = False
+        self._lock = Lock()
+        self.logger = get_logger(self.__class__.__name__)
+
+    def _load(self) -> dict[str, tuple[str, float]]:
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        _, path = get_cache_path(CacheType.CONFIG, self.FILE_NAME,
+                                 is_makedir=False)
+        if path.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._entries = {key: (name, resolved_at)
+                                     for key, (name, resolved_at)
+                                     in load(f).items()}
+            except (OSError, ValueError, TypeError):
+                self.logger.exception(f"ignoring broken {path}")
+        return self._entries
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        with self._lock:
+            if (entry := self._load().get(key)) is None:
+                return default
+            return entry[0]
+
+    def is_fresh(self, key: str) -> bool:
+        with self._lock:
+            if (entry := self._load().get(key)) is None:
+                return False
+            return time() - entry[1] < self.ttl
+
+    def put(self, key: str, name: str) -> None:
+        with self._lock:
+            self._load()[key] = (name, time())
+            self._dirty = True
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            if self._load().pop(key, None) is not None:
+                self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            _, path = get_cache_path(CacheType.CONFIG, self.FILE_NAME)
+            with open(path, "w", encoding="utf-8") as f:
+                dump({key: list(entry) for key, entry in self._entries.items()},
+                     f, ensure_ascii=False)
+            self._dirty = False
+
+
+username_cache = UsernameCache()
@@ -0,0 +1,197 @@
+from concurrent.futures import CancelledError, Future
+from dataclasses import dataclass, field
+from threading import RLock
+from time import perf_counter
+from typing import Callable, Optional, Protocol
+
+from .base import BaseWorker
+from ..exceptions import TaskCancelled
+from ..log import get_logger
+
+
+class Submitter(Protocol):
+    def __call__(self, worker: BaseWorker, /, on_progress: bool = False,
+                 on_done: Callable[[Optional[BaseException]], None] | None = None
+                 ) -> Future:
+        ...
+
+
+@dataclass(slots=True)
+class StageTiming:
+    name: str
+    # seconds since the graph was started
+    submitted: float = 0.0
+    finished: float = 0.0
+    error: Optional[BaseException] = None
+    skipped: bool = False
+
+    @property
+    def elapsed(self) -> float:
+        return self.finished - self.submitted
+
+
+@dataclass(slots=True)
+class _Stage:
+    name: str
+    factory: Callable[[], BaseWorker]
+    after: tuple[str, ...]
+    on_progress: bool
+    timing: StageTiming
+    pending: set[str] = field(default_factory=set)
+    children: list[str] = field(default_factory=list)
+    done: bool = False
+
+
+class WorkerGraph:
+    """
+    Declarative dependency graph on top of ``WorkerManager``.
+
+    Stages without unfinished dependencies are submitted at once, a stage is
+    submitted as soon as everything it depends on has finished successfully,
+    and ``on_complete`` fires exactly once with per-stage timings. If a stage
+    fails its dependents are skipped; if any stage is cancelled (e.g. the
+    worker manager was restarted) the graph is abandoned without calling
+    ``on_complete``.
+    """
+    _stages: dict[str, _Stage]
+
+    def __init__(self, submit: Submitter, /, name: str, *,
+                 on_complete: Callable[[dict[str, StageTiming]], None]
+                 | None = None,
+                 on_stage_done: Callable[[StageTiming], None] | None = None):
+        self._submit = submit
+        self.name = name
+        self._on_complete = on_complete
+        self._on_stage_done = on_stage_done
+        self._stages = {}
+        self._remaining = 0
+        self._started_at = 0.0
+        self._started = False
+        self._aborted = False
+        self._lock = RLock()
+        self.logger = get_logger(self.__class__.__name__)
+
+    def add(self, name: str, factory: Callable[[], BaseWorker], /, *,
+            after: tuple[str, ...] = (),
+            on_progress: bool = False) -> "WorkerGraph":
+        if self._started:
+            raise RuntimeError(f"{self.name} already started")
+        if name in self._stages:
+            raise ValueError(f"Duplicated stage {name}")
+        for dep in after:
+            if dep not in self._stages:
+                raise ValueError(f"Unknown dependency {dep} for {name}")
+        self._stages[name] = _Stage(name, factory, after, on_progress,
+                                    StageTiming(name))
+        return self
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            self._started_at = perf_counter()
+            self._remaining = len(self._stages)
+            ready = []
+            for stage in self._stages.values():
+                stage.pending = set(stage.after)
+                for dep in stage.after:
+                    self._stages[dep].children.append(stage.name)
+                if not stage.pending:
+                    ready.append(stage)
+        self.logger.info(f"{self.name} started with {len(self._stages)} stages")
+        if not ready:
+            self._complete()
+            return
+        for stage in ready:
+            self._launch(stage)
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._aborted = True
+
+    def _now(self) -> float:
+        return perf_counter() - self._started_at
+
+    def _launch(self, stage: _Stage) -> None:
+        stage.timing.submitted = self._now()
+        try:
+            self._submit(stage.factory(), on_progress=stage.on_progress,
+                         on_done=lambda e, n=stage.name: self._stage_done(n, e))
+        except Exception as e:
+            self.logger.exception(f"{self.name}: failed to submit {stage.name}")
+            self._stage_done(stage.name, e)
+
+    def _stage_done(self, name: str, error: Optional[BaseException]) -> None:
+        with self._lock:
+            if self._aborted:
+                return
+            if isinstance(error, (TaskCancelled, CancelledError)):
+                self._aborted = True
+                self.logger.info(f"{self.name}: {name} cancelled, aborting")
+                return
+            stage = self._stages[name]
+            stage.done = True
+            stage.timing.finished = self._now()
+            stage.timing.error = error
+            self._remaining -= 1
+            ready: list[_Stage] = []
+            skipped: list[_Stage] = []
+            for child_name in stage.children:
+                child = self._stages[child_name]
+                if child.done:
+                    continue
+                if error is not None:
+                    skipped.append(child)
+                    continue
+                child.pending.discard(name)
+                if not child.pending:
+                    ready.append(child)
+        self._notify_stage(stage.timing)
+        for child in skipped:
+            self._skip(child)
+        for child in ready:
+            self._launch(child)
+        self._maybe_complete()
+
+    def _skip(self, stage: _Stage) -> None:
+        with self._lock:
+            if stage.done:
+                return
+            stage.done = True
+            stage.timing.skipped = True
+            stage.timing.submitted = stage.timing.finished = self._now()
+            self._remaining -= 1
+            children = [self._stages[c] for c in stage.children]
+        self.logger.info(f"{self.name}: {stage.name} skipped")
+        self._notify_stage(stage.timing)
+        for child in children:
+            self._skip(child)
+
+    def _notify_stage(self, timing: StageTiming) -> None:
+        if self._on_stage_done is None:
+            return
+        try:
+            self._on_stage_done(timing)
+        except Exception:
+            self.logger.exception(f"{self.name}: on_stage_done failed")
+
+    def _maybe_complete(self) -> None:
+        with self._lock:
+            if self._aborted or self._remaining > 0:
+                return
+            # 保证只触发一次
+            self._aborted = True
+        self._complete()
+
+    def _complete(self) -> None:
+        timings = {name: stage.timing for name, stage in self._stages.items()}
+        summary = ", ".join(
+            f"{t.name}={t.elapsed * 1000:.0f}ms"
+            + (" (skipped)" if t.skipped else "")
+            + (" (failed)" if t.error is not None else "")
+            for t in timings.values())
+        self.logger.info(
+            f"{self.name} finished in {self._now() * 1000:.0f}ms: {summary}")
+        if self._on_complete is not None:
+            self._on_complete(timings)
@@ -1,64 +1,293 @@
-from concurrent.futures import ThreadPoolExecutor, Future, CancelledError
-from threading import RLock
-from typing import Any
+from concurrent.futures import Future, CancelledError, InvalidStateError
+from contextlib import suppress
+from dataclasses import dataclass, field
+from functools import partial
+from threading import RLock, Timer
+from typing import Any, Callable, Optional
 
-from .base import BaseWorker, LongLiveWorker
+from .base import BaseWorker, LongLiveWorker, PollingWorker, SubmitMode
 from .dispatcher import Dispatcher
-from ..exceptions import TaskCancelled
+from .polling_scheduler import PollingScheduler
+from .priority_executor import PriorityExecutor
+from ..app_state import AccountContext
+from ..constant import WorkerPriority
+from ..exceptions import TaskCancelled, SubmissionDropped
 from ..log import get_logger
+from ..metrics import WorkerRecord, Outcome, worker_metrics, tracer
+from ..network import response_cache
+
+DoneCallback = Callable[[Optional[BaseException]], None]
+
+
+@dataclass(slots=True, eq=False)
+class _Submission:
+    worker: BaseWorker
+    on_progress: bool
+    priority: WorkerPriority
+    # 返回给调用方的 future，合并的提交共享同一次运行
+    futures: list[Future] = field(default_factory=list)
+    on_done: list[DoneCallback] = field(default_factory=list)
+    # 防抖计时结束前为 False
+    ready: bool = True
+
+
+@dataclass(slots=True, eq=False)
+class _TypeSlot:
+    current: Optional[Future] = None
+    held: Optional[_Submission] = None
+    timer: Optional[Timer] = None
+
+
+def _chain(source: Future, target: Future) -> None:
+    def copy(f: Future) -> None:
+        if f.cancelled():
+            target.cancel()
+            return
+        with suppress(InvalidStateError):
+            if (exc := f.exception()) is not None:
+                target.set_exception(exc)
+            else:
+                target.set_result(f.result())
+
+    source.add_done_callback(copy)
 
 
 class WorkerManager:
     _dispatcher: Dispatcher
-    _executor: ThreadPoolExecutor
+    _executor: PriorityExecutor
     _jobs: dict[Future, BaseWorker]
-    _worker_typeset: set[str]
+    _done_callbacks: dict[Future, list[DoneCallback]]
+    _records: dict[Future, WorkerRecord]
+    _slots: dict[tuple[str, int], _TypeSlot]
 
     def __init__(self, dispatcher: Dispatcher,
-                 max_workers: int | None = None) -> None:
+                 max_workers: int | None = None,
+                 reserved_workers: int = 1) -> None:
         self._dispatcher = dispatcher
         self._max_workers = max_workers
+        self._reserved_workers = reserved_workers
         self._executor = self._create_executor()
+        self._poller = PollingScheduler(self._submit_step)
         self._jobs: dict[Future, BaseWorker] = {}
-        self._worker_typeset: set[str] = set()
+        self._done_callbacks = {}
+        self._records = {}
+        self._slots = {}
         self._lock = RLock()
         self.logger = get_logger(self.__class__.__name__)
 
-    def _create_executor(self) -> ThreadPoolExecutor:
-        return ThreadPoolExecutor(
+    def _create_executor(self) -> PriorityExecutor:
+        executor = PriorityExecutor(
             max_workers=self._max_workers,
+            reserved_workers=self._reserved_workers,
             thread_name_prefix="backend-worker",
         )
+        # 响应缓存的后台刷新同样排在这个线程池里
+        response_cache.bind_executor(
+            partial(executor.submit, priority=WorkerPriority.BACKGROUND))
+        return executor
+
+    def _submit_step(self, fn, priority: WorkerPriority) -> Future:
+        return self._executor.submit(fn, priority=priority)
+
+    def _submit_task(self, priority: WorkerPriority, fn) -> Future:
+        # Worker 内部 run_parallel 的辅助任务，按所属提交的优先级排队
+        return self._executor.submit(fn, priority=priority)
 
     def submit(self, worker: BaseWorker, /,
-               on_progress: bool = False) -> Future:
-        if (worker_type := worker.__class__.__name__) in self._worker_typeset:
-            self.logger.warning(
-                f"Attempting to add {worker_type} but one already exists.")
-            raise RuntimeError(
-                f"Attempting to add {worker_type} but one already exists.")
+               on_progress: bool = False,
+               on_done: DoneCallback | None = None,
+               priority: WorkerPriority | None = None) -> Future:
+        """
+        Submits a worker to the thread pool.
 
-        future = self._executor.submit(self._run_worker, worker,
-                                       on_progress=on_progress)
-        self.logger.info(f"{worker_type} added to thread pool")
+        What happens when a worker of the same class is already queued or
+        running is decided by the worker's ``submit_policy``. Account-bound
+        workers only compete with workers of the same account:
+
+        - ``REJECT`` raises ``SubmissionDropped``.
+        - ``REPLACE_PENDING`` runs the latest submission once the active one
+          finishes; an older waiting submission is dropped.
+        - ``COALESCE`` merges the submission into the queued job, or into a
+          single rerun after the running one finishes.
+        - ``DEBOUNCE`` waits until no new submission arrived for the policy's
+          delay, then behaves like ``REPLACE_PENDING``.
+
+        A dropped submission's future fails with ``SubmissionDropped`` and its
+        ``on_done`` receives that exception; the worker's presenters are not
+        notified.
+
+        :param worker: The worker to run.
+        :param on_progress: Whether progress reports are forwarded to the
+            worker's presenters.
+        :param on_done: Optional callback invoked through the dispatcher after
+            the worker's own finish/exception handlers. It receives the raised
+            exception, or None on success.
+        :param priority: Queueing priority of the worker, defaults to the
+            worker's own ``priority``. Critical workers never wait behind
+            interactive or background ones.
+        :return: The future of the submission.
+        :raises SubmissionDropped: If the policy is ``REJECT`` and a worker of
+            the same class is already active.
+        """
+        worker_type = worker.__class__.__name__
+        policy = worker.submit_policy
+        if priority is None:
+            priority = worker.priority
+        callbacks = [on_done] if on_done is not None else []
+
+        with self._lock:
+            slot = self._slots.setdefault(self._slot_key(worker),
+                                          _TypeSlot())
+            busy = slot.current is not None or slot.held is not None
+            if policy.mode is SubmitMode.REJECT or (
+                    not busy and policy.mode is not SubmitMode.DEBOUNCE):
+                if busy:
+                    reason = "one is already queued or running"
+                    self.logger.warning(f"{worker_type} rejected: {reason}")
+                    worker.release()
+                    raise SubmissionDropped(worker_type, reason)
+                return self._launch(worker_type, slot, worker, on_progress,
+                                    priority, callbacks)
+
+            future = Future()
+            submission = _Submission(worker, on_progress, priority,
+                                     [future], callbacks)
+            match policy.mode:
+                case SubmitMode.REPLACE_PENDING:
+                    self._hold(worker_type, slot, submission,
+                               "replaced by a newer submission")
+                case SubmitMode.COALESCE:
+                    self._coalesce(worker_type, slot, submission)
+                case SubmitMode.DEBOUNCE:
+                    submission.ready = False
+                    self._hold(worker_type, slot, submission,
+                               "superseded within the debounce window")
+                    if slot.timer is not None:
+                        slot.timer.cancel()
+                    slot.timer = Timer(policy.delay, self._debounce_elapsed,
+                                       args=(worker_type, submission))
+                    slot.timer.daemon = True
+                    slot.timer.start()
+        return future
+
+    @staticmethod
+    def _slot_key(worker: BaseWorker) -> tuple[str, int]:
+        # 账号相关的 Worker 按账号分别套用提交策略，不同账号互不阻塞
+        return (worker.__class__.__name__,
+                id(worker.context) if worker.account_bound else 0)
+
+    def _launch(self, worker_type: str, slot: _TypeSlot, worker: BaseWorker,
+                on_progress: bool, priority: WorkerPriority,
+                on_done: list[DoneCallback]) -> Future:
+        record = WorkerRecord(worker_type, priority.name,
+                              trace_link=tracer.link())
+        worker.bind_record(record)
+        worker.bind_executor(partial(self._submit_task, priority))
+        if isinstance(worker, PollingWorker):
+            # 轮询任务不常驻线程，由调度器按需投递单次 step
+            future = Future()
+            self._poller.schedule(worker, future,
+                                  self._make_reporter(worker, on_progress),
+                                  priority)
+            self.logger.info(f"{worker_type} added to polling scheduler")
+        else:
+            future = self._executor.submit(self._run_worker, worker, record,
+                                           on_progress=on_progress,
+                                           priority=priority)
+            self.logger.info(
+                f"{worker_type} added to thread pool ({priority.name})")
 
         with self._lock:
-            self._worker_typeset.add(worker_type)
+            slot.current = future
             self._jobs[future] = worker
+            self._done_callbacks[future] = on_done
+            self._records[future] = record
             future.add_done_callback(self._handle_done)
         return future
 
-    def _run_worker(self, worker: BaseWorker | LongLiveWorker, /,
-                    on_progress: bool) -> Any:
-        if isinstance(worker, LongLiveWorker):
+    def _launch_held(self, worker_type: str, slot: _TypeSlot) -> None:
+        submission, slot.held = slot.held, None
+        try:
+            job = self._launch(worker_type, slot, submission.worker,
+                               submission.on_progress, submission.priority,
+                               submission.on_done)
+        except RuntimeError:
+            # 线程池已关闭
+            self._drop(worker_type, submission, "worker manager shut down")
+            return
+        for future in submission.futures:
+            _chain(job, future)
+
+    def _hold(self, worker_type: str, slot: _TypeSlot,
+              submission: _Submission, drop_reason: str) -> None:
+        if slot.held is not None:
+            self._drop(worker_type, slot.held, drop_reason)
+        slot.held = submission
+        if slot.current is not None:
+            self.logger.info(
+                f"{worker_type} deferred until the active one finishes")
+
+    def _coalesce(self, worker_type: str, slot: _TypeSlot,
+                  submission: _Submission) -> None:
+        current = slot.current
+        if slot.held is not None:
+            target, carrier = "pending rerun", slot.held
+            carrier.futures.extend(submission.futures)
+            carrier.on_done.extend(submission.on_done)
+        elif (current is not None and not current.running()
+              and not isinstance(self._jobs.get(current), PollingWorker)):
+            # 尚未开始运行，直接共享这次结果
+            target = "queued job"
+            for future in submission.futures:
+                _chain(current, future)
+            self._done_callbacks[current].extend(submission.on_done)
+        else:
+            slot.held = submission
+            self.logger.info(
+                f"{worker_type} will rerun once the running one finishes")
+            return
+        submission.worker.release()
+        self.logger.info(f"{worker_type} coalesced into the {target}")
+
+    def _drop(self, worker_type: str, submission: _Submission,
+              reason: str) -> None:
+        self.logger.info(f"{worker_type} submission dropped: {reason}")
+        submission.worker.release()
+        error = SubmissionDropped(worker_type, reason)
+        for future in submission.futures:
+            with suppress(InvalidStateError):
+                future.set_exception(error)
+        for on_done in submission.on_done:
+            self._dispatcher.post(on_done, error)
+
+    def _debounce_elapsed(self, worker_type: str,
+                          submission: _Submission) -> None:
+        with self._lock:
+            slot = self._slots.get(self._slot_key(submission.worker))
+            if slot is None or slot.held is not submission:
+                return
+            slot.timer = None
+            submission.ready = True
+            if slot.current is None:
+                self._launch_held(worker_type, slot)
+
+    def _run_worker(self, worker: BaseWorker | LongLiveWorker,
+                    record: WorkerRecord, /, on_progress: bool) -> Any:
+        with tracer.span(record.worker_type, "worker", link=record.trace_link,
+                         priority=record.priority) as span:
+            if span is not None:
+                record.span_id = span.id
             worker.raise_if_cancelled()
+            return worker.start(
+                report_progress=self._make_reporter(worker, on_progress))
 
+    def _make_reporter(self, worker: BaseWorker, on_progress: bool):
         def report_progress(*args, **kwargs) -> None:
             if not on_progress:
                 return
             self._dispatcher.post(worker.on_progress, *args, **kwargs)
 
-        return worker.start(report_progress=report_progress)
+        return report_progress
 
     def cancel(self, job_future: Future) -> bool:
         with self._lock:
@@ -69,31 +298,103 @@ class WorkerManager:
         worker.stop()
         return job_future.cancel()
 
+    def cancel_context(self, context: AccountContext) -> int:
+        """
+        Cancels the account-bound workers of ``context``, leaving the other
+        jobs and the thread pool untouched.
+
+        Waiting submissions are dropped; queued and running workers are
+        stopped and their presenters are not notified. Workers marked
+        ``survives_switch`` are left running, see ``surviving_workers``.
+
+        :param context: Account whose workers are cancelled.
+        :return: The number of cancelled jobs and submissions.
+        """
+
+        def owned(worker: BaseWorker) -> bool:
+            return worker.account_bound and not worker.survives_switch \
+                and worker.context is context
+
+        with self._lock:
+            jobs = [(f, w) for f, w in self._jobs.items() if owned(w)]
+            held = [(t, s) for t, s in self._slots.items()
+                    if s.held is not None and owned(s.held.worker)]
+            for (worker_type, _), slot in held:
+                if slot.timer is not None:
+                    slot.timer.cancel()
+                    slot.timer = None
+                submission, slot.held = slot.held, None
+                self._drop(worker_type, submission,
+                           f"account {context.name} deactivated")
+        for job_future, worker in jobs:
+            worker.stop()
+            job_future.cancel()
+        if jobs or held:
+            self.logger.info(f"{len(jobs) + len(held)} workers of account "
+                             f"{context.name} cancelled")
+        return len(jobs) + len(held)
+
+    def surviving_workers(self, context: AccountContext) -> list[BaseWorker]:
+        """
+        Active workers of ``context`` that ``cancel_context`` leaves running.
+
+        :param context: Account to look up.
+        :return: The queued, running or waiting ``survives_switch`` workers.
+        """
+        with self._lock:
+            workers = [*self._jobs.values(),
+                       *(s.held.worker for s in self._slots.values()
+                         if s.held is not None)]
+        return [w for w in workers
+                if w.survives_switch and w.context is context]
+
     def _handle_done(self, future: Future) -> None:
         with self._lock:
             worker = self._jobs.pop(future, None)
+            on_done = self._done_callbacks.pop(future, [])
+            record = self._records.pop(future, None)
             if worker is None:
                 return
             worker_name = worker.__class__.__name__
-            self._worker_typeset.discard(worker_name)
+            slot_key = self._slot_key(worker)
+            slot = self._slots.get(slot_key)
+            if slot is not None and slot.current is future:
+                slot.current = None
+                if slot.held is None:
+                    del self._slots[slot_key]
+                elif slot.held.ready:
+                    self._launch_held(worker_name, slot)
 
         def finalize() -> None:
+            error: Optional[BaseException] = None
+            try:
+                error = _finalize_worker()
+            finally:
+                for callback in on_done:
+                    try:
+                        callback(error)
+                    except Exception:
+                        self.logger.exception(
+                            f"{worker_name} on_done failed:")
+
+        def _finalize_worker() -> Optional[BaseException]:
             # future canceled before start
             if future.cancelled():
-                return
+                return CancelledError()
 
             try:
                 result = future.result()
                 self.logger.info(
                     f"{worker_name} finished with result: {result!r}")
-            except (TaskCancelled, CancelledError):
-                pass
+            except (TaskCancelled, CancelledError) as e:
+                return e
             except Exception as e:
                 self.logger.exception(f"{worker_name} failed")
                 try:
                     worker.on_exception(e)
                 except Exception:
                     self.logger.exception(f"{worker_name} on_exception failed:")
+                return e
             else:
                 if result is None:
                     worker.on_finished()
@@ -101,22 +402,68 @@ class WorkerManager:
                     worker.on_finished(*result)
                 else:
                     worker.on_finished(result)
+            return None
 
-        self._dispatcher.post(finalize)
+        finalize.__qualname__ = f"{worker_name}.finalize"
+        # 让界面线程上的后续处理挂在该任务之下
+        with tracer.span(f"{worker_name} done", "worker",
+                         parent=record.span_id if record else None):
+            self._dispatcher.post(finalize)
+        if record is None:
+            self.logger.info(f"{worker_name} removed from thread pool")
+            return
+        self._finish_record(record, future)
         self.logger.info(
-            f"{worker_name} removed from thread pool")
+            f"{worker_name} removed from thread pool ({record.outcome}, "
+            f"queued {record.queue_wait * 1000:.0f}ms, "
+            f"ran {record.run_time * 1000:.0f}ms, "
+            f"http {record.http_time * 1000:.0f}ms "
+            f"in {record.http_calls} calls)")
+
+    @staticmethod
+    def _finish_record(record: WorkerRecord, future: Future) -> None:
+        if future.cancelled():
+            record.outcome = Outcome.CANCELLED
+        elif (error := future.exception()) is None:
+            record.outcome = Outcome.OK
+            record.detail = repr(future.result())[:200]
+        else:
+            record.outcome = Outcome.CANCELLED if isinstance(
+                error, (TaskCancelled, CancelledError)) else Outcome.FAILED
+            record.detail = repr(error)[:200]
+        worker_metrics.finish(record)
 
     def shutdown(self, cancel_running: bool = True, wait: bool = True) -> None:
+        with self._lock:
+            slots = list(self._slots.items())
+            for (worker_type, _), slot in slots:
+                if slot.timer is not None:
+                    slot.timer.cancel()
+                    slot.timer = None
+                if slot.held is not None:
+                    submission, slot.held = slot.held, None
+                    self._drop(worker_type, submission,
+                               "worker manager shut down")
         if cancel_running:
-            for job_future in list(self._jobs.keys()):
-                self.cancel(job_future)
+            with self._lock:
+                jobs = list(self._jobs.items())
+            # 所有 Worker 都会中断进行中的请求，线程池可以立即退出
+            for job_future, worker in jobs:
+                worker.stop()
+                job_future.cancel()
+            self._poller.clear()
+        # 先停下调度线程，不再向即将关闭的线程池提交
+        self._poller.shutdown(wait=wait)
 
+        response_cache.bind_executor(None)
         self._executor.shutdown(wait=wait, cancel_futures=True)
 
     def restart(self, cancel_running: bool = True) -> None:
         self.shutdown(cancel_running)
         self._jobs.clear()
-        self._worker_typeset.clear()
+        self._done_callbacks.clear()
+        self._records.clear()
+        self._slots.clear()
 
         self._executor = self._create_executor()
         self.logger.info("Worker manager restarted")
@@ -0,0 +1,2 @@
+from .daemon import HeadlessDaemon
+from .dispatcher import QueueDispatcher
@@ -0,0 +1,246 @@
+import signal
+from concurrent.futures import Future
+from ipaddress import ip_address, IPv6Address
+from logging import StreamHandler
+from threading import Condition
+from typing import Callable, Optional
+
+from src.core import app_state
+from src.core.constant import VERSION, WorkerPriority
+from src.core.keystore import credential_store
+from src.core.log import ThreadClassFormatter, get_logger, init_logger
+from src.core.network import adaptive_timeouts
+from src.core.workers import WorkerManager, WorkerGraph, StageTiming
+from src.core.workers.announce import FetchAnnounceWorker
+from src.core.workers.area import FetchAreaWorker, FetchRecentAreaWorker
+from src.core.workers.base import BaseWorker
+from src.core.workers.const import ConstantUpdateWorker
+from src.core.workers.credentials import CredentialManagerWorker
+from src.core.workers.live import StartLiveWorker, StopLiveWorker
+from src.core.workers.login import TicketFetchWorker, \
+    CredentialRefreshWorker
+from src.core.workers.obs_ws import ObsConnectorWorker, ObsDaemonWorker
+from src.core.workers.pre_live import FetchRoomStatusWorker, \
+    FetchPreLiveWorker
+from src.core.workers.prewarm import ConnectionPrewarmWorker
+from src.core.workers.usernames import FetchUsernamesWorker
+from .dispatcher import QueueDispatcher
+from .presenters import HeadlessPresenter, ErrorLogPresenter, \
+    CredentialPresenter, TicketFetchPresenter, ConstantUpdatePresenter, \
+    StartLivePresenter, StopLivePresenter, ObsConnectorPresenter
+from .web_server import HeadlessHttpServer
+
+
+class HeadlessDaemon:
+    """
+    Drives the core workers without Qt.
+
+    The main thread runs a ``QueueDispatcher`` in place of the Qt event loop;
+    presenters only log and chain the next worker. After the stored
+    credential is loaded and the post-login graph finishes, live streaming is
+    controlled through the same HTTP API as the GUI.
+    """
+    _server: Optional[HeadlessHttpServer]
+
+    def __init__(self, host: Optional[str], port: Optional[int], /,
+                 no_const_update: bool = False):
+        self._host = host
+        self._port = port
+        self._no_const_update = no_const_update
+        self._exit_code = 0
+        # 代替界面上开播/下播按钮的可用状态
+        self._live = False
+        self._ready = False
+        self._cond = Condition()
+        self._server = None
+        self._error_presenter = ErrorLogPresenter()
+        self._dispatcher = QueueDispatcher()
+        self._thread_manager = WorkerManager(self._dispatcher)
+        self.logger = get_logger(self.__class__.__name__)
+
+    @staticmethod
+    def init_logger() -> None:
+        logger = init_logger()
+        console = StreamHandler()
+        console.setFormatter(ThreadClassFormatter(
+            "%(asctime)s [%(threadClassName)s] - %(message)s",
+            "%Y-%m-%d %H:%M:%S"))
+        logger.addHandler(console)
+
+    def run(self) -> int:
+        self.logger.info(f"App {VERSION} started headless with "
+                         f"host={self._host}, port={self._port}")
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: self.quit(0))
+        self.submit(ConnectionPrewarmWorker())
+        self.submit(CredentialManagerWorker(
+            CredentialPresenter(self),
+            app_state.cookie_state.current_cookie_idx))
+        try:
+            self._dispatcher.run_forever()
+        finally:
+            self._shutdown()
+        return self._exit_code
+
+    def post(self, fn, /, *args, **kwargs) -> None:
+        self._dispatcher.post(fn, *args, **kwargs)
+
+    def quit(self, code: int = 0) -> None:
+        self._exit_code = code
+        self._dispatcher.close()
+
+    def submit(self, worker: BaseWorker, /,
+               on_progress: bool = False,
+               on_done: Callable[[Optional[BaseException]], None]
+               | None = None,
+               priority: WorkerPriority | None = None) -> Future:
+        worker.add_presenter(self._error_presenter)
+        return self._thread_manager.submit(worker, on_progress=on_progress,
+                                           on_done=on_done, priority=priority)
+
+    def on_credential_loaded(self) -> None:
+        if not app_state.scan_status["scanned"]:
+            self.logger.error("没有可用的登录凭据，请先在图形界面中扫码登录")
+            self.quit(1)
+            return
+        self.submit(FetchUsernamesWorker(
+            app_state.cookie_indices[app_state.cookie_state.current_cookie_idx]
+        ))
+        bootstrap = WorkerGraph(self.submit, "post-login",
+                                on_complete=self._on_bootstrap_finished)
+        if self._no_const_update:
+            app_state.scan_status["const_updated"] = True
+        else:
+            bootstrap.add("const", lambda: ConstantUpdateWorker(
+                ConstantUpdatePresenter()))
+        bootstrap.add(
+            "ticket", lambda: TicketFetchWorker(TicketFetchPresenter()))
+        bootstrap.add("room_status", FetchRoomStatusWorker)
+        bootstrap.add("pre_live",
+                      lambda: FetchPreLiveWorker(HeadlessPresenter()))
+        bootstrap.add("announce",
+                      lambda: FetchAnnounceWorker(HeadlessPresenter()))
+        if app_state.area_catalog.load_cached():
+            app_state.scan_status["area_updated"] = True
+            self.submit(FetchAreaWorker(HeadlessPresenter()),
+                        priority=WorkerPriority.BACKGROUND)
+        else:
+            bootstrap.add("area",
+                          lambda: FetchAreaWorker(HeadlessPresenter()))
+        bootstrap.add("recent_area", FetchRecentAreaWorker, after=("pre_live",))
+        bootstrap.start()
+
+    def _on_bootstrap_finished(self, timings: dict[str, StageTiming]) -> None:
+        if not app_state.scan_status["room_updated"]:
+            self.logger.error("房间信息获取失败，退出")
+            self.quit(1)
+            return
+        self._ready = True
+        self._live = app_state.stream_status["live_status"]
+        self.submit(CredentialRefreshWorker(), on_progress=True)
+        self.logger.info(
+            f"room {app_state.room_info['room_id']} ready, "
+            f"area={app_state.room_info['area']}, live={self._live}")
+        if app_state.obs_settings.get("auto_connect", False):
+            self.connect_obs()
+        if self._host is not None and self._port is not None:
+            self._server = HeadlessHttpServer(self, self._host, self._port)
+            try:
+                self._server.start()
+            except OSError as e:
+                self.logger.error(f"HTTP Server failed to start: {e!r}")
+                self._server = None
+                self.quit(1)
+                return
+        if app_state.app_settings["auto_start_live"] and not self._live:
+            self.start_live()
+
+    def set_live(self, live: bool) -> None:
+        self._live = live
+
+    def status(self) -> dict:
+        return {
+            "ready": self._ready,
+            "live": self._live,
+            "room_id": app_state.room_info["room_id"],
+            "parent_area": app_state.room_info["parent_area"],
+            "area": app_state.room_info["area"],
+            "obs_connected": app_state.obs_client is not None,
+        }
+
+    def start_live(self, area: Optional[str] = None) -> None:
+        if not self._ready or self._live:
+            self.logger.warning("startLive ignored: "
+                                + ("living" if self._ready else "not ready"))
+            return
+        if area:
+            if area not in app_state.area_catalog:
+                self.logger.error(f"startLive ignored: unknown area {area}")
+                return
+            app_state.room_info["parent_area"] = \
+                app_state.area_catalog.parent_of(area)
+            app_state.room_info["area"] = area
+            app_state.room_info["area_code"] = app_state.area_catalog.code(area)
+        self._live = True
+        if app_state.obs_settings.get("auto_connect",
+                                      False) and app_state.obs_client is None:
+            self.connect_obs()
+        self.submit(StartLiveWorker(
+            StartLivePresenter(self, cond=self._cond),
+            area=app_state.room_info["area_code"]), on_progress=True)
+
+    def stop_live(self) -> None:
+        if not self._ready or not self._live:
+            self.logger.warning("stopLive ignored: not living")
+            return
+        self._live = False
+        app_state.stream_status["stream_key"] = None
+        app_state.stream_status["stream_addr"] = None
+        if app_state.obs_client is not None and \
+                app_state.obs_settings.get("auto_live", False):
+            ObsDaemonWorker.request("StopStream", {})
+        self.submit(StopLiveWorker(StopLivePresenter(self)), on_progress=True)
+
+    def fill_stream_info(self, addr: str, key: str) -> None:
+        self.logger.info(f"stream address ready: {addr}")
+        if app_state.obs_client is None:
+            return
+        ObsDaemonWorker.request("SetStreamServiceSettings", {
+            "streamServiceType": "rtmp_custom",
+            "streamServiceSettings": {
+                "bwtest": False,
+                "server": str(addr),
+                "key": str(key),
+                "use_auth": False
+            }
+        })
+        if app_state.obs_settings.get("auto_live", False):
+            ObsDaemonWorker.request("StartStream", {})
+
+    def connect_obs(self) -> None:
+        if app_state.obs_client is not None or app_state.obs_op:
+            return
+        obs_host = app_state.obs_settings.get("ip_addr", "localhost")
+        try:
+            if isinstance(ip_address(obs_host), IPv6Address):
+                obs_host = f"[{obs_host}]"
+        except ValueError:
+            pass
+        self.submit(ObsConnectorWorker(
+            ObsConnectorPresenter(self, self._cond),
+            host=obs_host,
+            port=app_state.obs_settings.get("port", "4455"),
+            password=app_state.obs_settings.get("password", ""),
+            cond=self._cond))
+
+    def _shutdown(self) -> None:
+        self.logger.info("Shutting down.")
+        if self._server is not None:
+            self._server.stop()
+            self._server = None
+        self._thread_manager.shutdown(wait=True)
+        credential_store.flush()
+        adaptive_timeouts.save()
+        if app_state.obs_client is not None:
+            ObsDaemonWorker.disconnect_obs()
+        self.logger.info("Application closed.")
@@ -0,0 +1,47 @@
+import sys
+from functools import partial
+from queue import SimpleQueue
+
+from src.core.metrics import tracer
+
+_STOP = object()
+
+
+class QueueDispatcher:
+    """
+    Thread-queue counterpart of ``GUIDispatcher`` for running without Qt.
+
+    Callables posted from any thread are queued and executed one by one by
+    the thread that calls ``run_forever``, so presenters see the same
+    single-threaded view of ``app_state`` as on the GUI thread.
+    """
+
+    def __init__(self) -> None:
+        self._alive = True
+        self._queue = SimpleQueue()
+
+    def close(self) -> None:
+        self._alive = False
+        self._queue.put(_STOP)
+
+    def post(self, fn, /, *args, **kwargs) -> None:
+        if not self._alive:
+            return
+        self._queue.put((partial(fn, *args, **kwargs), tracer.link()))
+
+    def run_forever(self) -> None:
+        """Runs posted callables until ``close`` is called."""
+        while (item := self._queue.get()) is not _STOP:
+            if not self._alive:
+                break
+            fn, link = item
+            try:
+                if link is None:
+                    fn()
+                    continue
+                with tracer.span(getattr(fn.func, "__qualname__",
+                                         repr(fn.func)), "gui", link=link):
+                    fn()
+            except Exception:
+                # 与 GUI 线程中槽函数抛出异常时的行为一致
+                sys.excepthook(*sys.exc_info())
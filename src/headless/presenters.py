@@ -0,0 +1,139 @@
+from threading import Condition
+
+from src.core import app_state
+from src.core.constant import FaceAuthType
+from src.core.exceptions.WorkerException import WorkerException
+from src.core.log import get_logger
+from src.core.network import HedgeProgress
+from src.core.workers.base import Presenter
+from src.core.workers.credentials import CredentialManagerWorker
+from src.core.workers.live import ReportLiveDataWorker
+from src.core.workers.obs_ws import ObsDaemonWorker
+
+
+class HeadlessPresenter(Presenter):
+    """Presenter with nothing to show; failures are logged by
+    ``ErrorLogPresenter``, which the daemon attaches to every worker."""
+
+    def prepare_success_view(self, *args, **kwargs): ...
+
+    def prepare_fail_view(self, exception: Exception): ...
+
+    def prepare_progress_view(self, *args, **kwargs): ...
+
+
+class ErrorLogPresenter(HeadlessPresenter):
+    def __init__(self):
+        super().__init__()
+        self.logger = get_logger(self.__class__.__name__)
+
+    def prepare_fail_view(self, exception: WorkerException):
+        self.logger.error(f"{exception.name}线程错误: "
+                          f"{exception.real_exc!r}")
+
+
+class CredentialPresenter(HeadlessPresenter):
+    def __init__(self, daemon: "HeadlessDaemon"):
+        super().__init__()
+        self._daemon = daemon
+
+    def prepare_success_view(self, cookie_index: int):
+        self._daemon.on_credential_loaded()
+
+    def prepare_fail_view(self, exception: Exception):
+        self._daemon.quit(1)
+
+
+class TicketFetchPresenter(HeadlessPresenter):
+    def prepare_success_view(self):
+        CredentialManagerWorker.add_cookie(True)
+
+
+class ConstantUpdatePresenter(HeadlessPresenter):
+    def prepare_success_view(self):
+        app_state.scan_status["const_updated"] = True
+
+    def prepare_fail_view(self, exception: Exception):
+        app_state.scan_status["const_updated"] = True
+
+
+class StartLivePresenter(HeadlessPresenter):
+    def __init__(self, daemon: "HeadlessDaemon", /, cond: Condition):
+        super().__init__()
+        self._daemon = daemon
+        self._cond = cond
+        self.logger = get_logger(self.__class__.__name__)
+
+    def prepare_success_view(self, live_result):
+        self._daemon.submit(ReportLiveDataWorker())
+        match live_result:
+            case 0 | 1:
+                if live_result == 1:
+                    self.logger.warning("没有检测到可用的SRT服务器，已切换到RTMP协议")
+                with self._cond:
+                    while app_state.obs_connecting:
+                        self._cond.wait()
+                self._daemon.fill_stream_info(
+                    app_state.stream_status["stream_addr"],
+                    app_state.stream_status["stream_key"])
+            case -1:
+                self.logger.warning("没有检测到可用的SRT服务器，已停止直播")
+                self._daemon.stop_live()
+            case FaceAuthType.V1 | FaceAuthType.V2:
+                # 人脸认证需要扫码，无界面模式下只能交给图形界面完成
+                app_state.stream_status["required_face"] = False
+                self._daemon.set_live(False)
+                self.logger.error(
+                    f"开播需要人脸认证({live_result!r})，请在图形界面中完成: "
+                    f"{app_state.stream_status['face_url']}")
+
+    def prepare_fail_view(self, exception: Exception):
+        self._daemon.set_live(False)
+
+    def prepare_progress_view(self, progress: HedgeProgress):
+        if progress.attempt > 1:
+            self.logger.warning(
+                f"startLive 第 {progress.attempt}/{progress.attempts} 次请求，"
+                f"剩余 {progress.remaining:.1f} 秒")
+
+
+class StopLivePresenter(HeadlessPresenter):
+    def __init__(self, daemon: "HeadlessDaemon"):
+        super().__init__()
+        self._daemon = daemon
+        self.logger = get_logger(self.__class__.__name__)
+
+    def prepare_fail_view(self, exception: Exception):
+        self._daemon.set_live(True)
+
+    def prepare_progress_view(self, progress: HedgeProgress):
+        if progress.attempt > 1:
+            self.logger.warning(
+                f"stopLive 第 {progress.attempt}/{progress.attempts} 次请求，"
+                f"剩余 {progress.remaining:.1f} 秒")
+
+
+class ObsConnectorPresenter(HeadlessPresenter):
+    def __init__(self, daemon: "HeadlessDaemon", cond: Condition):
+        super().__init__()
+        self._daemon = daemon
+        self._cond = cond
+        self.logger = get_logger(self.__class__.__name__)
+
+    def prepare_success_view(self):
+        if app_state.obs_client is not None:
+            self.logger.info("OBS connected")
+            self._daemon.submit(ObsDaemonWorker(ObsDaemonPresenter()))
+
+    def prepare_fail_view(self, exception: Exception):
+        self.logger.error(f"OBS connect failed.")
+        with self._cond:
+            app_state.obs_op = False
+            app_state.obs_connecting = False
+            self._cond.notify_all()
+
+
+class ObsDaemonPresenter(HeadlessPresenter):
+    def prepare_success_view(self):
+        if app_state.obs_client is not None:
+            ObsDaemonWorker.disconnect_obs()
@@ -0,0 +1,90 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps, loads, JSONDecodeError
+from threading import Thread
+from typing import Callable, Optional
+
+from src.core.log import get_logger
+
+
+class HeadlessHttpServer:
+    """
+    Same HTTP API as the GUI's ``HttpServerWorker`` on a plain thread.
+
+    ``POST /api/startLive`` and ``POST /api/stopLive`` post the daemon's
+    handlers to the dispatcher; ``startLive`` optionally takes a JSON body
+    ``{"area": "<分区名>"}``. ``GET /api/status`` returns the daemon status.
+    """
+    httpd: Optional[ThreadingHTTPServer]
+
+    def __init__(self, daemon: "HeadlessDaemon", host="localhost", port=8080):
+        self.host = host
+        self.port = port
+        self.httpd = None
+        self._daemon = daemon
+        self._thread: Optional[Thread] = None
+        self.logger = get_logger(self.__class__.__name__)
+
+    def start(self) -> None:
+        self.httpd = ThreadingHTTPServer((self.host, self.port),
+                                         self.make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = Thread(target=self.httpd.serve_forever,
+                              name="headless-http", daemon=True)
+        self._thread.start()
+        self.logger.info(
+            f"HTTP Server running on http://{self.host}:{self.port}")
+
+    def make_handler(self):
+        daemon = self._daemon
+        logger = self.logger
+
+        class DispatchHandler(BaseHTTPRequestHandler):
+            triggers: dict[str, Callable[[dict], None]] = {
+                "/api/startLive":
+                    lambda body: daemon.post(daemon.start_live,
+                                             body.get("area")),
+                "/api/stopLive": lambda body: daemon.post(daemon.stop_live),
+            }
+
+            def do_POST(self):
+                if (trigger := self.triggers.get(self.path)) is None:
+                    self._reply(404, b"Not Found.")
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = loads(self.rfile.read(length)) if length else {}
+                except (JSONDecodeError, UnicodeDecodeError):
+                    self._reply(400, b"Bad Request.")
+                    return
+                if not isinstance(body, dict):
+                    body = {}
+                logger.info(f"Server received request {self.path}")
+                trigger(body)
+                self._reply(200, b"OK")
+
+            def do_GET(self):
+                if self.path != "/api/status":
+                    self._reply(404, b"Not Found.")
+                    return
+                self._reply(200, dumps(daemon.status(), ensure_ascii=False)
+                            .encode("utf-8"), "application/json")
+
+            def _reply(self, code: int, payload: bytes,
+                       content_type: str = "text/plain") -> None:
+                self.send_response(code)
+                self.send_header("Content-Type",
+                                 f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format_s, *args):
+                logger.info(format_s % args)
+
+        return DispatchHandler
+
+    def stop(self):
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
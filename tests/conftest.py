@@ -0,0 +1,74 @@
+import os
+import sys
+from pathlib import Path
+
+import keyring
+import pytest
+from keyring.backend import KeyringBackend
+from keyring.errors import PasswordDeleteError
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("PYTHON_KEYRING_BACKEND",
+                      "keyrings.alt.file.PlaintextKeyring")
+
+from src.core.cache import _cache_dir  # noqa: E402
+from src.core.constant import CacheType  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keeps every test away from the user's real config and log files."""
+    monkeypatch.setitem(_cache_dir, CacheType.CONFIG, tmp_path / "config")
+    monkeypatch.setitem(_cache_dir, CacheType.LOGS, tmp_path / "logs")
+    return tmp_path
+
+
+class ImmediateDispatcher:
+    """Dispatcher that runs posted callables on the calling thread."""
+
+    def close(self) -> None:
+        pass
+
+    def post(self, fn, /, *args, **kwargs) -> None:
+        fn(*args, **kwargs)
+
+
+@pytest.fixture
+def dispatcher() -> ImmediateDispatcher:
+    return ImmediateDispatcher()
+
+
+class MemoryKeyring(KeyringBackend):
+    """Keyring kept in a dict, so tests never touch the real one."""
+    priority = 1
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.entries: dict[tuple[str, str], str] = {}
+        self.calls = 0
+
+    def get_password(self, service, username):
+        self.calls += 1
+        return self.entries.get((service, username))
+
+    def set_password(self, service, username, password):
+        self.calls += 1
+        self.entries[(service, username)] = password
+
+    def delete_password(self, service, username):
+        self.calls += 1
+        if self.entries.pop((service, username), None) is None:
+            raise PasswordDeleteError(username)
+
+
+@pytest.fixture
+def backend():
+    previous = keyring.get_keyring()
+    backend = MemoryKeyring()
+    keyring.set_keyring(backend)
+    yield backend
+    keyring.set_keyring(previous)
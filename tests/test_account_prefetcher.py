@@ -0,0 +1,66 @@
+from concurrent.futures import Future
+
+import pytest
+
+from src.core import app_state
+from src.core.workers import AccountPrefetcher
+
+
+class InlineSubmitter:
+    """Finishes every stage at once without running it."""
+
+    def __init__(self):
+        self.workers = []
+
+    def __call__(self, worker, /, on_progress=False, on_done=None,
+                 priority=None):
+        self.workers.append(worker)
+        on_done(None)
+        return Future()
+
+
+class HeldSubmitter(InlineSubmitter):
+    """Keeps every stage running until the test finishes it."""
+
+    def __call__(self, worker, /, on_progress=False, on_done=None,
+                 priority=None):
+        self.workers.append((worker, on_done))
+        return Future()
+
+
+@pytest.fixture(autouse=True)
+def account_contexts(monkeypatch):
+    contexts = {}
+    monkeypatch.setattr(app_state, "account_contexts", contexts)
+    return contexts
+
+
+def test_finished_once_every_account_is_fetched(account_contexts):
+    finished, ready = [], []
+    prefetcher = AccountPrefetcher(InlineSubmitter(), ["a", "b", "c"],
+                                   on_ready=ready.append,
+                                   on_finished=lambda: finished.append(1))
+    prefetcher.start()
+    assert ready == ["a", "b", "c"]
+    assert set(account_contexts) == {"a", "b", "c"}
+    assert finished == [1]
+
+
+def test_finished_at_once_without_accounts_to_fetch():
+    finished = []
+    AccountPrefetcher(InlineSubmitter(), [],
+                      on_finished=lambda: finished.append(1)).start()
+    assert finished == [1]
+
+
+def test_cancelled_prefetch_never_finishes():
+    submit, finished = HeldSubmitter(), []
+    prefetcher = AccountPrefetcher(submit, ["a", "b", "c"],
+                                   on_finished=lambda: finished.append(1))
+    prefetcher.start()
+    # 最多两个账号同时预取，各自先加载 Cookie
+    assert len(submit.workers) == 2
+    prefetcher.cancel()
+    for _, on_done in submit.workers:
+        on_done(None)
+    assert finished == []
@@ -0,0 +1,106 @@
+from concurrent.futures import CancelledError
+from threading import Event
+
+import pytest
+
+from src.core import app_state
+from src.core.app_state import AccountContext
+from src.core.exceptions import SubmissionDropped, TaskCancelled
+from src.core.workers.base import BaseWorker, SubmitPolicy
+from src.core.workers.live import StartLiveWorker, StopLiveWorker
+from src.core.workers.worker_manager import WorkerManager
+
+
+@pytest.fixture
+def contexts(monkeypatch):
+    for name in ("default_context", "cookies_dict", "room_info",
+                 "stream_status"):
+        monkeypatch.setattr(app_state, name, getattr(app_state, name))
+    first, second = (AccountContext(session_pool=app_state.session_pool,
+                                    name=f"cookies|{uid}")
+                     for uid in (1, 2))
+    for context in (first, second):
+        monkeypatch.setitem(app_state.account_contexts, context.name, context)
+    return first, second
+
+
+class Blocking(BaseWorker):
+    def __init__(self, context, gate):
+        super().__init__(name="blocking", with_session=False,
+                         context=context)
+        self.gate = gate
+        self.started = Event()
+
+    def run(self, report_progress, *args, **kwargs):
+        self.started.set()
+        while not self.gate.wait(0.01):
+            self.raise_if_cancelled()
+
+
+class Unbound(Blocking):
+    account_bound = False
+
+
+class Replacing(Blocking):
+    submit_policy = SubmitPolicy.replace_pending()
+
+
+class Live(Blocking):
+    survives_switch = True
+
+
+@pytest.fixture
+def manager(dispatcher):
+    manager = WorkerManager(dispatcher, max_workers=8, reserved_workers=0)
+    yield manager
+    manager.shutdown()
+
+
+def test_activate_swaps_in_the_cached_context(contexts):
+    first, second = contexts
+    first.room_info["room_id"] = 100
+    assert app_state.activate_context(first.name) is first
+    assert app_state.room_info is first.room_info
+    assert app_state.activate_context(second.name) is second
+    assert app_state.stream_status is second.stream_status
+    assert app_state.cookies_dict is second.cookies
+    # 切回时缓存的状态仍在
+    assert app_state.activate_context(first.name).room_info["room_id"] == 100
+
+
+def test_activate_unknown_account_gets_a_fresh_context(contexts):
+    context = app_state.activate_context("cookies|3")
+    assert context not in contexts
+    assert context.name == "cookies|3"
+    assert app_state.default_context is context
+
+
+def test_cancel_context_stops_only_that_account(manager, contexts):
+    first, second = contexts
+    gate = Event()
+    workers = [Blocking(first, gate), Unbound(first, gate),
+               Live(first, gate), Blocking(second, gate),
+               Replacing(first, gate)]
+    futures = [manager.submit(worker) for worker in workers]
+    for worker in workers:
+        worker.started.wait(2)
+    held = manager.submit(Replacing(first, gate))
+
+    assert manager.cancel_context(first) == 3
+    with pytest.raises(SubmissionDropped):
+        held.result(timeout=2)
+    for future in (futures[0], futures[4]):
+        with pytest.raises((TaskCancelled, CancelledError)):
+            future.result(timeout=2)
+    assert not any(future.done() for future in futures[1:4])
+    assert manager.surviving_workers(first) == [workers[2]]
+    assert manager.surviving_workers(second) == []
+    gate.set()
+    for future in futures[1:4]:
+        future.result(timeout=2)
+    assert manager.surviving_workers(first) == []
+
+
+def test_live_control_survives_an_account_switch():
+    assert StartLiveWorker.survives_switch and StopLiveWorker.survives_switch
+    assert not BaseWorker.survives_switch
@@ -0,0 +1,79 @@
+from json import dump
+
+import pytest
+
+from src.core.cache import get_cache_path
+from src.core.constant import CacheType
+from src.core.network import AdaptiveTimeouts, LatencyHistogram
+
+ENDPOINT = "GET api.example.com/read"
+
+
+@pytest.fixture
+def timeouts():
+    return AdaptiveTimeouts(k=3, min_samples=5, read_bounds=(2.0, 15.0))
+
+
+def test_histogram_percentile_is_a_bucket_upper_bound():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(99) is None
+    for _ in range(99):
+        histogram.add(0.01)
+    histogram.add(1.0)
+    assert histogram.percentile(50) == LatencyHistogram.BASE
+    assert 1.0 <= histogram.percentile(100) < 1.25
+
+
+def test_histogram_decays_old_samples():
+    histogram = LatencyHistogram()
+    for _ in range(LatencyHistogram.DECAY_AT + 1):
+        histogram.add(0.1)
+    assert histogram.total == (LatencyHistogram.DECAY_AT + 1) / 2
+
+
+def test_default_until_enough_samples(timeouts):
+    for _ in range(4):
+        timeouts.observe(ENDPOINT, 2.0)
+    assert timeouts.timeout_for(ENDPOINT, {}, 5) == (5, 5)
+
+
+def test_read_timeout_follows_p99_within_bounds(timeouts):
+    for _ in range(5):
+        timeouts.observe(ENDPOINT, 1.0)
+    _, read = timeouts.timeout_for(ENDPOINT, {}, 5)
+    assert 3.0 <= read < 3.75
+    for _ in range(1000):
+        timeouts.observe(ENDPOINT, 0.01)
+    assert timeouts.timeout_for(ENDPOINT, {}, 5)[1] == 2.0
+
+
+def test_connect_timeout_ignores_request_latency(timeouts):
+    # 整个请求很慢不代表建立连接慢，反之亦然
+    for _ in range(20):
+        timeouts.observe(ENDPOINT, 4.0)
+        timeouts.observe("GET api.example.com/fast", 0.01)
+    assert timeouts.timeout_for(ENDPOINT, {}, 5)[0] == 5
+    assert timeouts.timeout_for("GET api.example.com/fast", {}, 5)[0] == 5
+
+
+def test_uploads_grow_with_payload(timeouts):
+    small = timeouts.timeout_for(ENDPOINT, {"files": {"f": b"x"}}, 5)
+    large = timeouts.timeout_for(
+        ENDPOINT, {"files": {"f": ("a.jpg", b"x" * 64 * 1024 * 100)}}, 5)
+    assert small == (5, 15.0)
+    assert large == (5, 105.0)
+    assert timeouts.upload_size({"data": b"x" * 10}) is None
+
+
+def test_histograms_survive_restart_and_drop_host_entries(timeouts):
+    for _ in range(5):
+        timeouts.observe(ENDPOINT, 1.0)
+    timeouts.save()
+    assert AdaptiveTimeouts(min_samples=5).timeout_for(
+        ENDPOINT, {}, 5)[1] > 2.0
+
+    _, path = get_cache_path(CacheType.CONFIG, AdaptiveTimeouts.FILE_NAME)
+    with open(path, "w", encoding="utf-8") as f:
+        dump({"api.example.com": [0, 5], ENDPOINT: [0, 5]}, f)
+    loaded = AdaptiveTimeouts()
+    assert list(loaded._load()) == [ENDPOINT]
@@ -0,0 +1,163 @@
+import pytest
+
+from src.core.app_state import AppSettings, CookieState, ObsSettings, \
+    RoomInfo, ScanStatus, StreamStatus
+from src.core.app_state.app_state_base import StateBase
+
+
+@pytest.mark.parametrize("cls", [AppSettings, CookieState, ObsSettings,
+                                 RoomInfo, ScanStatus, StreamStatus])
+def test_every_state_starts_from_its_defaults(cls):
+    state = cls()
+    assert state.as_dict() == cls.default_dict()
+    assert not state
+
+
+def test_snapshot_is_copy_on_write():
+    state = StreamStatus()
+    before = state.snapshot()
+    version = state.version
+
+    state["live_status"] = True
+    state.stream_addr = "rtmp://example"
+
+    assert before["live_status"] is False
+    assert before["stream_addr"] is None
+    assert state["live_status"] is True
+    assert state.get("stream_addr") == "rtmp://example"
+    assert state.version == version + 2
+    with pytest.raises(TypeError):
+        state.snapshot()["live_status"] = False
+
+
+def test_unknown_keys_are_rejected_or_ignored():
+    state = ScanStatus()
+    with pytest.raises(KeyError):
+        state["missing"] = 1
+    state.update({"missing": 1}, scanned=True)
+    assert "missing" not in state
+    assert state["scanned"] is True
+
+
+def test_reset_restores_defaults():
+    state = RoomInfo(title="t", recent_title=["a"])
+    state.reset()
+    assert state.as_dict() == RoomInfo.default_dict()
+    assert not state
+
+
+class _QueuedDispatcher:
+    def __init__(self) -> None:
+        self.posted = []
+
+    def close(self) -> None:
+        pass
+
+    def post(self, fn, /, *args, **kwargs) -> None:
+        self.posted.append((fn, args, kwargs))
+
+    def run(self) -> None:
+        posted, self.posted = self.posted, []
+        for fn, args, kwargs in posted:
+            fn(*args, **kwargs)
+
+
+def test_subscribe_coalesces_changes_until_delivery():
+    state = StreamStatus()
+    dispatcher = _QueuedDispatcher()
+    calls = []
+    state.subscribe({"live_status", "stream_key"}, calls.append,
+                    dispatcher=dispatcher)
+
+    state.live_status = True
+    state.stream_key = "key"
+    state.stream_addr = "ignored"
+    # 写入相同的值不算变化
+    state.live_status = True
+    assert len(dispatcher.posted) == 1
+
+    dispatcher.run()
+    assert calls == [frozenset({"live_status", "stream_key"})]
+
+
+def test_cancelled_subscription_is_not_called():
+    state = ObsSettings()
+    dispatcher = _QueuedDispatcher()
+    calls = []
+    subscription = state.subscribe("port", calls.append,
+                                   dispatcher=dispatcher)
+    state.port = "1"
+    subscription.cancel()
+    dispatcher.run()
+    state.port = "2"
+    dispatcher.run()
+    assert calls == []
+
+
+def test_subscribe_rejects_unknown_fields():
+    with pytest.raises(KeyError):
+        StreamStatus().subscribe("nope", print,
+                                 dispatcher=_QueuedDispatcher())
+
+
+def test_internal_fields_are_not_public():
+    assert all(not name.startswith("_") for name in StateBase.default_dict())
+    assert "_snapshot" not in StreamStatus().as_dict()
+
+
+def test_subscription_only_sees_its_fields(dispatcher):
+    state = StreamStatus()
+    calls = []
+    state.subscribe("live_status", calls.append, dispatcher=dispatcher)
+
+    state.stream_addr = "rtmp://example"
+    state.update(live_status=True, stream_key="key")
+
+    assert calls == [frozenset({"live_status"})]
+
+
+def test_one_write_of_several_fields_is_one_call(dispatcher):
+    state = StreamStatus()
+    calls = []
+    state.subscribe(("live_status", "stream_key", "stream_addr"),
+                    calls.append, dispatcher=dispatcher)
+
+    state.update({"live_status": True, "stream_key": "key"})
+    state.stream_addr = "rtmp://example"
+
+    assert calls == [frozenset({"live_status", "stream_key"}),
+                     frozenset({"stream_addr"})]
+
+
+def test_writes_before_delivery_are_coalesced(dispatcher, monkeypatch):
+    state = StreamStatus()
+    posted, calls = [], []
+    # 先挂起投递，模拟界面线程尚未处理事件
+    monkeypatch.setattr(dispatcher, "post", posted.append)
+    state.subscribe(("live_status", "stream_key"), calls.append,
+                    dispatcher=dispatcher)
+
+    state.live_status = True
+    state.stream_key = "key"
+    state.live_status = False
+    [deliver] = posted
+    deliver()
+    state.stream_key = "other"
+
+    assert calls == [frozenset({"live_status", "stream_key"})]
+    assert len(posted) == 2
+
+
+def test_unsubscribe_stops_only_that_subscription(dispatcher):
+    state = ObsSettings()
+    kept, dropped = [], []
+    state.subscribe("port", kept.append, dispatcher=dispatcher)
+    subscription = state.subscribe("port", dropped.append,
+                                   dispatcher=dispatcher)
+
+    state.port = "1"
+    state.unsubscribe(subscription)
+    state.port = "2"
+
+    assert kept == [frozenset({"port"})] * 2
+    assert dropped == [frozenset({"port"})]
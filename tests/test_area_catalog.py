@@ -0,0 +1,71 @@
+from json import dump, load
+
+from src.core.app_state import AreaCatalog
+from src.core.cache import get_cache_path
+from src.core.constant import CacheType
+
+AREAS = [
+    {"id": 2, "name": "网游", "list": [{"id": "86", "name": "英雄联盟"},
+                                      {"id": "87", "name": "CS2"}]},
+    {"id": 3, "name": "手游", "list": [{"id": "35", "name": "王者荣耀"}]},
+]
+
+
+def test_lookups_share_one_table():
+    catalog = AreaCatalog()
+    assert not catalog
+    catalog.update(AREAS)
+
+    assert catalog.choices() == [AreaCatalog.PLACEHOLDER, "网游", "手游"]
+    assert catalog.children("网游") == ["英雄联盟", "CS2"]
+    assert catalog.children("单机") == []
+    assert catalog.code("王者荣耀") == 35
+    assert catalog.name_of(87) == "CS2"
+    assert catalog.parent_of("CS2") == "网游"
+    assert catalog.parent_of("王者荣耀") == "手游"
+    assert catalog.has_child("网游", "英雄联盟")
+    assert not catalog.has_child("手游", "英雄联盟")
+    assert "CS2" in catalog and "单机" not in catalog
+
+
+def test_update_reports_the_diff_once():
+    catalog = AreaCatalog()
+    catalog.update(AREAS)
+    changed = [AREAS[0] | {"list": [{"id": 86, "name": "英雄联盟"}]},
+               {"id": 6, "name": "单机", "list": [{"id": 236, "name": "主机"}]}]
+
+    diff = catalog.update(changed)
+    assert diff.added == ["主机"]
+    assert diff.removed == ["CS2", "王者荣耀"]
+    assert diff.added_parents == ["单机"]
+    assert diff.removed_parents == ["手游"]
+    assert catalog.update(changed) is None
+
+
+def test_reorder_is_an_empty_diff():
+    catalog = AreaCatalog()
+    catalog.update(AREAS)
+    diff = catalog.update(AREAS[::-1])
+    assert diff is not None and not diff
+    assert catalog.parents() == ["手游", "网游"]
+
+
+def test_cache_is_used_at_login():
+    AreaCatalog().update(AREAS)
+    catalog = AreaCatalog()
+    assert catalog.load_cached()
+    assert catalog.code("CS2") == 87
+    assert catalog.update(AREAS) is None
+
+
+def test_tampered_cache_is_ignored():
+    AreaCatalog().update(AREAS)
+    _, path = get_cache_path(CacheType.CONFIG, AreaCatalog.FILE_NAME)
+    with open(path, "r", encoding="utf-8") as f:
+        cached = load(f)
+    cached["areas"][0][1] = "改过"
+    with open(path, "w", encoding="utf-8") as f:
+        dump(cached, f)
+    catalog = AreaCatalog()
+    assert not catalog.load_cached()
+    assert not catalog
@@ -0,0 +1,85 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socket import socket
+from threading import Thread, Timer
+from time import perf_counter
+
+import pytest
+
+from src.core.constant import HeadersType, ProxyMode
+from src.core.exceptions import TaskCancelled
+from src.core.network import RequestScope, SessionPool, request_scope
+from src.core.workers.base import CancellationToken
+
+
+@pytest.fixture
+def hanging():
+    """Reads requests but never answers them."""
+    server = socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    accepted = []
+
+    def accept():
+        while True:
+            try:
+                accepted.append(server.accept()[0])
+            except OSError:
+                return
+
+    Thread(target=accept, daemon=True).start()
+    yield f"http://127.0.0.1:{server.getsockname()[1]}/"
+    server.close()
+    for conn in accepted:
+        conn.close()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        Handler.connections += 1
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    Handler.connections = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_cancel_aborts_a_blocked_request(hanging):
+    session = SessionPool().acquire(HeadersType.APP, ProxyMode.NONE, "")
+    token = CancellationToken()
+    session.bind_cancel_token(token)
+    Timer(0.2, token.cancel).start()
+    start = perf_counter()
+    with pytest.raises(TaskCancelled):
+        session.get(hanging, timeout=10)
+    assert perf_counter() - start < 2
+    session.close()
+
+
+def test_returned_connection_survives_a_later_abort(server):
+    session = SessionPool().acquire(HeadersType.APP, ProxyMode.NONE, "")
+    scope = RequestScope()
+    with request_scope(scope):
+        assert session.get(server, timeout=5).content == b"{}"
+    # 连接已归还连接池，本次请求的取消不能再关闭它
+    scope.abort()
+    assert session.get(server, timeout=5).content == b"{}"
+    assert Handler.connections == 1
+    session.close()
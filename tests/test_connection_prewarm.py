@@ -0,0 +1,99 @@
+from socket import socket
+from threading import Thread, Timer, current_thread
+from time import perf_counter
+
+import pytest
+
+from src.core import app_state
+from src.core.constant import HeadersType, ProxyMode
+from src.core.exceptions import TaskCancelled
+from src.core.network import SessionPool
+from src.core.workers.base import CancellationToken
+from src.core.workers.prewarm import ConnectionPrewarmWorker
+from src.core.workers.worker_manager import WorkerManager
+
+
+@pytest.fixture
+def listener():
+    """Accepts connections but never answers, so TLS handshakes hang."""
+    server = socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    accepted = []
+
+    def accept():
+        while True:
+            try:
+                accepted.append(server.accept()[0])
+            except OSError:
+                return
+
+    Thread(target=accept, daemon=True).start()
+    yield server.getsockname()[1], accepted
+    server.close()
+    for conn in accepted:
+        conn.close()
+
+
+def test_prewarm_leaves_one_idle_connection(listener):
+    port, accepted = listener
+    pool = SessionPool()
+    url = f"http://127.0.0.1:{port}/"
+    assert pool.prewarm(HeadersType.APP, ProxyMode.NONE, "", url)
+    assert not pool.prewarm(HeadersType.APP, ProxyMode.NONE, "", url)
+    deadline = perf_counter() + 2
+    while not accepted and perf_counter() < deadline:
+        pass
+    assert len(accepted) == 1
+
+
+def test_cancel_shuts_a_hanging_handshake(listener):
+    port, _ = listener
+    token = CancellationToken()
+    Timer(0.2, token.cancel).start()
+    start = perf_counter()
+    with pytest.raises(TaskCancelled):
+        SessionPool().prewarm(HeadersType.APP, ProxyMode.NONE, "",
+                              f"https://127.0.0.1:{port}/", timeout=10,
+                              token=token)
+    assert perf_counter() - start < 2
+
+
+def test_cancelled_token_does_not_connect(listener):
+    port, accepted = listener
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(TaskCancelled):
+        SessionPool().prewarm(HeadersType.APP, ProxyMode.NONE, "",
+                              f"http://127.0.0.1:{port}/", token=token)
+    assert accepted == []
+
+
+def test_worker_fans_out_on_the_shared_pool(listener, dispatcher,
+                                            monkeypatch):
+    port, _ = listener
+    threads = []
+    original = SessionPool.prewarm
+
+    def prewarm(pool, *args, **kwargs):
+        threads.append(current_thread().name)
+        return original(pool, *args, **kwargs)
+
+    monkeypatch.setattr(SessionPool, "prewarm", prewarm)
+    monkeypatch.setattr(ConnectionPrewarmWorker, "TARGETS", tuple(
+        (h_type, f"https://127.0.0.1:{port}/")
+        for h_type in (HeadersType.WEB, HeadersType.APP)))
+    monkeypatch.setitem(app_state.app_settings, "proxy_mode", ProxyMode.NONE)
+    manager = WorkerManager(dispatcher, max_workers=4, reserved_workers=0)
+    try:
+        future = manager.submit(ConnectionPrewarmWorker())
+        while len(threads) < 2:
+            pass
+        start = perf_counter()
+        manager.shutdown()
+        assert perf_counter() - start < 2
+        assert future.cancelled() or isinstance(future.exception(),
+                                                TaskCancelled)
+    finally:
+        manager.shutdown()
+    assert all(name.startswith("backend-worker") for name in threads)
@@ -0,0 +1,154 @@
+from json import dumps
+from time import time
+
+import pytest
+
+from src.core import app_state
+from src.core.app_state import AccountContext
+from src.core.constant import HeadersType, KEYRING_SERVICE_NAME
+from src.core.keystore import CredentialStore, CredentialVault, \
+    refresh_token_key
+from src.core.network import PooledSession
+from src.core.workers.credentials import CredentialManagerWorker
+from src.core.workers.credentials import credential_manager
+from src.core.workers.login import CredentialRefreshWorker
+
+
+class Sent(list):
+    # 置为异常时确认刷新失败
+    confirm_error = None
+
+
+class _Response:
+    def __init__(self, payload=None, *, text="", cookies=None):
+        self._payload = payload
+        self.text = text
+        self.encoding = None
+        self.cookies = type("Cookies", (), {
+            "get_dict": lambda _: dict(cookies or {})})()
+
+    def json(self):
+        return self._payload
+
+
+@pytest.fixture
+def bilibili(monkeypatch):
+    """Answers the cookie refresh endpoints and records what was sent."""
+    sent = Sent()
+
+    def get(session, url, **kwargs):
+        sent.append((url, dict(session.cookies)))
+        if "cookie/info" in url:
+            return _Response({"code": 0, "data": {"refresh": True}})
+        return _Response(text='<div id="1-name">refresh-csrf</div>')
+
+    def post(session, url, data=None, params=None, **kwargs):
+        sent.append((url, dict(session.cookies)))
+        if "cookie/refresh" in url:
+            assert data["refresh_token"] == "old"
+            return _Response({"code": 0, "data": {"refresh_token": "new"}},
+                             cookies={"SESSDATA": "s2", "bili_jct": "j2"})
+        if "GenWebTicket" in url:
+            assert params["csrf"] == "j2"
+            return _Response({"code": 0, "data": {
+                "ticket": "t2", "created_at": 1000, "ttl": 10}})
+        if sent.confirm_error is not None:
+            raise sent.confirm_error
+        assert data == {"csrf": "j2", "refresh_token": "old"}
+        return _Response({"code": 0})
+
+    monkeypatch.setattr(PooledSession, "get", get)
+    monkeypatch.setattr(PooledSession, "post", post)
+    return sent
+
+
+@pytest.fixture
+def account(monkeypatch):
+    context = AccountContext(session_pool=app_state.session_pool,
+                             name="cookies|1", refresh_token="old")
+    context.cookies.update({"DedeUserID": "1", "bili_jct": "j1",
+                            "SESSDATA": "s1",
+                            "bili_ticket_expires": str(int(time()) + 86400)})
+    monkeypatch.setitem(app_state.account_contexts, "cookies|1", context)
+    return context
+
+
+@pytest.fixture
+def saved(monkeypatch):
+    saved = []
+    monkeypatch.setattr(CredentialManagerWorker, "add_cookie", staticmethod(
+        lambda allow_duplicate=False, context=None: saved.append(context)))
+    return saved
+
+
+def test_refresh_token_is_never_sent_as_a_cookie(bilibili, account, saved):
+    reported = []
+    CredentialRefreshWorker().poll(lambda *args: reported.append(args))
+
+    assert reported == [(account, {"SESSDATA": "s2", "bili_jct": "j2"},
+                         "new")]
+    assert all("refresh_token" not in cookies for _, cookies in bilibili)
+    # 轮询线程只上报，账号状态由调度线程修改
+    assert account.refresh_token == "old"
+    assert account.cookies["SESSDATA"] == "s1"
+    assert saved == []
+
+
+def test_rotation_is_reported_before_confirming(bilibili, account, saved):
+    bilibili.confirm_error = ConnectionError("confirm lost")
+    reported = []
+    CredentialRefreshWorker().poll(lambda *args: reported.append(args))
+    assert [args[2] for args in reported] == ["new"]
+
+
+def test_renewed_ticket_uses_the_rotated_csrf(bilibili, account, saved):
+    account.cookies["bili_ticket_expires"] = "0"
+    reported = []
+    CredentialRefreshWorker().poll(lambda *args: reported.append(args))
+    assert reported[1] == (account, {"bili_ticket": "t2",
+                                     "bili_ticket_expires": "1010"})
+
+
+def test_progress_applies_and_writes_back(account, saved):
+    CredentialRefreshWorker().on_progress(
+        account, {"SESSDATA": "s2", "bili_jct": "j2"}, "new")
+
+    assert saved == [account]
+    assert account.refresh_token == "new"
+    assert account.cookies["SESSDATA"] == "s2"
+    assert "refresh_token" not in account.cookies
+    session = account.create_session(HeadersType.WEB)
+    assert "refresh_token" not in session.cookies
+    session.close()
+
+
+def test_deleted_account_is_not_written_back(account, saved, monkeypatch):
+    monkeypatch.delitem(app_state.account_contexts, "cookies|1")
+    CredentialRefreshWorker().on_progress(account, {"SESSDATA": "s2"})
+    assert saved == []
+    assert account.cookies["SESSDATA"] == "s1"
+
+
+@pytest.fixture
+def store(backend, tmp_path, monkeypatch):
+    store = CredentialStore(KEYRING_SERVICE_NAME, delay=60,
+                            vault=CredentialVault(KEYRING_SERVICE_NAME,
+                                                  path=tmp_path / "v"))
+    monkeypatch.setattr(credential_manager, "credential_store", store)
+    return store
+
+
+def test_token_saved_inside_cookies_moves_to_its_own_key(store):
+    cookies = {"DedeUserID": "1", "refresh_token": "legacy"}
+    store.set("cookies|1", dumps(cookies))
+
+    token = CredentialManagerWorker.load_refresh_token("cookies|1", cookies)
+
+    assert token == "legacy"
+    assert cookies == {"DedeUserID": "1"}
+    assert store.get(refresh_token_key("cookies|1")) == "legacy"
+    assert "refresh_token" not in store.get("cookies|1")
+
+
+def test_refresh_token_key_sits_next_to_the_cookies():
+    assert refresh_token_key("cookies|42") == "refreshToken|42"
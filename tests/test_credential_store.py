@@ -0,0 +1,117 @@
+import pytest
+
+from src.core.constant import KEYRING_APP_SETTINGS, KEYRING_COOKIES_INDEX, \
+    KEYRING_SETTINGS, KEYRING_VAULT_KEY
+from src.core.exceptions import CredentialVaultError
+from src.core.keystore import CredentialStore, CredentialVault
+
+SERVICE = "StartLive-test"
+
+
+@pytest.fixture
+def vault(tmp_path):
+    return CredentialVault(SERVICE, path=tmp_path / "credentials.vault")
+
+
+def _store(vault: CredentialVault) -> CredentialStore:
+    return CredentialStore(SERVICE, delay=60, vault=vault)
+
+
+def test_reads_are_cached(backend, vault):
+    backend.entries[(SERVICE, KEYRING_SETTINGS)] = "{}"
+    store = _store(vault)
+    assert store.get(KEYRING_SETTINGS) == "{}"
+    assert store.get(KEYRING_SETTINGS) == "{}"
+    assert store.get("missing") is None
+    assert store.get("missing") is None
+    assert backend.calls == 2
+
+
+def test_writes_are_batched_until_flush(backend, vault):
+    store = _store(vault)
+    store.set(KEYRING_SETTINGS, "1")
+    store.set(KEYRING_SETTINGS, "2")
+    store.delete(KEYRING_APP_SETTINGS)
+    assert store.get(KEYRING_SETTINGS) == "2"
+    assert backend.entries == {}
+
+    store.flush()
+    assert backend.entries == {(SERVICE, KEYRING_SETTINGS): "2"}
+
+
+def test_enable_vault_moves_entries_out_of_keyring(backend, vault):
+    backend.entries[(SERVICE, KEYRING_COOKIES_INDEX)] = '["cookies|1"]'
+    backend.entries[(SERVICE, "cookies|1")] = '{"DedeUserID": "1"}'
+    store = _store(vault)
+
+    assert store.enable_vault() == 2
+    assert set(backend.entries) == {(SERVICE, KEYRING_VAULT_KEY)}
+    assert vault.load() == {KEYRING_COOKIES_INDEX: '["cookies|1"]',
+                            "cookies|1": '{"DedeUserID": "1"}'}
+
+    store.set("cookies|2", "x")
+    store.flush()
+    reopened = _store(CredentialVault(SERVICE, path=vault.path))
+    assert reopened.vault_enabled
+    assert reopened.get("cookies|2") == "x"
+    assert reopened.get("cookies|1") == '{"DedeUserID": "1"}'
+
+
+def test_disable_vault_moves_entries_back(backend, vault):
+    store = _store(vault)
+    store.set(KEYRING_SETTINGS, "s")
+    store.enable_vault()
+    assert store.disable_vault() == 1
+    assert not vault.exists()
+    assert backend.entries == {(SERVICE, KEYRING_SETTINGS): "s"}
+
+
+def _locked_store(backend, vault) -> CredentialStore:
+    store = _store(vault)
+    store.set(KEYRING_SETTINGS, "s")
+    store.enable_vault()
+    # 主密钥丢失
+    del backend.entries[(SERVICE, KEYRING_VAULT_KEY)]
+    return _store(CredentialVault(SERVICE, path=vault.path))
+
+
+def test_unreadable_vault_never_falls_back_to_keyring(backend, vault):
+    store = _locked_store(backend, vault)
+    backend.entries[(SERVICE, KEYRING_SETTINGS)] = "stale"
+    vault_bytes = vault.path.read_bytes()
+
+    assert isinstance(store.open_error, CredentialVaultError)
+    assert isinstance(store.open_error.reason, KeyError)
+    assert store.get(KEYRING_SETTINGS) is None
+
+    store.set("cookies|9", "new")
+    store.flush()
+    assert (SERVICE, "cookies|9") not in backend.entries
+    assert vault.path.read_bytes() == vault_bytes
+
+
+def test_tampered_vault_is_reported(backend, vault):
+    store = _store(vault)
+    store.set(KEYRING_SETTINGS, "s")
+    store.enable_vault()
+    data = bytearray(vault.path.read_bytes())
+    data[-1] ^= 0xFF
+    vault.path.write_bytes(bytes(data))
+
+    reopened = _store(CredentialVault(SERVICE, path=vault.path))
+    assert reopened.open_error is not None
+    assert reopened.vault_enabled
+
+
+def test_locked_vault_cannot_be_disabled_but_can_be_discarded(backend, vault):
+    store = _locked_store(backend, vault)
+    with pytest.raises(CredentialVaultError):
+        store.disable_vault()
+    assert vault.exists()
+
+    store.discard_vault()
+    assert store.open_error is None
+    assert not vault.exists()
+    store.set(KEYRING_SETTINGS, "fresh")
+    store.flush()
+    assert backend.entries[(SERVICE, KEYRING_SETTINGS)] == "fresh"
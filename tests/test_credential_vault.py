@@ -0,0 +1,56 @@
+import pytest
+from cryptography.exceptions import InvalidTag
+
+from src.core.constant import KEYRING_VAULT_KEY
+from src.core.keystore import CredentialVault
+
+SERVICE = "StartLive-test"
+ENTRIES = {"cookies|42": '{"SESSDATA":"secret"}', "refreshToken|42": "token"}
+
+
+@pytest.fixture
+def vault(backend, tmp_path):
+    return CredentialVault(SERVICE, path=tmp_path / "credentials.vault")
+
+
+def test_round_trip_keeps_only_the_key_in_the_keyring(backend, vault):
+    vault.save(ENTRIES)
+    assert list(backend.entries) == [(SERVICE, KEYRING_VAULT_KEY)]
+    assert b"secret" not in vault.path.read_bytes()
+    assert CredentialVault(SERVICE, path=vault.path).load() == ENTRIES
+
+
+def test_every_save_uses_a_fresh_nonce(vault):
+    vault.save(ENTRIES)
+    first = vault.path.read_bytes()
+    vault.save(ENTRIES)
+    assert vault.path.read_bytes() != first
+    assert not vault.path.with_suffix(".tmp").exists()
+
+
+def test_missing_master_key_is_not_recreated_on_load(backend, vault):
+    vault.save(ENTRIES)
+    backend.entries.clear()
+    with pytest.raises(KeyError):
+        CredentialVault(SERVICE, path=vault.path).load()
+    assert backend.entries == {}
+
+
+def test_foreign_or_modified_files_are_rejected(vault):
+    vault.save(ENTRIES)
+    data = bytearray(vault.path.read_bytes())
+    data[-1] ^= 1
+    vault.path.write_bytes(bytes(data))
+    with pytest.raises(InvalidTag):
+        vault.load()
+    vault.path.write_bytes(b"not a vault")
+    with pytest.raises(ValueError):
+        vault.load()
+
+
+def test_destroy_removes_file_and_key(backend, vault):
+    vault.save(ENTRIES)
+    vault.destroy()
+    assert not vault.exists()
+    assert backend.entries == {}
+    vault.destroy()
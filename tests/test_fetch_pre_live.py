@@ -0,0 +1,90 @@
+import pytest
+
+from src.core import app_state
+from src.core.app_state import AccountContext
+from src.core.workers.live import StartLiveWorker
+from src.core.workers.pre_live import FetchPreLiveWorker
+
+PRE_LIVE = {"code": 0, "data": {
+    "cover": {"auditReason": "", "url": "https://i0.hdslb.com/c.jpg",
+              "auditStatus": 1},
+    "title": "title"}}
+
+
+def _room_info(live_status: int) -> dict:
+    return {"code": 0, "data": {
+        "room_id": 1001, "parent_name": "娱乐", "area_v2_name": "聊天",
+        "area_v2_id": 145, "live_status": live_status}}
+
+
+class _FakeResponse:
+    def __init__(self, payload: dict) -> None:
+        self._payload = payload
+        self.encoding = None
+
+    def json(self) -> dict:
+        return self._payload
+
+
+class _FakeSession:
+    def __init__(self, live_status: int) -> None:
+        self._live_status = live_status
+
+    def get(self, url, **kwargs):
+        if url.endswith("/PreLive"):
+            return _FakeResponse(PRE_LIVE)
+        return _FakeResponse(_room_info(self._live_status))
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def start_live_calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(StartLiveWorker, "start_live",
+                        staticmethod(lambda *args, **kwargs:
+                                     calls.append(args)))
+    return calls
+
+
+@pytest.fixture
+def room_updated():
+    app_state.scan_status["room_updated"] = False
+    yield
+    app_state.scan_status["room_updated"] = False
+
+
+def _worker(live_status: int, *, prefetch: bool) -> FetchPreLiveWorker:
+    context = AccountContext(cookies={"DedeUserID": "42"}, name="cookies|42")
+    worker = FetchPreLiveWorker(None, context=context, prefetch=prefetch)
+    worker._session.close()
+    worker._session = _FakeSession(live_status)
+    return worker
+
+
+def test_prefetch_of_live_account_only_records_live_status(start_live_calls,
+                                                           room_updated):
+    worker = _worker(1, prefetch=True)
+    worker.run(None)
+    assert worker.context.stream_status["live_status"] is True
+    assert worker.context.stream_status["stream_addr"] is None
+    assert worker.context.room_info["room_id"] == 1001
+    assert start_live_calls == []
+    assert app_state.scan_status["room_updated"] is False
+
+
+def test_prefetch_leaves_global_scan_flags_alone(start_live_calls,
+                                                 room_updated):
+    worker = _worker(0, prefetch=True)
+    worker.run(None)
+    assert worker.context.stream_status["live_status"] is False
+    assert app_state.scan_status["room_updated"] is False
+
+
+def test_selected_live_account_fetches_stream_address(start_live_calls,
+                                                      room_updated):
+    worker = _worker(1, prefetch=False)
+    worker.run(None)
+    assert len(start_live_calls) == 1
+    assert app_state.scan_status["room_updated"] is True
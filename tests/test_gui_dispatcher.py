@@ -0,0 +1,44 @@
+from time import perf_counter, sleep
+
+import pytest
+
+QtCore = pytest.importorskip("PySide6.QtCore")
+
+from src.PySide.interface_adapters.gui_dispatcher import GUIDispatcher  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def _process_until(app, predicate, timeout: float = 2.0) -> None:
+    deadline = perf_counter() + timeout
+    while not predicate():
+        assert perf_counter() < deadline, "dispatcher never drained"
+        app.processEvents()
+
+
+def test_posted_callables_run_in_order(app):
+    dispatcher = GUIDispatcher()
+    ran = []
+    for i in range(5):
+        dispatcher.post(ran.append, i)
+    _process_until(app, lambda: len(ran) == 5)
+    assert ran == [0, 1, 2, 3, 4]
+    dispatcher.close()
+
+
+def test_over_budget_drain_keeps_batching_interval(app):
+    dispatcher = GUIDispatcher(interval_ms=50, budget_ms=1)
+    ran = []
+    for i in range(3):
+        dispatcher.post(lambda i=i: (sleep(0.002), ran.append(i)))
+    _process_until(app, lambda: len(ran) == 3)
+
+    # 超出预算的一轮之后，下一次唤醒仍按 interval_ms 延后
+    dispatcher.post(ran.append, "later")
+    _process_until(app, lambda: dispatcher._timer.isActive())
+    assert dispatcher._timer.interval() == 50
+    _process_until(app, lambda: ran[-1] == "later")
+    dispatcher.close()
@@ -0,0 +1,172 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from time import monotonic, sleep
+
+import pytest
+from requests import Response
+from requests.exceptions import ConnectionError, Timeout
+
+from src.core.exceptions import TaskCancelled
+from src.core.network import HedgePolicy, hedged_request
+
+URL = "https://api.example.com/read"
+FAST = HedgePolicy(deadline=1.0, attempts=3, hedge_min=0.05, hedge_max=0.05,
+                   hedge_default=0.05, attempt_timeout=0.5)
+
+
+def answer(status):
+    response = Response()
+    response.status_code = status
+    return response
+
+
+def hang(token):
+    # 像被 RequestScope 中断的请求一样，取消后立即返回
+    while not token:
+        sleep(0.01)
+    raise TaskCancelled()
+
+
+class Token:
+    def __init__(self):
+        self.cancelled = False
+        self.callbacks = []
+
+    def __bool__(self):
+        return self.cancelled
+
+    def cancel(self):
+        self.cancelled = True
+        for cb in self.callbacks:
+            cb()
+
+    def add_cancel_callback(self, cb):
+        self.callbacks.append(cb)
+
+    def remove_cancel_callback(self, cb):
+        self.callbacks.remove(cb)
+
+
+class Attempt:
+    def __init__(self, session):
+        self.session = session
+        self.token = None
+
+    def bind_cancel_token(self, token):
+        self.token = token
+
+    def request(self, method, url, timeout=None, **kwargs):
+        self.session.timeouts.append(timeout)
+        return self.session.script.pop(0)(self.token)
+
+    def close(self):
+        self.session.closed += 1
+
+
+class Session:
+    """Plays one scripted behaviour per attempt, in order."""
+
+    def __init__(self, *script, cancel_token=None):
+        self.script = list(script)
+        self.cancel_token = cancel_token
+        self.attempts = []
+        self.timeouts = []
+        self.closed = 0
+
+    def detached(self, *, cancellable=False):
+        self.attempts.append(Attempt(self))
+        return self.attempts[-1]
+
+
+@pytest.fixture
+def submit():
+    with ThreadPoolExecutor(4) as executor:
+        yield executor.submit
+
+
+def test_slow_attempt_is_hedged_and_the_fastest_wins(submit):
+    session = Session(hang, lambda token: answer(204))
+    response = hedged_request(session, "GET", URL, policy=FAST,
+                              submit=submit, timeout=30)
+    assert response.status_code == 204
+    # 每次请求的超时不超过剩余预算，调用方给的超时被忽略
+    assert all(read <= FAST.deadline for _, read in session.timeouts)
+
+
+def test_losers_are_cancelled_once_a_winner_returns(submit):
+    session = Session(hang, lambda token: answer(200))
+    hedged_request(session, "GET", URL, policy=FAST, submit=submit)
+    loser, winner = session.attempts
+    assert loser.token and winner.token
+
+
+def test_every_attempt_is_cancelled_when_the_deadline_passes(submit):
+    policy = HedgePolicy(deadline=0.2, attempts=2, hedge_min=0.05,
+                         hedge_max=0.05, hedge_default=0.05)
+    session = Session(hang, hang)
+    with pytest.raises(Timeout):
+        hedged_request(session, "GET", URL, policy=policy, submit=submit)
+    assert len(session.attempts) == 2
+    assert all(attempt.token for attempt in session.attempts)
+
+
+def test_cancelling_the_caller_cancels_every_attempt(submit):
+    parent = Token()
+    session = Session(hang, hang, cancel_token=parent)
+    started = monotonic()
+    with ThreadPoolExecutor(1) as caller:
+        future = caller.submit(hedged_request, session, "GET", URL,
+                               policy=FAST, submit=submit)
+        sleep(0.1)
+        parent.cancel()
+        with pytest.raises(TaskCancelled):
+            future.result()
+    assert monotonic() - started < FAST.deadline
+    assert all(attempt.token for attempt in session.attempts)
+    assert parent.callbacks == []
+
+
+def test_queued_attempt_runs_on_the_caller_when_the_pool_is_busy():
+    release = Event()
+    with ThreadPoolExecutor(1) as executor:
+        executor.submit(release.wait, 1)
+        try:
+            response = hedged_request(Session(lambda token: answer(200)),
+                                      "GET", URL, policy=FAST,
+                                      submit=executor.submit)
+        finally:
+            release.set()
+    assert response.status_code == 200
+
+
+def test_errors_are_retried_at_once():
+    def refused(token):
+        raise ConnectionError("refused")
+
+    session = Session(refused, lambda token: answer(503),
+                      lambda token: answer(200))
+    progress = []
+    response = hedged_request(session, "GET", URL, policy=FAST,
+                              report=progress.append)
+    assert response.status_code == 200
+    assert [p.attempt for p in progress] == [1, 2, 3]
+    assert session.closed == 3
+
+
+def test_last_error_is_raised_when_every_attempt_fails():
+    def refused(token):
+        raise ConnectionError("refused")
+
+    with pytest.raises(ConnectionError):
+        hedged_request(Session(refused, refused, refused), "GET", URL,
+                       policy=FAST)
+
+
+def test_cancellation_is_not_retried():
+    def cancelled(token):
+        raise TaskCancelled()
+
+    session = Session(cancelled, lambda token: answer(200))
+    with pytest.raises(TaskCancelled):
+        hedged_request(session, "GET", URL, policy=FAST)
+    assert len(session.script) == 1
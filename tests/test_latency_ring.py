@@ -0,0 +1,41 @@
+from threading import Thread
+
+from src.core.metrics import LatencyRing
+
+
+def test_percentiles_use_nearest_rank():
+    ring = LatencyRing(size=10)
+    for value in range(1, 11):
+        ring.add(float(value))
+    assert ring.percentiles(50, 95, 100) == (5.0, 10.0, 10.0)
+
+
+def test_empty_ring():
+    ring = LatencyRing()
+    assert ring.total == 0
+    assert len(ring) == 0
+    assert ring.percentiles(50, 99) == (None, None)
+
+
+def test_total_counts_overwritten_samples():
+    ring = LatencyRing(size=4)
+    for value in range(10):
+        ring.add(float(value))
+    assert ring.total == 10
+    assert len(ring) == 4
+    assert ring.snapshot() == [6.0, 7.0, 8.0, 9.0]
+
+
+def test_total_never_goes_backwards_under_concurrent_writers():
+    ring = LatencyRing(size=64)
+    seen: list[int] = []
+    writers = [Thread(target=lambda: [ring.add(0.1) for _ in range(5000)])
+               for _ in range(4)]
+    for writer in writers:
+        writer.start()
+    while any(writer.is_alive() for writer in writers):
+        seen.append(ring.total)
+    for writer in writers:
+        writer.join()
+    assert seen == sorted(seen)
+    assert ring.total == 20000
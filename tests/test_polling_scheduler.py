@@ -0,0 +1,109 @@
+from concurrent.futures import Future
+from threading import enumerate as threads
+from time import perf_counter
+
+import pytest
+
+from src.core.exceptions import TaskCancelled
+from src.core.workers.base import POLL_AGAIN, PollAgain, PollingWorker
+from src.core.workers.polling_scheduler import PollingScheduler
+from src.core.workers.priority_executor import PriorityExecutor
+
+
+class Poller(PollingWorker):
+    account_bound = False
+
+    def __init__(self, rounds=3, **kwargs):
+        kwargs.setdefault("interval", 0.01)
+        super().__init__(name="poller", with_session=False, **kwargs)
+        self.rounds = rounds
+        self.polled = 0
+
+    def poll(self, report_progress):
+        self.polled += 1
+        if self.polled < self.rounds:
+            return POLL_AGAIN
+        return self.polled
+
+
+@pytest.fixture
+def executor():
+    executor = PriorityExecutor(max_workers=2, reserved_workers=0)
+    yield executor
+    executor.shutdown(wait=True, cancel_futures=True)
+
+
+@pytest.fixture
+def scheduler(executor):
+    scheduler = PollingScheduler(
+        lambda fn, priority: executor.submit(fn, priority=priority))
+    yield scheduler
+    scheduler.clear()
+    scheduler.shutdown()
+
+
+def schedule(scheduler, worker):
+    future = Future()
+    scheduler.schedule(worker, future, lambda *args: None)
+    return future
+
+
+def scheduler_threads():
+    return [t for t in threads() if t.name == "polling-scheduler"]
+
+
+def test_many_pollers_share_one_thread(scheduler):
+    workers = [Poller(rounds=5) for _ in range(30)]
+    futures = [schedule(scheduler, worker) for worker in workers]
+    assert len(scheduler_threads()) == 1
+    assert [f.result(timeout=5) for f in futures] == [5] * 30
+    assert scheduler.active_count == 0
+
+
+def test_backoff_grows_to_the_ceiling():
+    worker = Poller(interval=1, backoff=2, max_interval=5)
+    assert [worker.next_delay(POLL_AGAIN) for _ in range(5)] == \
+           [1, 2, 4, 5, 5]
+    assert worker.next_delay(PollAgain(0.5)) == 0.5
+    worker.reset_backoff()
+    assert worker.next_delay(POLL_AGAIN) == 1
+
+
+def test_wake_runs_the_next_round_now(scheduler):
+    worker = Poller(rounds=2, interval=30)
+    future = schedule(scheduler, worker)
+    while worker.polled == 0:
+        pass
+    worker.wake()
+    assert future.result(timeout=2) == 2
+
+
+def test_stop_ends_a_waiting_poller_at_once(scheduler):
+    worker = Poller(rounds=100, interval=30)
+    future = schedule(scheduler, worker)
+    while worker.polled == 0:
+        pass
+    start = perf_counter()
+    worker.stop()
+    with pytest.raises(TaskCancelled):
+        future.result(timeout=2)
+    assert perf_counter() - start < 1
+
+
+def test_shutdown_joins_and_schedule_resumes(scheduler):
+    waiting = Poller(rounds=2, initial_delay=0.2)
+    future = schedule(scheduler, waiting)
+    scheduler.shutdown()
+    assert scheduler_threads() == []
+    assert not future.done()
+
+    assert schedule(scheduler, Poller(rounds=1)).result(timeout=2) == 1
+    assert future.result(timeout=2) == 2
+    assert len(scheduler_threads()) == 1
+
+
+def test_rounds_fail_once_the_pool_is_closed(scheduler, executor):
+    executor.shutdown(wait=True)
+    future = schedule(scheduler, Poller())
+    with pytest.raises(RuntimeError):
+        future.result(timeout=2)
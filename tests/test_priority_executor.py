@@ -0,0 +1,100 @@
+from threading import Barrier, Event
+from time import monotonic, sleep
+
+import pytest
+
+from src.core.constant import WorkerPriority
+from src.core.workers.priority_executor import PriorityExecutor
+
+
+@pytest.fixture
+def executor():
+    executor = PriorityExecutor(max_workers=8, reserved_workers=1)
+    yield executor
+    executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _wait_idle(executor: PriorityExecutor, idle: int) -> None:
+    deadline = monotonic() + 2
+    while executor._idle_general < idle:
+        assert monotonic() < deadline, "threads never went idle"
+        sleep(0.01)
+
+
+def test_runs_by_priority_then_fifo():
+    executor = PriorityExecutor(max_workers=1, reserved_workers=0)
+    gate, order = Event(), []
+    try:
+        executor.submit(gate.wait)
+        futures = [
+            executor.submit(order.append, "background-1",
+                            priority=WorkerPriority.BACKGROUND),
+            executor.submit(order.append, "interactive",
+                            priority=WorkerPriority.INTERACTIVE),
+            executor.submit(order.append, "background-2",
+                            priority=WorkerPriority.BACKGROUND),
+            executor.submit(order.append, "critical",
+                            priority=WorkerPriority.CRITICAL),
+        ]
+        gate.set()
+        for future in futures:
+            future.result(timeout=2)
+    finally:
+        executor.shutdown()
+    assert order == ["critical", "interactive", "background-1",
+                     "background-2"]
+
+
+def test_burst_spreads_over_threads_with_one_warm_thread(executor):
+    executor.submit(lambda: None).result(timeout=2)
+    _wait_idle(executor, 1)
+
+    start = monotonic()
+    futures = [executor.submit(sleep, 0.5) for _ in range(6)]
+    for future in futures:
+        future.result(timeout=5)
+    elapsed = monotonic() - start
+
+    assert elapsed < 1.0, f"burst ran serially in {elapsed:.2f}s"
+    assert executor._general == 6
+
+
+def test_idle_threads_are_reused(executor):
+    for _ in range(3):
+        executor.submit(lambda: None).result(timeout=2)
+        _wait_idle(executor, 1)
+    assert executor._general == 1
+
+
+def test_critical_job_uses_reserved_thread_when_pool_is_busy():
+    executor = PriorityExecutor(max_workers=2, reserved_workers=1)
+    barrier = Barrier(3)
+    try:
+        busy = [executor.submit(barrier.wait, priority=WorkerPriority.BACKGROUND)
+                for _ in range(2)]
+        critical = executor.submit(lambda: "done",
+                                   priority=WorkerPriority.CRITICAL)
+        assert critical.result(timeout=2) == "done"
+        barrier.wait(timeout=2)
+        for future in busy:
+            future.result(timeout=2)
+    finally:
+        executor.shutdown()
+
+
+def test_submit_after_shutdown_raises(executor):
+    executor.shutdown()
+    with pytest.raises(RuntimeError):
+        executor.submit(lambda: None)
+
+
+def test_shutdown_cancels_queued_futures():
+    executor = PriorityExecutor(max_workers=1, reserved_workers=0)
+    started, gate = Event(), Event()
+    running = executor.submit(lambda: started.set() or gate.wait())
+    assert started.wait(timeout=2)
+    queued = executor.submit(lambda: None)
+    executor.shutdown(wait=False, cancel_futures=True)
+    gate.set()
+    assert queued.cancelled()
+    assert running.result(timeout=2) is True
@@ -0,0 +1,155 @@
+from concurrent.futures import Future
+from importlib import import_module
+from json import dumps
+
+import pytest
+from requests import Response
+
+from src.core.network import CachePolicy, ResponseCache, response_cache
+from src.core.workers.worker_manager import WorkerManager
+
+READ = "https://api.example.com/read"
+WRITE = "https://api.example.com/write"
+
+
+class FakeSession:
+    """Session whose answers are numbered, so cached ones are easy to spot."""
+
+    def __init__(self, scope="42", code=0):
+        self.account_scope = scope
+        self.code = code
+        self.sent = []
+        self.closed = 0
+
+    def fetch_uncached(self, method, url, **kwargs):
+        self.sent.append((method, url, kwargs.get("params")))
+        response = Response()
+        response.status_code = 200
+        response._content = dumps(
+            {"code": self.code, "data": len(self.sent)}).encode()
+        return response
+
+    def detached(self, *, cancellable=False):
+        return self
+
+    def close(self):
+        self.closed += 1
+
+
+class Cache(ResponseCache):
+    POLICIES = {"api.example.com/read": CachePolicy(ttl=60, stale=3600)}
+    INVALIDATES = {"api.example.com/write": ("api.example.com/read",)}
+
+
+@pytest.fixture
+def cache():
+    return Cache()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    # 包里的 response_cache 是单例，模块要按名字取
+    module = import_module("src.core.network.response_cache")
+    monkeypatch.setattr(module, "time", lambda: now[0])
+    return now
+
+
+def get(cache, session, **params):
+    return cache.fetch(session, "GET", READ,
+                       {"params": params}).json()["data"]
+
+
+def test_fresh_entry_skips_network_and_ignores_signature(cache, clock):
+    session = FakeSession()
+    assert get(cache, session, a=1, ts=1, sign="x") == 1
+    assert get(cache, session, a=1, ts=2, sign="y") == 1
+    assert get(cache, session, a=2) == 2
+    assert len(session.sent) == 2
+
+
+def test_stale_entry_is_refreshed_on_the_bound_executor(cache, clock):
+    queued = []
+    cache.bind_executor(lambda fn: queued.append(fn) or Future())
+    session = FakeSession()
+    get(cache, session)
+    clock[0] += 120
+
+    assert get(cache, session) == 1
+    assert get(cache, session) == 1
+    # 同一条目只排一次刷新
+    assert len(queued) == 1 and len(session.sent) == 1
+    queued[0]()
+    assert get(cache, session) == 2
+    assert session.closed == 1
+
+
+def test_stale_entry_without_executor_is_fetched(cache, clock):
+    session = FakeSession()
+    get(cache, session)
+    clock[0] += 120
+    assert get(cache, session) == 2
+    assert cache.stats()[0].miss == 2
+
+
+def test_refresh_is_released_when_the_executor_is_gone(cache, clock):
+    def closed(fn):
+        raise RuntimeError("cannot schedule new futures after shutdown")
+
+    futures = []
+    session = FakeSession()
+    get(cache, session)
+    clock[0] += 120
+
+    cache.bind_executor(closed)
+    assert get(cache, session) == 2
+    clock[0] += 120
+    cache.bind_executor(lambda fn: futures.append(Future()) or futures[-1])
+    assert get(cache, session) == 2
+    futures[0].cancel()
+    # 被取消的刷新不再占住条目
+    assert get(cache, session) == 2
+    assert len(futures) == 2
+    assert session.closed == 2
+
+
+def test_only_successful_answers_are_stored(cache, clock):
+    session = FakeSession(code=-101)
+    get(cache, session)
+    get(cache, session)
+    assert len(session.sent) == 2
+
+
+def test_anonymous_requests_are_not_cached(cache, clock):
+    session = FakeSession(scope="")
+    get(cache, session)
+    get(cache, session)
+    assert len(session.sent) == 2
+
+
+def test_post_invalidates_and_entries_survive_restart(cache, clock):
+    session = FakeSession()
+    get(cache, session)
+    assert get(Cache(), session) == 1
+
+    cache.fetch(session, "POST", WRITE, {})
+    assert get(cache, session) == 3
+    cache.discard_scope("42")
+    assert get(Cache(), session) == 4
+
+
+def test_login_check_is_never_cached(clock):
+    session = FakeSession()
+    nav = "https://api.bilibili.com/x/web-interface/nav"
+    for _ in range(2):
+        response_cache.fetch(session, "GET", nav, {})
+    assert len(session.sent) == 2
+
+
+def test_worker_manager_runs_refreshes_in_its_pool(dispatcher):
+    manager = WorkerManager(dispatcher, max_workers=1, reserved_workers=0)
+    try:
+        assert response_cache._submit_refresh is not None
+    finally:
+        manager.shutdown()
+    assert response_cache._submit_refresh is None
@@ -0,0 +1,112 @@
+from threading import Event, Lock, current_thread
+from time import sleep
+
+import pytest
+
+from src.core.constant import WorkerPriority
+from src.core.exceptions import TaskCancelled
+from src.core.network import TokenBucket
+from src.core.workers.base import BaseWorker
+from src.core.workers.worker_manager import WorkerManager
+
+
+class FanOutWorker(BaseWorker):
+    account_bound = False
+
+    def __init__(self, items, fn, *, limit=None):
+        super().__init__(name="fan-out", with_session=False)
+        self._items = items
+        self._fn = fn
+        self._limit = limit
+
+    def run(self, report_progress, *args, **kwargs):
+        return self.run_parallel(self._fn, self._items, limit=self._limit)
+
+
+@pytest.fixture
+def manager(dispatcher):
+    manager = WorkerManager(dispatcher, max_workers=4, reserved_workers=0)
+    yield manager
+    manager.shutdown()
+
+
+def test_results_keep_item_order_and_use_the_shared_pool(manager):
+    threads = set()
+
+    def square(n):
+        threads.add(current_thread().name)
+        sleep(0.05)
+        return n * n
+
+    result = manager.submit(FanOutWorker(range(6), square)).result(timeout=5)
+    assert result == [n * n for n in range(6)]
+    assert len(threads) > 1
+    assert all(name.startswith("backend-worker") for name in threads)
+
+
+def test_limit_bounds_items_in_progress(manager):
+    lock, running, peak = Lock(), [0], [0]
+
+    def track(_):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        sleep(0.05)
+        with lock:
+            running[0] -= 1
+
+    manager.submit(FanOutWorker(range(8), track, limit=2)).result(timeout=5)
+    assert peak[0] == 2
+
+
+def test_finishes_when_the_pool_is_saturated(dispatcher):
+    manager = WorkerManager(dispatcher, max_workers=1, reserved_workers=0)
+    try:
+        result = manager.submit(FanOutWorker(range(3), str)).result(timeout=5)
+    finally:
+        manager.shutdown()
+    assert result == ["0", "1", "2"]
+
+
+def test_runs_inline_without_a_manager():
+    worker = FanOutWorker(range(3), lambda n: current_thread().name)
+    assert worker.run(None) == [current_thread().name] * 3
+
+
+def test_stop_skips_remaining_items(manager):
+    started, seen = Event(), []
+
+    def slow(n):
+        seen.append(n)
+        started.set()
+        sleep(0.1)
+
+    worker = FanOutWorker(range(20), slow, limit=1)
+    future = manager.submit(worker)
+    started.wait(timeout=2)
+    worker.stop()
+    with pytest.raises(TaskCancelled):
+        future.result(timeout=5)
+    assert len(seen) < 20
+
+
+def test_helpers_run_at_the_submission_priority(manager):
+    priorities = []
+    original = manager._submit_task
+
+    def spy(priority, fn):
+        priorities.append(priority)
+        return original(priority, fn)
+
+    manager._submit_task = spy
+    manager.submit(FanOutWorker(range(3), str),
+                   priority=WorkerPriority.BACKGROUND).result(timeout=5)
+    assert priorities == [WorkerPriority.BACKGROUND] * 2
+
+
+def test_token_bucket_paces_reservations():
+    bucket = TokenBucket(rate=1)
+    waits = [bucket.reserve() for _ in range(3)]
+    assert waits[0] == 0
+    assert waits[1] == pytest.approx(1, abs=0.05)
+    assert waits[2] == pytest.approx(2, abs=0.05)
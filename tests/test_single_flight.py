@@ -0,0 +1,127 @@
+from threading import Event, Thread
+from time import sleep
+
+from src.core.exceptions import TaskCancelled
+from src.core.metrics import WorkerMetrics
+from src.core.network import SingleFlight
+from src.core.workers.base import CancellationToken
+
+
+def follow(flight, key, fn, results, **kwargs):
+    def call():
+        try:
+            results.append(flight.do(key, fn, **kwargs))
+        except BaseException as e:
+            results.append(e)
+
+    thread = Thread(target=call)
+    thread.start()
+    return thread
+
+
+def wait_for_waiters(flight, key, n):
+    while True:
+        with flight._lock:
+            if len(flight._calls[key].waiters) >= n:
+                return
+
+
+def test_concurrent_callers_share_one_call():
+    flight, release, calls, results = SingleFlight(), Event(), [], []
+
+    def fn():
+        calls.append(1)
+        release.wait()
+        return {"n": 1}
+
+    leader = follow(flight, "k", fn, results)
+    while "k" not in flight._calls:
+        pass
+    followers = [follow(flight, "k", fn, results, share=dict)
+                 for _ in range(3)]
+    wait_for_waiters(flight, "k", 3)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert calls == [1]
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    first = results[0][0]
+    assert all(r == {"n": 1} for r, _ in results)
+    assert sum(r is first for r, _ in results) == 1
+
+
+def test_leader_error_reaches_followers():
+    flight, release, results = SingleFlight(), Event(), []
+
+    def fn():
+        release.wait()
+        raise ValueError("boom")
+
+    threads = [follow(flight, "k", fn, results)]
+    while "k" not in flight._calls:
+        pass
+    threads.append(follow(flight, "k", fn, results))
+    wait_for_waiters(flight, "k", 1)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert [type(r) for r in results] == [ValueError, ValueError]
+
+
+def test_cancelled_follower_returns_without_the_leader():
+    flight, release, results = SingleFlight(), Event(), []
+    token = CancellationToken()
+    leader = follow(flight, "k", lambda: release.wait(), results)
+    while "k" not in flight._calls:
+        pass
+    follower = follow(flight, "k", lambda: None, results, token=token)
+    wait_for_waiters(flight, "k", 1)
+    token.cancel()
+    follower.join()
+    assert isinstance(results.pop(), TaskCancelled)
+    release.set()
+    leader.join()
+    assert results == [(True, False)]
+
+
+def test_follower_retries_when_the_leader_is_cancelled():
+    flight, release, results = SingleFlight(), Event(), []
+
+    def cancelled():
+        release.wait()
+        raise TaskCancelled()
+
+    leader = follow(flight, "k", cancelled, results)
+    while "k" not in flight._calls:
+        pass
+    follower = follow(flight, "k", lambda: "own", results)
+    wait_for_waiters(flight, "k", 1)
+    release.set()
+    leader.join()
+    follower.join()
+    assert isinstance(results[0], TaskCancelled)
+    assert results[1] == ("own", False)
+
+
+
+class SlowDict(dict):
+    def get(self, key, default=None):
+        # 在读与写之间让出线程，放大读-改-写的竞态窗口
+        value = super().get(key, default)
+        sleep(0.001)
+        return value
+
+
+def test_shared_count_is_exact_under_concurrent_followers():
+    metrics = WorkerMetrics()
+    metrics.add_http("GET example.com/a", 0.1)
+    metrics._shared = SlowDict()
+    threads = [Thread(target=lambda: [metrics.add_shared(
+        "GET example.com/a") for _ in range(50)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    [stats] = metrics.endpoint_stats()
+    assert stats.shared == 200
@@ -0,0 +1,107 @@
+from threading import Event
+
+import pytest
+
+from src.core import app_state
+from src.core.app_state import AccountContext
+from src.core.exceptions import SubmissionDropped
+from src.core.workers.base import BaseWorker, SubmitPolicy
+from src.core.workers.worker_manager import WorkerManager
+
+runs = []
+
+
+class GatedWorker(BaseWorker):
+    """Records its tag when run and holds its thread until released."""
+
+    def __init__(self, tag, gate=None, context=None):
+        super().__init__(name=tag, with_session=False, context=context)
+        self.tag = tag
+        self.gate = gate
+        self.started = Event()
+
+    def run(self, report_progress, *args, **kwargs):
+        self.started.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        runs.append(self.tag)
+        return self.tag
+
+
+class Rejecting(GatedWorker):
+    submit_policy = SubmitPolicy.reject()
+
+
+class Replacing(GatedWorker):
+    submit_policy = SubmitPolicy.replace_pending()
+
+
+class Coalescing(GatedWorker):
+    submit_policy = SubmitPolicy.coalesce()
+
+
+class Debounced(GatedWorker):
+    submit_policy = SubmitPolicy.debounce(100)
+
+
+@pytest.fixture
+def manager(dispatcher):
+    runs.clear()
+    manager = WorkerManager(dispatcher, max_workers=4, reserved_workers=0)
+    yield manager
+    manager.shutdown()
+
+
+def occupy(manager, worker_cls):
+    gate = Event()
+    first = worker_cls("first", gate)
+    future = manager.submit(first)
+    first.started.wait(2)
+    return gate, future
+
+
+def test_reject_drops_while_active(manager):
+    gate, first = occupy(manager, Rejecting)
+    with pytest.raises(SubmissionDropped):
+        manager.submit(Rejecting("second"))
+    gate.set()
+    first.result(timeout=2)
+    assert manager.submit(Rejecting("third")).result(timeout=2) == "third"
+
+
+def test_reject_is_per_account(manager):
+    gate, _ = occupy(manager, Rejecting)
+    other = AccountContext(session_pool=app_state.session_pool)
+    assert manager.submit(Rejecting("other", context=other)) \
+        .result(timeout=2) == "other"
+    gate.set()
+
+
+def test_replace_pending_keeps_only_the_latest(manager):
+    gate, _ = occupy(manager, Replacing)
+    done = []
+    older = manager.submit(Replacing("older"), on_done=done.append)
+    newer = manager.submit(Replacing("newer"))
+    with pytest.raises(SubmissionDropped):
+        older.result(timeout=2)
+    assert isinstance(done[0], SubmissionDropped)
+    gate.set()
+    assert newer.result(timeout=2) == "newer"
+    assert runs == ["first", "newer"]
+
+
+def test_coalesce_merges_into_one_rerun(manager):
+    gate, _ = occupy(manager, Coalescing)
+    merged = [manager.submit(Coalescing(f"again-{i}")) for i in range(3)]
+    gate.set()
+    assert [f.result(timeout=2) for f in merged] == ["again-0"] * 3
+    assert runs == ["first", "again-0"]
+
+
+def test_debounce_runs_the_last_after_a_quiet_period(manager):
+    futures = [manager.submit(Debounced(f"burst-{i}")) for i in range(3)]
+    assert futures[-1].result(timeout=2) == "burst-2"
+    for future in futures[:-1]:
+        with pytest.raises(SubmissionDropped):
+            future.result(timeout=2)
+    assert runs == ["burst-2"]
@@ -0,0 +1,118 @@
+from concurrent.futures import Future
+from threading import Barrier
+
+import pytest
+
+from src.core.exceptions import TaskCancelled
+from src.core.workers.base import BaseWorker
+from src.core.workers.worker_graph import WorkerGraph
+from src.core.workers.worker_manager import WorkerManager
+
+
+class Stage(BaseWorker):
+    account_bound = False
+
+    def __init__(self, name, error=None, barrier=None):
+        super().__init__(name=name, with_session=False)
+        self.error = error
+        self.barrier = barrier
+
+    def run(self, report_progress, *args, **kwargs):
+        if self.barrier is not None:
+            # 两个阶段同时在运行才能一起通过
+            self.barrier.wait(2)
+        if self.error is not None:
+            raise self.error
+
+
+class Left(Stage):
+    pass
+
+
+class Right(Stage):
+    pass
+
+
+class InlineSubmitter:
+    """Finishes every stage at once, in submission order."""
+
+    def __init__(self):
+        self.order = []
+
+    def __call__(self, worker, /, on_progress=False, on_done=None):
+        self.order.append(worker.name)
+        on_done(worker.error)
+        return Future()
+
+
+@pytest.fixture
+def submit():
+    return InlineSubmitter()
+
+
+def diamond(submit, completed, *, b_error=None):
+    return (WorkerGraph(submit, "diamond", on_complete=completed.append)
+            .add("a", lambda: Stage("a"))
+            .add("b", lambda: Stage("b", b_error), after=("a",))
+            .add("c", lambda: Stage("c"), after=("a",))
+            .add("d", lambda: Stage("d"), after=("b", "c")))
+
+
+def test_stages_wait_for_all_dependencies(submit):
+    completed = []
+    diamond(submit, completed).start()
+    assert submit.order == ["a", "b", "c", "d"]
+    assert len(completed) == 1
+    assert not any(t.skipped or t.error for t in completed[0].values())
+
+
+def test_failed_stage_skips_its_dependents(submit):
+    completed, error = [], ValueError("boom")
+    diamond(submit, completed, b_error=error).start()
+    assert submit.order == ["a", "b", "c"]
+    timings = completed[0]
+    assert timings["b"].error is error
+    assert timings["d"].skipped and not timings["c"].skipped
+
+
+def test_cancelled_stage_abandons_the_graph(submit):
+    completed = []
+    diamond(submit, completed, b_error=TaskCancelled()).start()
+    assert "d" not in submit.order
+    assert completed == []
+
+
+def test_empty_graph_completes_at_once(submit):
+    completed = []
+    WorkerGraph(submit, "empty", on_complete=completed.append).start()
+    assert completed == [{}]
+
+
+def test_stages_are_validated(submit):
+    graph = WorkerGraph(submit, "invalid").add("a", lambda: Stage("a"))
+    with pytest.raises(ValueError):
+        graph.add("a", lambda: Stage("a"))
+    with pytest.raises(ValueError):
+        graph.add("b", lambda: Stage("b"), after=("missing",))
+    graph.start()
+    with pytest.raises(RuntimeError):
+        graph.add("c", lambda: Stage("c"))
+
+
+def test_independent_stages_run_concurrently(dispatcher):
+    manager = WorkerManager(dispatcher, max_workers=4, reserved_workers=0)
+    # 同类 Worker 默认互斥，并行的阶段各用一个类
+    barrier, completed = Barrier(2), []
+    try:
+        (WorkerGraph(manager.submit, "parallel",
+                     on_complete=completed.append)
+         .add("left", lambda: Left("left", barrier=barrier))
+         .add("right", lambda: Right("right", barrier=barrier))
+         .add("join", lambda: Stage("join"), after=("left", "right"))
+         .start())
+        while not completed:
+            pass
+    finally:
+        manager.shutdown()
+    assert not any(t.error for t in completed[0].values())
+    assert completed[0]["join"].submitted >= completed[0]["left"].finished